@@ -0,0 +1,208 @@
+"""
+Benchmark the allocation pipeline on synthetic terms and check for regressions.
+
+Each stage (load, conflict check, allocation, plan export, HTML summary) is
+timed with its peak traced memory. Results are compared with a stored
+baseline: a stage regresses when it is slower than baseline * (1 + tolerance)
+by more than MIN_REGRESSION_SECONDS, and the result counts must match exactly.
+
+Usage:
+    python benchmarks/bench_pipeline.py --scales 1 10
+    python benchmarks/bench_pipeline.py --scales 1 10 --update-baseline
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+import convert_to_excel  # noqa: E402
+from seating_arrangement import create_html_summary  # noqa: E402
+from utils.classroom_allocator import (  # noqa: E402
+    allocate_slots,
+    create_individual_seating_plans,
+)
+from utils.conflict_checker import check_conflicts  # noqa: E402
+
+from synthetic import generate_term, write_term  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_TOLERANCE = 0.5
+# Differences below this are timer noise on small stages
+MIN_REGRESSION_SECONDS = 0.05
+
+
+@contextmanager
+def stage(name, stages):
+    """Record wall time and peak traced memory of the enclosed block."""
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    # The pipeline prints a line per conflict and split course
+    with redirect_stdout(io.StringIO()):
+        yield
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    stages[name] = {"seconds": round(seconds, 4), "peak_mb": round(peak / 2**20, 2)}
+
+
+def run_pipeline(scale, buffer=2, density="dense", export_mode="workbook", seed=0):
+    """
+    Run every pipeline stage on a synthetic term of the given scale.
+
+    Returns:
+        dict: {'stages': {name: {'seconds', 'peak_mb'}}, 'results': counts}
+    """
+    stages = {}
+    previous_dir = os.getcwd()
+    previous_csv_dir = convert_to_excel.CSV_DIR
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        write_term(generate_term(scale, seed), f"{work_dir}/input_data_tt")
+        # The pipeline writes to data/output relative to the working directory
+        os.chdir(work_dir)
+        convert_to_excel.CSV_DIR = f"{work_dir}/input_data_tt"
+        tracemalloc.start()
+        try:
+            with stage("load", stages):
+                _, classrooms, courses, roll_table = (
+                    convert_to_excel.load_inputs_from_csv()
+                )
+
+            with stage("conflicts", stages):
+                conflicts = check_conflicts(courses, roll_table)
+
+            with stage("allocate", stages):
+                allocation_df, _, unallocated = allocate_slots(
+                    courses, classrooms, buffer, density, roll_table
+                )
+
+            with stage("export", stages):
+                create_individual_seating_plans(
+                    allocation_df, roll_table, export_mode, "data/output"
+                )
+
+            metadata = {
+                "timestamp": f"benchmark scale {scale}",
+                "buffer": buffer,
+                "density": density,
+                "num_courses": len(courses),
+                "num_classrooms": len(classrooms),
+                "num_allocations": len(allocation_df),
+                "num_conflicts": len(conflicts),
+                "execution_time_seconds": sum(s["seconds"] for s in stages.values()),
+            }
+            with stage("summary", stages):
+                create_html_summary(
+                    allocation_df, conflicts, metadata, "data/output/summary.html"
+                )
+        finally:
+            tracemalloc.stop()
+            convert_to_excel.CSV_DIR = previous_csv_dir
+            os.chdir(previous_dir)
+
+    results = {
+        "courses": len(courses),
+        "classrooms": len(classrooms),
+        "students": len(roll_table),
+        "conflicts": len(conflicts),
+        "allocations": len(allocation_df),
+        "unallocated": len(unallocated),
+    }
+    return {"stages": stages, "results": results}
+
+
+def compare(run, baseline, tolerance):
+    """Return a list of regression messages for one scale, empty if none."""
+    problems = []
+    for name, measured in run["stages"].items():
+        expected = baseline["stages"].get(name)
+        if expected is None:
+            continue
+        limit = expected["seconds"] * (1 + tolerance)
+        if (
+            measured["seconds"] > limit
+            and measured["seconds"] - expected["seconds"] > MIN_REGRESSION_SECONDS
+        ):
+            problems.append(
+                f"{name}: {measured['seconds']:.3f}s vs baseline "
+                f"{expected['seconds']:.3f}s (limit {limit:.3f}s)"
+            )
+    for name, value in baseline["results"].items():
+        if run["results"].get(name) != value:
+            problems.append(
+                f"result '{name}' changed: {run['results'].get(name)} vs baseline {value}"
+            )
+    return problems
+
+
+def print_run(scale, run):
+    print(f"\nScale {scale}: {run['results']}")
+    print(f"  {'stage':<10} {'seconds':>9} {'peak MB':>9}")
+    for name, measured in run["stages"].items():
+        print(f"  {name:<10} {measured['seconds']:>9.3f} {measured['peak_mb']:>9.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--export-mode", default="workbook", choices=["files", "workbook", "zip"])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store this run as the new baseline instead of comparing",
+    )
+    args = parser.parse_args(argv)
+
+    # Keep the per-course allocation messages out of the timings
+    logging.disable(logging.CRITICAL)
+
+    runs = {}
+    for scale in args.scales:
+        runs[str(scale)] = run_pipeline(scale, export_mode=args.export_mode)
+        print_run(scale, runs[str(scale)])
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(runs)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline first")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    failed = False
+    for scale, run in runs.items():
+        if scale not in baseline:
+            print(f"\nScale {scale}: no baseline, skipped")
+            continue
+        problems = compare(run, baseline[scale], args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION scale {scale}: {problem}")
+        failed = failed or bool(problems)
+
+    print("\nBenchmark regressions found" if failed else "\nNo regressions")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Benchmark command-line startup and guard against heavy imports creeping back.
+
+Each command is run as a fresh process several times and its median wall
+time is compared with a bare `python -c pass`. A command fails when it takes
+more than BUDGET_SECONDS over the bare interpreter, or when importing main
+and parsing its arguments loads one of HEAVY_MODULES.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 20 --budget 0.05
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+from utils.run_store import connect  # noqa: E402
+
+BUDGET_SECONDS = 0.1
+DEFAULT_REPEAT = 10
+# Modules that only the allocation, export and lookup-service stages need
+HEAVY_MODULES = ["pandas", "numpy", "openpyxl", "flask", "seating_arrangement"]
+
+IMPORT_CHECK = (
+    "import sys, main; main.parse_args(['--buffer', '2', '--density', 'dense']); "
+    "print(','.join(m for m in {heavy!r} if m in sys.modules))"
+)
+
+
+def time_command(args, repeat):
+    """Return the median wall time of running `python args` from src/."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable] + args,
+            cwd=SRC_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def heavy_imports():
+    """Return the HEAVY_MODULES loaded by importing main and parsing arguments."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_CHECK.format(heavy=HEAVY_MODULES)],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [module for module in result.stdout.strip().split(",") if module]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--budget", type=float, default=BUDGET_SECONDS)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # An empty run store is enough to time the lookup path
+        store = os.path.join(directory, "runs.db")
+        connect(store).close()
+        commands = {
+            "--help": ["main.py", "--help"],
+            "invalid buffer": ["main.py", "--buffer", "-1"],
+            "--find": ["main.py", "--find", "22CS01001", "--store", store],
+        }
+
+        interpreter = time_command(["-c", "pass"], args.repeat)
+        print(f"{'python -c pass':<16} {interpreter * 1000:8.1f} ms")
+        failed = False
+        for name, command in commands.items():
+            seconds = time_command(command, args.repeat)
+            overhead = seconds - interpreter
+            status = "ok" if overhead <= args.budget else "SLOW"
+            failed |= status != "ok"
+            print(
+                f"{name:<16} {seconds * 1000:8.1f} ms "
+                f"(+{overhead * 1000:.1f} ms over python) {status}"
+            )
+
+    loaded = heavy_imports()
+    if loaded:
+        print(f"\nImporting main loads heavy modules: {', '.join(loaded)}")
+        failed = True
+    else:
+        print("\nImporting main loads none of: " + ", ".join(HEAVY_MODULES))
+
+    if failed:
+        print(f"\nStartup exceeds the {args.budget * 1000:.0f} ms budget or imports too much")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Measure where worker processes start paying off for allocate_slots.
+
+For each scale the slots are allocated serially, by a thread pool and by a
+process pool (the pool kind is forced through PROCESS_POOL_MIN_ENROLLMENT).
+Greedy allocation holds the GIL, so threads run about as fast as the serial
+loop. On a machine with fewer CPUs than workers the process pool cannot run
+in parallel; its time minus the serial time is then the pool overhead
+(start-up plus shipping the shared inputs and every slot's courses), and
+the "estimated" column is serial / workers + overhead, the time on enough
+CPUs. Processes pay off once that is below the serial time.
+
+Usage:
+    python benchmarks/bench_workers.py --scales 1 2 5 10 --workers 4
+"""
+
+import argparse
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+import convert_to_excel  # noqa: E402
+from utils import classroom_allocator  # noqa: E402
+from utils.classroom_allocator import allocate_slots  # noqa: E402
+
+from synthetic import generate_term, write_term  # noqa: E402
+
+
+def load_term(scale, seed=0):
+    """Return (courses, classrooms, roll_table) of a synthetic term."""
+    previous_csv_dir = convert_to_excel.CSV_DIR
+    with tempfile.TemporaryDirectory() as work_dir:
+        write_term(generate_term(scale, seed), f"{work_dir}/input_data_tt")
+        convert_to_excel.CSV_DIR = f"{work_dir}/input_data_tt"
+        try:
+            _, classrooms, courses, roll_table = convert_to_excel.load_inputs_from_csv()
+        finally:
+            convert_to_excel.CSV_DIR = previous_csv_dir
+    return courses, classrooms, roll_table
+
+
+def time_allocation(courses, classrooms, roll_table, workers, min_enrollment, repeat):
+    """Return the best wall time of allocate_slots over `repeat` runs."""
+    previous = classroom_allocator.PROCESS_POOL_MIN_ENROLLMENT
+    classroom_allocator.PROCESS_POOL_MIN_ENROLLMENT = min_enrollment
+    best = None
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                allocate_slots(courses, classrooms, 2, "dense", roll_table, workers)
+            seconds = time.perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+    finally:
+        classroom_allocator.PROCESS_POOL_MIN_ENROLLMENT = previous
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 5, 10])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    # Allocation logs every clashing course
+    logging.disable(logging.ERROR)
+
+    cpus = os.cpu_count() or 1
+    print(f"{cpus} CPUs, {args.workers} workers")
+    print(
+        f"{'scale':>5} {'enrollment':>10} {'serial':>8} {'threads':>8} "
+        f"{'processes':>9} {'estimated':>9}"
+    )
+    for scale in args.scales:
+        courses, classrooms, roll_table = load_term(scale)
+        enrollment = sum(len(ids) for ids in courses["student_ids"])
+        inputs = (courses, classrooms, roll_table)
+        serial = time_allocation(*inputs, 1, 0, args.repeat)
+        threads = time_allocation(*inputs, args.workers, float("inf"), args.repeat)
+        processes = time_allocation(*inputs, args.workers, 0, args.repeat)
+        estimated = (
+            serial / args.workers + max(processes - serial, 0.0)
+            if cpus < args.workers
+            else processes
+        )
+        print(
+            f"{scale:>5} {enrollment:>10} {serial:>8.3f} {threads:>8.3f} "
+            f"{processes:>9.3f} {estimated:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
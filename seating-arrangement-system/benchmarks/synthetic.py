@@ -0,0 +1,106 @@
+"""Synthetic term generator for the allocation pipeline benchmarks."""
+
+import math
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Shape of the sample term in input_data_tt, used as the 1x reference
+BASE_COURSES = 156
+BASE_STUDENTS = 1810
+BASE_ROOMS = 28
+BASE_DATES = 7
+BATCH_SIZE = 45
+ROOM_CAPACITIES = [25, 30, 30, 30, 55, 70, 72, 90]
+SLOTS = ["Morning", "Evening"]
+
+
+def generate_term(scale=1, seed=0, conflict_rate=0.002):
+    """
+    Generate a synthetic term at `scale` times the size of the sample data.
+
+    Courses and students grow linearly with scale. Dates and rooms grow with
+    its square root, so each slot holds more courses as the term grows, like
+    merged multi-campus timetables. Students are grouped into batches that
+    each take one course in several distinct slots, so the term is clash-free
+    except for `conflict_rate` of students who get one clashing registration.
+
+    Returns:
+        dict: DataFrames keyed by 'timetable', 'course_roll', 'roll_name' and
+              'rooms', in the column layout of the input_data_tt CSV exports.
+    """
+    rng = np.random.default_rng(seed)
+    growth = math.ceil(math.sqrt(scale))
+
+    dates = [date(2016, 4, 30) + timedelta(days=day) for day in range(BASE_DATES * growth)]
+    slots = [(day, slot) for day in dates for slot in SLOTS]
+
+    n_courses = BASE_COURSES * scale
+    courses = np.array([f"C{number:05d}" for number in range(n_courses)])
+    course_slot = rng.integers(len(slots), size=n_courses)
+    # Zipf-like popularity so a few courses are very large, as in the real data
+    popularity = 1.0 / np.arange(1, n_courses + 1) ** 0.8
+    popularity = rng.permutation(popularity)
+    courses_by_slot = [np.flatnonzero(course_slot == s) for s in range(len(slots))]
+    non_empty_slots = np.array([s for s, c in enumerate(courses_by_slot) if len(c)])
+
+    n_students = BASE_STUDENTS * scale
+    rolls = np.array([f"S{number:07d}" for number in range(n_students)])
+
+    registrations = []
+    for start in range(0, n_students, BATCH_SIZE):
+        batch = rolls[start : start + BATCH_SIZE]
+        n_taken = min(int(rng.integers(4, 8)), len(non_empty_slots))
+        for s in rng.choice(non_empty_slots, size=n_taken, replace=False):
+            candidates = courses_by_slot[s]
+            weights = popularity[candidates] / popularity[candidates].sum()
+            course = courses[rng.choice(candidates, p=weights)]
+            registrations.append(pd.DataFrame({"rollno": batch, "course_code": course}))
+    course_roll = pd.concat(registrations, ignore_index=True)
+
+    # A few students also register for a second course in a slot they already have
+    clashing = course_roll.sample(frac=conflict_rate, random_state=seed)
+    extra = []
+    for roll, course in zip(clashing["rollno"], clashing["course_code"]):
+        s = course_slot[int(course[1:])]
+        others = courses_by_slot[s][courses[courses_by_slot[s]] != course]
+        if len(others):
+            extra.append({"rollno": roll, "course_code": courses[rng.choice(others)]})
+    course_roll = pd.concat([course_roll, pd.DataFrame(extra)], ignore_index=True)
+    course_roll.insert(1, "register_sem", 4)
+    course_roll.insert(2, "schedule_sem", 4)
+
+    timetable_rows = []
+    for day in dates:
+        row = {"Date": f"{day.month}/{day.day}/{day.strftime('%y')}", "Day": day.strftime("%A")}
+        for slot in SLOTS:
+            in_slot = courses_by_slot[slots.index((day, slot))]
+            row[slot] = "; ".join(courses[in_slot]) if len(in_slot) else "NO EXAM"
+        timetable_rows.append(row)
+
+    n_rooms = BASE_ROOMS * growth
+    rooms = pd.DataFrame(
+        {
+            "Room No.": [f"R{number:04d}" for number in range(n_rooms)],
+            "Exam Capacity": rng.choice(ROOM_CAPACITIES, size=n_rooms),
+            "Block": [f"B{number // 10 + 1}" for number in range(n_rooms)],
+        }
+    )
+
+    return {
+        "timetable": pd.DataFrame(timetable_rows),
+        "course_roll": course_roll,
+        "roll_name": pd.DataFrame({"Roll": rolls, "Name": [f"Student {r}" for r in rolls]}),
+        "rooms": rooms,
+    }
+
+
+def write_term(term, directory):
+    """Write a generated term as CSVs named like the input_data_tt exports."""
+    os.makedirs(directory, exist_ok=True)
+    term["timetable"].to_csv(f"{directory}/in_timetable-Table 1.csv", index=False)
+    term["course_roll"].to_csv(f"{directory}/in_course_roll_mapping-Table 1.csv", index=False)
+    term["roll_name"].to_csv(f"{directory}/in_roll_name_mapping-Table 1.csv", index=False)
+    term["rooms"].to_csv(f"{directory}/in_room_capacity-Table 1.csv", index=False)
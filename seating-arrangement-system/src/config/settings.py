@@ -7,11 +7,90 @@ SPARSE_DENSE = {
     "dense": 1.0,  # Ratio for dense filling of classrooms (100%)
 }
 
+# Seating policies accepted as the density: "sparse" and "dense" use the
+# SPARSE_DENSE share of each room's seats after the buffer, "checkerboard" uses
+# alternate seats of the seat grid and "sub_blocks" also keeps to the room's
+# sparse sub-block sizes. A 'buffer' column in the room data overrides BUFFER per room.
+SEATING_POLICIES = ["sparse", "dense", "checkerboard", "sub_blocks"]
+
+# Seating plan export layout: "files" (one xlsx per course-room),
+# "workbook" (one xlsx, a sheet per date/slot) or "zip" (per-room files in one archive)
+EXPORT_MODE = "files"
+
+# Number of (date, slot) groups to allocate concurrently (1 = serial)
+ALLOCATION_WORKERS = 1
+
+# Working directory for --partitioned runs, which split the CSV inputs into one
+# file per date/slot and allocate them one at a time to bound memory use
+PARTITION_DIR = "data/partitions"
+
+# Threads rendering and writing per-room plan files in "files" mode; more
+# writers overlap slow writes, e.g. to a network share (1 = one at a time)
+OUTPUT_WRITERS = 8
+
+# Per-slot allocation strategy: "greedy" or "optimal" (branch and bound that
+# falls back to the greedy placement when OPTIMAL_TIME_BUDGET runs out)
+ALLOCATION_STRATEGY = "greedy"
+OPTIMAL_TIME_BUDGET = 2.0  # Seconds per date/slot
+
+# Profiling: every run writes per-stage spans and counters to its run directory
+# as PROFILE_TRACE ("json" -> profile.json, "chrome" -> trace.json for
+# chrome://tracing or Perfetto, None to skip). PROFILE_MODE adds "cprofile"
+# (profile.pstats/profile.txt) or "tracemalloc" (tracemalloc.txt) output.
+PROFILE_TRACE = "json"
+PROFILE_MODE = None
+
+# Seat-level map (seat_map.xlsx in each run directory) assigning every student
+# a seat, with SEATS_PER_ROW seats in each row of a room
+SEAT_MAP = True
+SEATS_PER_ROW = 6
+
+# Admit cards (admit_cards.xlsx in each run directory) listing every student's
+# exams and seats, and the address of the seat lookup service (main.py --serve)
+ADMIT_CARDS = True
+LOOKUP_HOST = "127.0.0.1"
+LOOKUP_PORT = 5000
+
+# Number of exam slot moves to suggest (slot_move_suggestions.xlsx in each run
+# directory) when courses clash or a slot has more students than seats (0 disables it)
+SUGGEST_SLOT_MOVES = 10
+
+# Re-plan the whole exam timetable by graph colouring followed by the same local
+# search (recoloured_timetable.xlsx in each run directory, main.py --recolour-timetable)
+RECOLOUR_TIMETABLE = False
+
+# Room utilization and fragmentation report (utilization.xlsx, one row per date/slot,
+# and utilization.json with per-room, per-building and per-date figures) in each run directory
+UTILIZATION_REPORT = True
+
+# Optional SQLite store of every run's allocations, seats, seats left, conflicts
+# and metadata, for indexed lookups across runs (None disables it)
+RUN_STORE_DB = None  # e.g. "data/output/runs.sqlite"
+
 # Path settings
 INPUT_DIR = "data/input"
 OUTPUT_DIR = "data/output"
 LOG_DIR = "logs"
 
+# Where process_seating loads its inputs from: "excel" (data/input/*.xlsx) or
+# "csv" (input_data_tt/*.csv directly, without writing intermediate Excel files)
+INPUT_SOURCE = "excel"
+
+# State kept between incremental runs (process_seating(..., incremental=True))
+INCREMENTAL_STATE_FILE = "data/output/.state/allocation_state.pkl"
+
+# Allocation results (allocations, seats left, conflicts, slot move suggestions) are
+# cached here, keyed by a hash of the inputs and the buffer/density/strategy, so a
+# repeated run skips allocation, and also skips writing the seating plans while
+# data/output still holds them (RESULT_EXPORT_STAMP records which result it holds).
+# Least recently used results are evicted beyond RESULT_CACHE_MAX_MB (None disables it).
+RESULT_CACHE_DIR = "data/cache/results"
+RESULT_CACHE_MAX_MB = 512
+RESULT_EXPORT_STAMP = "data/output/.state/result_export.json"
+
+# Parsed input files are cached here in a fast binary format (None disables the cache)
+INPUT_CACHE_DIR = "data/cache/inputs"
+
 # Input file paths
 INPUT_FILES = {
     "roll_name_mapping": f"{INPUT_DIR}/in_roll_name_mapping.xlsx",
@@ -6,14 +6,25 @@ import os
 import logging
 import numpy as np
 from collections import defaultdict
-import re
 
-# Setup logging
-logging.basicConfig(
-    filename="logs/conversion.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
+from utils.instrumentation import count
+from utils.roll_table import RollTable
+from utils.timetable import SCHEDULE_COLUMNS, exam_schedule
+
+# Directory holding the source CSV exports
+CSV_DIR = "input_data_tt"
+
+# Rows of the course-roll mapping read per chunk
+CSV_CHUNK_SIZE = 50000
+
+
+def setup_logging():
+    """Log conversion progress to logs/conversion.log"""
+    logging.basicConfig(
+        filename="logs/conversion.log",
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
 
 
 def ensure_directories():
@@ -23,14 +34,14 @@ def ensure_directories():
     os.makedirs("logs", exist_ok=True)
 
 
-def convert_roll_name_mapping():
-    """Convert roll name mapping from CSV to Excel"""
+def convert_roll_name_mapping(write_excel=True):
+    """Convert roll name mapping from CSV, writing it to Excel if write_excel is set"""
     try:
         logging.info("Converting roll-name mapping file")
 
         # Read the CSV file
         roll_name_df = pd.read_csv(
-            "input_data_tt/in_roll_name_mapping-Table 1.csv",
+            f"{CSV_DIR}/in_roll_name_mapping-Table 1.csv",
             skiprows=0,
             encoding="utf-8",
         )
@@ -47,7 +58,8 @@ def convert_roll_name_mapping():
         roll_name_df = roll_name_df.dropna(subset=["Roll Number"])
 
         # Save to Excel
-        roll_name_df.to_excel("data/input/in_roll_name_mapping.xlsx", index=False)
+        if write_excel:
+            roll_name_df.to_excel("data/input/in_roll_name_mapping.xlsx", index=False)
         logging.info(f"Converted roll-name mapping: {len(roll_name_df)} entries")
 
         return roll_name_df
@@ -57,13 +69,13 @@ def convert_roll_name_mapping():
         raise
 
 
-def convert_classroom_data():
-    """Convert room capacity data from CSV to Excel"""
+def convert_classroom_data(write_excel=True):
+    """Convert room capacity data from CSV, writing it to Excel if write_excel is set"""
     try:
         logging.info("Converting classroom data")
 
         # Read the CSV file
-        rooms_df = pd.read_csv("input_data_tt/in_room_capacity-Table 1.csv", skiprows=0)
+        rooms_df = pd.read_csv(f"{CSV_DIR}/in_room_capacity-Table 1.csv", skiprows=0)
 
         # Clean column names
         rooms_df.columns = [col.strip() for col in rooms_df.columns]
@@ -73,11 +85,30 @@ def convert_classroom_data():
             {"room_id": rooms_df["Room No."], "capacity": rooms_df["Exam Capacity"]}
         )
 
+        # Keep the building block so allocation can keep courses in one building
+        if "Block" in rooms_df.columns:
+            classrooms_df["block"] = rooms_df["Block"].astype(str).str.strip()
+
+        # Rooms may reserve their own number of buffer seats
+        if "Buffer" in rooms_df.columns:
+            classrooms_df["buffer"] = pd.to_numeric(rooms_df["Buffer"], errors="coerce")
+
+        # Sparse sub-block sizes follow the 'sparse' column as label/size pairs
+        # (sub1, 6, sub 2, 6, ...); keep the sizes as "6;6;5"
+        if "sparse" in rooms_df.columns:
+            start = list(rooms_df.columns).index("sparse")
+            sizes = rooms_df.iloc[:, start:].apply(pd.to_numeric, errors="coerce")
+            classrooms_df["sub_blocks"] = [
+                ";".join(str(int(size)) for size in row if not np.isnan(size))
+                for row in sizes.to_numpy(dtype=float)
+            ]
+
         # Remove any empty rows
         classrooms_df = classrooms_df.dropna(subset=["room_id"])
 
         # Save to Excel
-        classrooms_df.to_excel("data/input/in_classrooms.xlsx", index=False)
+        if write_excel:
+            classrooms_df.to_excel("data/input/in_classrooms.xlsx", index=False)
         logging.info(f"Converted classroom data: {len(classrooms_df)} entries")
 
         return classrooms_df
@@ -87,94 +118,88 @@ def convert_classroom_data():
         raise
 
 
-def parse_timetable():
-    """Parse timetable data to get exam schedule"""
+def parse_timetable(timetable_csv=None):
+    """
+    Parse timetable data to get the exam schedule.
+
+    Every column other than Date and Day is a slot (e.g. Morning, Evening)
+    holding a ";" or "," separated course list, or "NO EXAM"; see
+    utils.timetable.exam_schedule.
+
+    Args:
+        timetable_csv (str or list): Timetable CSV, or several (e.g. the
+            timetables of past years) to combine; defaults to the CSV export
+
+    Returns:
+        DataFrame: One row per exam with 'date', 'day', 'slot' and 'course_id'
+    """
     try:
         logging.info("Parsing timetable")
+        if timetable_csv is None:
+            timetable_csv = f"{CSV_DIR}/in_timetable-Table 1.csv"
+        paths = [timetable_csv] if isinstance(timetable_csv, str) else list(timetable_csv)
 
-        # Read the CSV file - using custom delimiter because the file uses semicolons
-        timetable_df = pd.read_csv(
-            "input_data_tt/in_timetable-Table 1.csv", skiprows=0, delimiter=","
-        )
-
-        # Parse exam schedule
-        exam_schedule = []
-
-        for _, row in timetable_df.iterrows():
-            date = row["Date"]
-            day = row["Day"]
-
-            # Skip if no date
-            if pd.isna(date):
-                continue
-
-            # Process morning slot
-            morning_courses = str(row["Morning"]).strip()
-            if morning_courses != "nan" and morning_courses != "NO EXAM":
-                # Split courses by semicolon and clean
-                morning_list = re.split(r"[;,]", morning_courses)
-                for course in morning_list:
-                    course = course.strip()
-                    if course:  # Skip empty strings
-                        exam_schedule.append(
-                            {
-                                "date": date,
-                                "day": day,
-                                "slot": "Morning",
-                                "course_id": course,
-                            }
-                        )
-
-            # Process evening slot
-            evening_courses = str(row["Evening"]).strip()
-            if evening_courses != "nan" and evening_courses != "NO EXAM":
-                # Split courses by semicolon and clean
-                evening_list = re.split(r"[;,]", evening_courses)
-                for course in evening_list:
-                    course = course.strip()
-                    if course:  # Skip empty strings
-                        exam_schedule.append(
-                            {
-                                "date": date,
-                                "day": day,
-                                "slot": "Evening",
-                                "course_id": course,
-                            }
-                        )
-
-        return pd.DataFrame(exam_schedule)
+        schedules = [_parse_timetable_file(path) for path in paths]
+        if not schedules:
+            return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+        return pd.concat(schedules, ignore_index=True)
 
     except Exception as e:
         logging.error(f"Error parsing timetable: {str(e)}")
         raise
 
 
-def get_rolls_for_courses():
-    """Get roll numbers for each course"""
+def _parse_timetable_file(path):
+    timetable_df = pd.read_csv(path, skiprows=0, delimiter=",", dtype=str)
+    count("csv_rows_read", len(timetable_df))
+    return exam_schedule(timetable_df)
+
+
+def get_rolls_for_courses(roll_table, chunksize=CSV_CHUNK_SIZE):
+    """
+    Get the interned student ids (int32 arrays) for each course.
+
+    The course-roll mapping is read in chunks and grouped with pandas, so
+    memory stays bounded by the chunk size plus the compact id arrays.
+    """
     try:
         logging.info("Getting roll numbers for courses")
 
-        # Read the CSV file
-        course_roll_df = pd.read_csv(
-            "input_data_tt/in_course_roll_mapping-Table 1.csv", skiprows=0
-        )
-
-        # Clean column names
-        course_roll_df.columns = [col.strip() for col in course_roll_df.columns]
+        course_chunks = defaultdict(list)
 
-        # Group rolls by course
-        course_rolls = defaultdict(list)
+        # Read the CSV file in chunks, keeping only the two columns we need
+        reader = pd.read_csv(
+            f"{CSV_DIR}/in_course_roll_mapping-Table 1.csv",
+            skiprows=0,
+            usecols=lambda col: col.strip() in ("rollno", "course_code"),
+            dtype=str,
+            chunksize=chunksize,
+        )
 
-        for _, row in course_roll_df.iterrows():
-            roll = str(row["rollno"]).strip()
-            course = str(row["course_code"]).strip()
+        for chunk in reader:
+            # Clean column names and values
+            chunk.columns = [col.strip() for col in chunk.columns]
+            count("csv_rows_read", len(chunk))
+            chunk = chunk.dropna(subset=["rollno", "course_code"])
+            rolls = chunk["rollno"].str.strip()
+            courses = chunk["course_code"].str.strip()
+            keep = (rolls != "") & (courses != "")
+            rolls, courses = rolls[keep], courses[keep]
+
+            # Intern each distinct roll once per chunk, then map the whole column
+            codes, uniques = pd.factorize(rolls)
+            unique_ids = np.array(
+                [roll_table.intern(roll) for roll in uniques], dtype=np.int32
+            )
+            student_ids = pd.Series(unique_ids[codes], index=rolls.index)
 
-            if roll and course and pd.notna(roll) and pd.notna(course):
-                course_rolls[course].append(roll)
+            # Group rolls by course, preserving registration order
+            for course, ids in student_ids.groupby(courses, sort=False):
+                course_chunks[course].append(ids.to_numpy(dtype=np.int32))
 
-        # Convert to dictionary with roll numbers as semicolon-separated string
+        # Convert to dictionary of compact student id arrays
         course_rolls_dict = {
-            course: ";".join(rolls) for course, rolls in course_rolls.items()
+            course: np.concatenate(chunks) for course, chunks in course_chunks.items()
         }
 
         return course_rolls_dict
@@ -184,8 +209,24 @@ def get_rolls_for_courses():
         raise
 
 
-def create_courses_excel():
-    """Create the courses Excel file with enrollment data"""
+def build_courses(timetable_df, course_rolls_dict):
+    """
+    Join the exam schedule with each course's student ids.
+
+    Returns:
+        DataFrame: One row per scheduled exam with 'student_ids' arrays and 'enrollment'
+    """
+    empty = np.empty(0, dtype=np.int32)
+    courses_df = timetable_df[["course_id", "date", "day", "slot"]].copy()
+    courses_df["student_ids"] = [
+        course_rolls_dict.get(course_id, empty) for course_id in courses_df["course_id"]
+    ]
+    courses_df["enrollment"] = courses_df["student_ids"].map(len)
+    return courses_df
+
+
+def create_courses_excel(roll_table=None, write_excel=True):
+    """Create the courses table with enrollment data, writing it to Excel if write_excel is set"""
     try:
         logging.info("Creating courses Excel file")
 
@@ -193,40 +234,24 @@ def create_courses_excel():
         timetable_df = parse_timetable()
 
         # Get rolls for each course
-        course_rolls_dict = get_rolls_for_courses()
+        if roll_table is None:
+            roll_table = RollTable()
+        course_rolls_dict = get_rolls_for_courses(roll_table)
 
         # Add enrollment information
-        courses_data = []
-
-        for _, exam in timetable_df.iterrows():
-            course_id = exam["course_id"]
-
-            # Get roll numbers for this course
-            roll_numbers = course_rolls_dict.get(course_id, "")
-
-            # Calculate enrollment count
-            if roll_numbers:
-                enrollment = len(roll_numbers.split(";"))
-            else:
-                enrollment = 0
-
-            courses_data.append(
-                {
-                    "course_id": course_id,
-                    "date": exam["date"],
-                    "day": exam["day"],
-                    "slot": exam["slot"],
-                    "roll_numbers": roll_numbers,
-                    "enrollment": enrollment,
-                }
-            )
-
-        # Create DataFrame
-        courses_df = pd.DataFrame(courses_data)
-
-        # Save to Excel
-        courses_df.to_excel("data/input/in_courses.xlsx", index=False)
-        logging.info(f"Created courses Excel with {len(courses_df)} entries")
+        courses_df = build_courses(timetable_df, course_rolls_dict)
+
+        # Save to Excel; roll number strings are only built for this output
+        if write_excel:
+            excel_df = courses_df.copy()
+            excel_df["roll_numbers"] = [
+                roll_table.join(ids) for ids in excel_df["student_ids"]
+            ]
+            excel_df = excel_df[
+                ["course_id", "date", "day", "slot", "roll_numbers", "enrollment"]
+            ]
+            excel_df.to_excel("data/input/in_courses.xlsx", index=False)
+        logging.info(f"Created courses table with {len(courses_df)} entries")
 
         return courses_df
 
@@ -235,11 +260,46 @@ def create_courses_excel():
         raise
 
 
+def load_inputs_from_csv():
+    """
+    Load every input straight from the CSV exports, without writing any Excel files.
+
+    Returns:
+        tuple: (roll_name_df, classrooms_df, courses_df with 'student_ids', RollTable)
+    """
+    roll_table = RollTable()
+    roll_name_df = convert_roll_name_mapping(write_excel=False)
+    classrooms_df = convert_classroom_data(write_excel=False)
+    courses_df = create_courses_excel(roll_table, write_excel=False)
+    return roll_name_df, classrooms_df, courses_df, roll_table
+
+
+def partition_inputs_from_csv(partition_dir, chunksize=CSV_CHUNK_SIZE):
+    """
+    Split the CSV exports into one course-roll file per (date, slot) for streaming runs.
+
+    Returns:
+        tuple: (classrooms_df, partition manifest), see utils.partitioned.write_partitions
+    """
+    # Only partitioned runs need the partition writer (and the allocator it imports)
+    from utils.partitioned import write_partitions
+
+    classrooms_df = convert_classroom_data(write_excel=False)
+    manifest = write_partitions(
+        parse_timetable(),
+        f"{CSV_DIR}/in_course_roll_mapping-Table 1.csv",
+        partition_dir,
+        chunksize,
+    )
+    return classrooms_df, manifest
+
+
 def main():
     """Main function to convert all files"""
     try:
         print("Starting conversion of CSV files to Excel...")
         ensure_directories()
+        setup_logging()
 
         # Convert files
         roll_name_df = convert_roll_name_mapping()
@@ -1,9 +1,27 @@
+import argparse
 import logging
 import os
 import sys
-from seating_arrangement import SeatingArrangement
 from datetime import datetime
 
+# Only light modules are imported here. pandas, numpy, openpyxl and the
+# allocator are imported by the commands that need them, so --help,
+# argument errors and --find start without loading them.
+from config.settings import (
+    ALLOCATION_STRATEGY,
+    ALLOCATION_WORKERS,
+    EXPORT_MODE,
+    INPUT_SOURCE,
+    LOOKUP_HOST,
+    LOOKUP_PORT,
+    OUTPUT_WRITERS,
+    PROFILE_MODE,
+    PROFILE_TRACE,
+    RECOLOUR_TIMETABLE,
+    RUN_STORE_DB,
+    SEATING_POLICIES,
+)
+
 
 def setup_logging():
     """Set up logging configuration with timestamps."""
@@ -38,46 +56,215 @@ def validate_buffer(buffer_str):
 def validate_density(density_str):
     """Validate the density input."""
     density = density_str.lower()
-    if density not in ["sparse", "dense"]:
-        raise ValueError("Density must be either 'Sparse' or 'Dense'.")
+    if density not in SEATING_POLICIES:
+        raise ValueError(
+            f"Density must be one of: {', '.join(SEATING_POLICIES)} (e.g. 'Sparse' or 'Dense')."
+        )
     return density
 
 
-def main():
+def _argument_type(validate):
+    """Turn a validate_* function into an argparse type with its error message."""
+
+    def convert(value):
+        try:
+            return validate(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+
+    return convert
+
+
+def parse_args(argv=None):
+    """
+    Parse the command line.
+
+    Without --buffer and --density the buffer and density are prompted for,
+    as before. With --sweep every combination of --buffers and --densities
+    is allocated from a single load of the inputs and compared.
+    """
+    parser = argparse.ArgumentParser(
+        description="Allocate exam classrooms and write seating plans."
+    )
+    parser.add_argument("--buffer", type=_argument_type(validate_buffer), help="Seats to reserve in each room")
+    parser.add_argument("--density", type=_argument_type(validate_density), help="Sparse or Dense (or checkerboard, sub_blocks)")
+    parser.add_argument("--source", choices=["excel", "csv"], default=INPUT_SOURCE)
+    parser.add_argument(
+        "--export-mode", choices=["files", "workbook", "zip"], default=EXPORT_MODE
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=ALLOCATION_WORKERS,
+        help="Slots (or sweep scenarios) to allocate concurrently",
+    )
+    parser.add_argument(
+        "--output-workers",
+        type=int,
+        default=OUTPUT_WRITERS,
+        help="Threads writing per-room plan files",
+    )
+    parser.add_argument(
+        "--strategy", choices=["greedy", "optimal"], default=ALLOCATION_STRATEGY
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Re-solve only the date/slot groups that changed since the last incremental run",
+    )
+    parser.add_argument(
+        "--recolour-timetable",
+        action="store_true",
+        default=RECOLOUR_TIMETABLE,
+        help="Also re-plan the exam timetable by graph colouring (recoloured_timetable.xlsx)",
+    )
+    parser.add_argument(
+        "--profile", choices=["cprofile", "tracemalloc"], default=PROFILE_MODE
+    )
+    parser.add_argument(
+        "--trace-format", choices=["json", "chrome"], default=PROFILE_TRACE
+    )
+
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="Allocate one date/slot at a time from the CSV inputs, to bound memory use",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="After allocating, serve seat lookups at /students/<roll_number>",
+    )
+    parser.add_argument("--host", default=LOOKUP_HOST)
+    parser.add_argument("--port", type=int, default=LOOKUP_PORT)
+
+    lookup = parser.add_argument_group("seat lookup")
+    lookup.add_argument(
+        "--find",
+        metavar="ROLL_NUMBER",
+        help="Print where a student sits, from the run store, without allocating",
+    )
+    lookup.add_argument("--date", help="Only show exams on this date (with --find)")
+    lookup.add_argument("--run-id", help="Run to look in (with --find); default latest")
+    lookup.add_argument("--store", default=RUN_STORE_DB, help="Run store database")
+
+    sweep = parser.add_argument_group("sweep mode")
+    sweep.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Compare buffer/density scenarios instead of writing seating plans",
+    )
+    sweep.add_argument(
+        "--buffers", type=_argument_type(validate_buffer), nargs="+", default=[0, 2, 4, 6, 8]
+    )
+    sweep.add_argument(
+        "--densities", type=_argument_type(validate_density), nargs="+", default=["sparse", "dense"]
+    )
+    return parser.parse_args(argv)
+
+
+def prompt_settings(buffer=None, density=None):
+    """Prompt for whichever of the buffer and density is missing until it is valid."""
+    while buffer is None:
+        try:
+            buffer_input = input(
+                "Enter the buffer size (number of seats to reserve in each room): "
+            ).strip()
+            buffer = validate_buffer(buffer_input)
+        except ValueError as e:
+            print(f"Error: {e} Please try again.")
+
+    while density is None:
+        try:
+            density_input = input(
+                "Enter the seating density (Sparse/Dense): "
+            ).strip()
+            density = validate_density(density_input)
+        except ValueError as e:
+            print(f"Error: {e} Please try again.")
+
+    return buffer, density
+
+
+def find_student_seats(roll_number, date=None, run_id=None, store=RUN_STORE_DB):
+    """Print a student's exams and seats from the run store."""
+    if not store or not os.path.exists(store):
+        print("No run store found. Set RUN_STORE_DB in config/settings.py or pass --store.")
+        return []
+
+    from utils.run_store import find_student
+
+    exams = find_student(store, roll_number, date, run_id)
+    if not exams:
+        print(f"No exams found for {roll_number}")
+    for exam in exams:
+        seat = f", seat {exam['seat']}" if exam["seat"] else ""
+        print(
+            f"{exam['date']} {exam['slot']}: {exam['course_id']} "
+            f"in room {exam['room_id']}{seat}"
+        )
+    return exams
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.find:
+        find_student_seats(args.find, args.date, args.run_id, args.store)
+        return
+
     log_file = setup_logging()
     logging.info("Starting seating arrangement system")
 
     try:
+        from seating_arrangement import SeatingArrangement
+
         # Initialize the seating arrangement system
         seating_arrangement_system = SeatingArrangement()
 
-        # Get and validate user inputs
-        while True:
-            try:
-                buffer_input = input(
-                    "Enter the buffer size (number of seats to reserve in each room): "
-                ).strip()
-                buffer = validate_buffer(buffer_input)
-                break
-            except ValueError as e:
-                print(f"Error: {e} Please try again.")
-
-        while True:
-            try:
-                density_input = input(
-                    "Enter the seating density (Sparse/Dense): "
-                ).strip()
-                density = validate_density(density_input)
-                break
-            except ValueError as e:
-                print(f"Error: {e} Please try again.")
+        if args.sweep:
+            seating_arrangement_system.sweep(
+                args.buffers,
+                args.densities,
+                args.workers,
+                args.source,
+                args.strategy,
+            )
+            print(f"Log file created at: {log_file}")
+            return
+
+        # Prompt for any setting not given on the command line
+        buffer, density = prompt_settings(args.buffer, args.density)
 
         logging.info(f"Configuration: Buffer={buffer}, Density={density}")
         print(f"Configuration set: Buffer={buffer}, Density={density}")
 
+        if args.partitioned:
+            seating_arrangement_system.process_partitioned(
+                buffer,
+                density,
+                export_mode=args.export_mode,
+                strategy=args.strategy,
+                output_workers=args.output_workers,
+            )
+            print(f"Log file created at: {log_file}")
+            return
+
         # Process the seating arrangement
         start_time = datetime.now()
-        seating_arrangement_system.process_seating(buffer, density)
+        seating_arrangement_system.process_seating(
+            buffer,
+            density,
+            export_mode=args.export_mode,
+            workers=args.workers,
+            source=args.source,
+            incremental=args.incremental,
+            strategy=args.strategy,
+            profile=args.profile,
+            trace_format=args.trace_format,
+            output_workers=args.output_workers,
+            recolour=args.recolour_timetable,
+        )
         end_time = datetime.now()
 
         duration = (end_time - start_time).total_seconds()
@@ -85,6 +272,11 @@ def main():
         print(f"Seating arrangement completed in {duration:.2f} seconds")
         print(f"Log file created at: {log_file}")
 
+        if args.serve and seating_arrangement_system.student_index is not None:
+            from utils.student_lookup import serve
+
+            serve(seating_arrangement_system.student_index, args.host, args.port)
+
     except KeyboardInterrupt:
         logging.warning("Process interrupted by user")
         print("\nProcess interrupted by user. Exiting...")
@@ -5,10 +5,58 @@ import pandas as pd
 import logging
 import time
 from datetime import datetime
+
+# Modules used by a single report or mode (slot move suggestions, seat maps,
+# utilization, the run store, sweeps, partitioned runs...) are imported where
+# they are used, so a run only loads what its settings ask for.
 from utils.file_handler import read_excel, write_excel
-from utils.classroom_allocator import allocate_classrooms
-from utils.conflict_checker import check_conflicts, display_conflicts
-from config.settings import BUFFER, SPARSE_DENSE
+from utils.classroom_allocator import (
+    allocate_classrooms,
+    allocate_slots,
+    calculate_effective_capacity,
+    calculate_seats_left,
+    export_allocation,
+    room_buildings,
+)
+from utils.conflict_checker import (
+    CONFLICT_FILES,
+    check_conflicts,
+    display_conflicts,
+    save_conflict_data,
+)
+from utils.incremental import allocate_incremental
+from utils.instrumentation import Profiler, activate, span
+from utils.plan_exporter import write_rows_xlsx
+from utils.report_writer import ALLOCATION_COLUMNS, write_html_report
+from utils.result_cache import ResultCache, export_is_current, record_export, result_key
+from utils.roll_table import encode_course_rolls, materialize_roll_numbers
+from config.settings import (
+    BUFFER,
+    SPARSE_DENSE,
+    SEATING_POLICIES,
+    EXPORT_MODE,
+    ALLOCATION_WORKERS,
+    OUTPUT_WRITERS,
+    PARTITION_DIR,
+    INPUT_CACHE_DIR,
+    INPUT_SOURCE,
+    INCREMENTAL_STATE_FILE,
+    ALLOCATION_STRATEGY,
+    OPTIMAL_TIME_BUDGET,
+    PROFILE_MODE,
+    PROFILE_TRACE,
+    SEAT_MAP,
+    SEATS_PER_ROW,
+    RUN_STORE_DB,
+    ADMIT_CARDS,
+    SUGGEST_SLOT_MOVES,
+    RECOLOUR_TIMETABLE,
+    UTILIZATION_REPORT,
+    RESULT_CACHE_DIR,
+    RESULT_CACHE_MAX_MB,
+    RESULT_EXPORT_STAMP,
+)
+from convert_to_excel import load_inputs_from_csv, partition_inputs_from_csv
 
 
 class SeatingArrangement:
@@ -18,13 +66,43 @@ class SeatingArrangement:
         os.makedirs("data/output", exist_ok=True)
         os.makedirs("logs", exist_ok=True)
 
-    def process_seating(self, buffer, sparse_dense):
+        # Roll number -> exam seats index of the last successful run
+        self.student_index = None
+
+    def process_seating(
+        self,
+        buffer,
+        sparse_dense,
+        export_mode=EXPORT_MODE,
+        workers=ALLOCATION_WORKERS,
+        source=INPUT_SOURCE,
+        incremental=False,
+        strategy=ALLOCATION_STRATEGY,
+        profile=PROFILE_MODE,
+        trace_format=PROFILE_TRACE,
+        output_workers=OUTPUT_WRITERS,
+        recolour=RECOLOUR_TIMETABLE,
+    ):
         """
         Process the seating arrangement based on given parameters.
 
         Args:
             buffer (int): Number of buffer seats to keep in each classroom
-            sparse_dense (str): Either 'sparse' or 'dense' seating arrangement
+            sparse_dense (str): 'sparse' or 'dense' seating, or another of
+                settings.SEATING_POLICIES
+            export_mode (str): Seating plan layout: 'files', 'workbook' or 'zip'
+            workers (int): Number of slots to allocate concurrently
+            source (str): 'excel' to read data/input/*.xlsx, 'csv' to ingest
+                the input_data_tt CSV exports directly
+            incremental (bool): Re-solve only the date/slot groups that changed
+                since the previous incremental run and rewrite only their files
+            strategy (str): Per-slot allocation strategy: 'greedy' or 'optimal'
+            profile (str): None, 'cprofile' or 'tracemalloc' for extra profiling output
+            trace_format (str): 'json' or 'chrome' stage trace written to the
+                run directory, or None to skip it
+            output_workers (int): Threads writing the per-room plan files
+            recolour (bool): Also re-plan the whole timetable by graph
+                colouring and write recoloured_timetable.xlsx
 
         Returns:
             tuple: (seating_arrangement DataFrame, conflicts list)
@@ -32,6 +110,11 @@ class SeatingArrangement:
         start_time = time.time()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+        # Stage timings and counters for this run, written to its run directory
+        profiler = Profiler(profile)
+        profiler.start()
+        output_dir = None
+
         try:
             logging.info("Starting seating arrangement process")
             print("Starting seating arrangement process...")
@@ -40,63 +123,268 @@ class SeatingArrangement:
             output_dir = f"data/output/run_{timestamp}"
             os.makedirs(output_dir, exist_ok=True)
 
-            # Load input data
-            print("Loading input data...")
-            roll_name_mapping = read_excel("data/input/in_roll_name_mapping.xlsx")
-            courses = read_excel("data/input/in_courses.xlsx")
-            classrooms = read_excel("data/input/in_classrooms.xlsx")
-
-            logging.info(
-                f"Loaded {len(courses)} courses and {len(classrooms)} classrooms"
-            )
-            print(f"Loaded {len(courses)} courses and {len(classrooms)} classrooms")
+            with activate(profiler):
+                # Load input data
+                print("Loading input data...")
+                with span("load", source=source):
+                    roll_name_mapping, classrooms, courses, roll_table = (
+                        self._load_inputs(source)
+                    )
 
-            # Validate user input
-            if sparse_dense not in ["sparse", "dense"]:
-                raise ValueError(
-                    "Invalid input for Sparse/Dense. Please enter 'Sparse' or 'Dense'."
+                logging.info(
+                    f"Loaded {len(courses)} courses and {len(classrooms)} classrooms"
                 )
-
-            # Check for scheduling conflicts before allocation
-            print("Checking for scheduling conflicts...")
-            conflicts = check_conflicts(courses)
-
-            # Allocate classrooms
-            print(
-                f"Allocating classrooms with buffer={buffer}, density={sparse_dense}..."
-            )
-            seating_arrangement = allocate_classrooms(
-                courses, classrooms, buffer, sparse_dense
-            )
-
-            # Save run metadata
-            metadata = {
-                "timestamp": timestamp,
-                "buffer": buffer,
-                "density": sparse_dense,
-                "num_courses": len(courses),
-                "num_classrooms": len(classrooms),
-                "num_allocations": len(seating_arrangement),
-                "num_conflicts": len(conflicts),
-                "execution_time_seconds": time.time() - start_time,
-            }
-            pd.DataFrame([metadata]).to_excel(
-                f"{output_dir}/metadata.xlsx", index=False
-            )
-
-            # Write outputs to Excel
-            output_file = "data/output/op_overall_seating_arrangement.xlsx"
-            write_excel(output_file, seating_arrangement)
-
-            # Also save a copy in the timestamped directory
-            seating_arrangement.to_excel(
-                f"{output_dir}/seating_arrangement.xlsx", index=False
-            )
-
-            # Create a simple HTML summary for easy viewing
-            create_html_summary(
-                seating_arrangement, conflicts, metadata, f"{output_dir}/summary.html"
-            )
+                print(f"Loaded {len(courses)} courses and {len(classrooms)} classrooms")
+
+                # Validate user input
+                if sparse_dense not in SEATING_POLICIES:
+                    raise ValueError(
+                        f"Invalid input for Sparse/Dense. Please enter one of: {', '.join(SEATING_POLICIES)}."
+                    )
+
+                # Reuse the results of an earlier run with the same inputs and settings
+                cache = cache_key = cached = None
+                if RESULT_CACHE_DIR and not incremental:
+                    with span("result_cache"):
+                        cache = ResultCache(
+                            RESULT_CACHE_DIR, RESULT_CACHE_MAX_MB * 1024 * 1024
+                        )
+                        cache_key = result_key(
+                            courses,
+                            classrooms,
+                            roll_table,
+                            {
+                                "buffer": buffer,
+                                "density": sparse_dense,
+                                "density_ratios": SPARSE_DENSE,
+                                "strategy": strategy,
+                                "time_budget": OPTIMAL_TIME_BUDGET,
+                                "suggest_moves": SUGGEST_SLOT_MOVES,
+                            },
+                        )
+                        cached = cache.get(cache_key)
+                    if cached is not None:
+                        print("Reusing the results of an earlier run with the same inputs and settings")
+
+                # Check for scheduling conflicts before allocation
+                if cached is not None:
+                    conflicts = cached["conflicts"]
+                else:
+                    print("Checking for scheduling conflicts...")
+                    with span("conflict_check", courses=len(courses)):
+                        conflicts = check_conflicts(courses, roll_table)
+
+                # Seats on offer in every slot, for the timetable suggestions
+                slot_capacity = None
+                if (SUGGEST_SLOT_MOVES and cached is None) or recolour:
+                    slot_capacity = sum(
+                        calculate_effective_capacity(
+                            classrooms, buffer, sparse_dense, SPARSE_DENSE
+                        ).values()
+                    )
+
+                # Suggest slot moves for clashing courses and over-full slots
+                suggestions = None
+                if SUGGEST_SLOT_MOVES:
+                    from utils.conflict_resolver import SUGGESTION_COLUMNS, suggest_slot_moves
+
+                    with span("suggest_moves"):
+                        if cached is not None:
+                            suggestions = cached["suggestions"]
+                        else:
+                            suggestions = suggest_slot_moves(
+                                courses, slot_capacity, roll_table, SUGGEST_SLOT_MOVES
+                            )
+                        if len(suggestions):
+                            write_rows_xlsx(
+                                f"{output_dir}/slot_move_suggestions.xlsx",
+                                SUGGESTION_COLUMNS,
+                                suggestions.to_dict("records"),
+                                "Slot moves",
+                            )
+
+                # Re-plan the whole timetable when asked
+                if recolour:
+                    from utils.conflict_resolver import TIMETABLE_COLUMNS, recolour_timetable
+
+                    print("Re-planning the exam timetable...")
+                    with span("recolour_timetable"):
+                        timetable = recolour_timetable(courses, slot_capacity, roll_table)
+                        if len(timetable):
+                            write_rows_xlsx(
+                                f"{output_dir}/recoloured_timetable.xlsx",
+                                TIMETABLE_COLUMNS,
+                                timetable.to_dict("records"),
+                                "Timetable",
+                            )
+
+                # Allocate classrooms
+                print(
+                    f"Allocating classrooms with buffer={buffer}, density={sparse_dense}..."
+                )
+                with span("allocate", strategy=strategy, incremental=incremental):
+                    if incremental:
+                        seating_arrangement = allocate_incremental(
+                            courses,
+                            classrooms,
+                            buffer,
+                            sparse_dense,
+                            roll_table,
+                            INCREMENTAL_STATE_FILE,
+                            export_mode,
+                            workers,
+                            strategy=strategy,
+                            time_budget=OPTIMAL_TIME_BUDGET,
+                            output_workers=output_workers,
+                            density_ratios=SPARSE_DENSE,
+                        )
+                    elif cache is not None:
+                        seating_arrangement = self._allocate_cached(
+                            cache,
+                            cache_key,
+                            cached,
+                            courses,
+                            classrooms,
+                            buffer,
+                            sparse_dense,
+                            roll_table,
+                            export_mode,
+                            workers,
+                            strategy,
+                            output_workers,
+                            conflicts,
+                            suggestions,
+                        )
+                    else:
+                        seating_arrangement = allocate_classrooms(
+                            courses,
+                            classrooms,
+                            buffer,
+                            sparse_dense,
+                            roll_table,
+                            export_mode,
+                            workers,
+                            strategy,
+                            OPTIMAL_TIME_BUDGET,
+                            output_workers,
+                            SPARSE_DENSE,
+                        )
+
+                # Save run metadata
+                metadata = {
+                    "timestamp": timestamp,
+                    "buffer": buffer,
+                    "density": sparse_dense,
+                    "strategy": strategy,
+                    "num_courses": len(courses),
+                    "num_classrooms": len(classrooms),
+                    "num_allocations": len(seating_arrangement),
+                    "num_conflicts": len(conflicts),
+                    "execution_time_seconds": time.time() - start_time,
+                }
+                stage_seconds = profiler.stage_seconds()
+                for stage in ("load", "conflict_check", "allocate"):
+                    metadata[f"{stage}_seconds"] = stage_seconds.get(stage, 0.0)
+
+                with span("write_outputs"):
+                    pd.DataFrame([metadata]).to_excel(
+                        f"{output_dir}/metadata.xlsx", index=False
+                    )
+
+                    # Write outputs to Excel, turning student ids back into roll numbers
+                    output_file = "data/output/op_overall_seating_arrangement.xlsx"
+                    seating_output = materialize_roll_numbers(
+                        seating_arrangement, roll_table
+                    )
+                    write_excel(output_file, seating_output)
+
+                    # Also save a copy in the timestamped directory
+                    seating_output.to_excel(
+                        f"{output_dir}/seating_arrangement.xlsx", index=False
+                    )
+
+                # Utilization and stranded seats per slot, room, building and date
+                if UTILIZATION_REPORT:
+                    from utils.utilization import analyze_utilization, save_utilization_report
+
+                    with span("utilization"):
+                        analysis = analyze_utilization(
+                            seating_arrangement,
+                            courses,
+                            calculate_effective_capacity(
+                                classrooms, buffer, sparse_dense, SPARSE_DENSE
+                            ),
+                            room_buildings(classrooms),
+                        )
+                        save_utilization_report(analysis, output_dir)
+
+                # Assign every student a seat within their room
+                seat_map = None
+                if SEAT_MAP and not seating_arrangement.empty:
+                    from utils.seat_layout import SEAT_MAP_COLUMNS, build_seat_maps
+
+                    with span("seat_map"):
+                        seat_map = build_seat_maps(
+                            seating_arrangement,
+                            classrooms,
+                            sparse_dense,
+                            roll_table,
+                            SEATS_PER_ROW,
+                        )
+                        write_rows_xlsx(
+                            f"{output_dir}/seat_map.xlsx",
+                            SEAT_MAP_COLUMNS,
+                            seat_map.to_dict("records"),
+                            "Seat map",
+                        )
+
+                # Index every student's seats once for lookups and admit cards
+                from utils.student_lookup import StudentSeatIndex, names_from_mapping
+
+                with span("student_index"):
+                    self.student_index = StudentSeatIndex.from_allocations(
+                        seating_arrangement,
+                        roll_table,
+                        seat_map,
+                        names_from_mapping(roll_name_mapping),
+                    )
+                    if ADMIT_CARDS:
+                        self.student_index.export_admit_cards(
+                            f"{output_dir}/admit_cards.xlsx"
+                        )
+
+                # Keep the run queryable across runs in the SQLite store
+                if RUN_STORE_DB:
+                    from utils.run_store import save_run, seats_left_table
+
+                    with span("run_store"):
+                        slots = sorted(set(zip(courses["date"], courses["slot"])))
+                        save_run(
+                            RUN_STORE_DB,
+                            timestamp,
+                            metadata,
+                            seating_arrangement,
+                            roll_table,
+                            conflicts,
+                            seats_left_table(
+                                seating_arrangement,
+                                classrooms,
+                                buffer,
+                                sparse_dense,
+                                slots,
+                                SPARSE_DENSE,
+                            ),
+                            seat_map,
+                        )
+
+                # Create a simple HTML summary for easy viewing
+                with span("html_summary"):
+                    create_html_summary(
+                        seating_arrangement,
+                        conflicts,
+                        metadata,
+                        f"{output_dir}/summary.html",
+                    )
 
             print("\n" + "=" * 50)
             print("SEATING ARRANGEMENT SUMMARY")
@@ -108,7 +396,7 @@ class SeatingArrangement:
             print(f"Total allocations created: {len(seating_arrangement)}")
 
             # Display conflicts if any
-            display_conflicts(conflicts)
+            display_conflicts(conflicts, suggestions)
 
             execution_time = time.time() - start_time
             print(f"\nExecution completed in {execution_time:.2f} seconds")
@@ -125,125 +413,287 @@ class SeatingArrangement:
             print("Please check the logs for more details.")
             return None, None
 
+        finally:
+            # Written for failed runs too, to show which stage was running
+            profiler.stop()
+            if output_dir and trace_format:
+                self._write_profile(profiler, output_dir, trace_format)
+
+    def sweep(
+        self,
+        buffers,
+        densities,
+        workers=ALLOCATION_WORKERS,
+        source=INPUT_SOURCE,
+        strategy=ALLOCATION_STRATEGY,
+    ):
+        """
+        Compare buffer/density scenarios without writing any seating plans.
+
+        Inputs are loaded once and every (buffer, density) combination is
+        allocated, `workers` scenarios at a time. The comparison table is
+        printed and saved to data/output/sweep_<timestamp>.xlsx.
 
-def create_html_summary(seating_arrangement, conflicts, metadata, output_file):
-    """Create a simple HTML summary of the seating arrangement."""
-    try:
-        # Group by date and slot
-        date_slot_groups = seating_arrangement.groupby(["date", "slot"])
-
-        # Create HTML content
-        html_content = f"""<!DOCTYPE html>
-        <html>
-        <head>
-            <title>Seating Arrangement Summary</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                h1, h2, h3 {{ color: #2c3e50; }}
-                table {{ border-collapse: collapse; width: 100%; margin-bottom: 20px; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                th {{ background-color: #f2f2f2; }}
-                tr:nth-child(even) {{ background-color: #f9f9f9; }}
-                .summary-box {{ background-color: #f8f9fa; border: 1px solid #e9ecef; padding: 15px; margin-bottom: 20px; border-radius: 5px; }}
-                .conflict {{ color: red; }}
-            </style>
-        </head>
-        <body>
-            <h1>Seating Arrangement Summary</h1>
-            
-            <div class="summary-box">
-                <h2>Run Information</h2>
-                <p><strong>Timestamp:</strong> {metadata['timestamp']}</p>
-                <p><strong>Buffer:</strong> {metadata['buffer']} seats</p>
-                <p><strong>Density:</strong> {metadata['density'].capitalize()}</p>
-                <p><strong>Courses:</strong> {metadata['num_courses']}</p>
-                <p><strong>Classrooms:</strong> {metadata['num_classrooms']}</p>
-                <p><strong>Allocations:</strong> {metadata['num_allocations']}</p>
-                <p><strong>Conflicts:</strong> <span class="{'conflict' if metadata['num_conflicts'] > 0 else ''}">{metadata['num_conflicts']}</span></p>
-                <p><strong>Execution Time:</strong> {metadata['execution_time_seconds']:.2f} seconds</p>
-            </div>
+        Returns:
+            DataFrame: One row per scenario, see utils.sweep.SWEEP_COLUMNS
         """
+        start_time = time.time()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        # Add schedule table
-        html_content += """
-            <h2>Schedule Overview</h2>
-            <table>
-                <tr>
-                    <th>Date</th>
-                    <th>Slot</th>
-                    <th>Courses</th>
-                    <th>Rooms</th>
-                    <th>Students</th>
-                </tr>
+        try:
+            print("Loading input data...")
+            _, classrooms, courses, roll_table = self._load_inputs(source)
+
+            print(
+                f"Sweeping buffers {list(buffers)} and densities {list(densities)}..."
+            )
+            from utils.sweep import run_sweep
+
+            results = run_sweep(
+                courses,
+                classrooms,
+                roll_table,
+                buffers,
+                densities,
+                workers,
+                strategy,
+                OPTIMAL_TIME_BUDGET,
+                SPARSE_DENSE,
+            )
+
+            output_file = f"data/output/sweep_{timestamp}.xlsx"
+            results.to_excel(output_file, index=False)
+
+            print("\n" + "=" * 50)
+            print("BUFFER/DENSITY SWEEP")
+            print("=" * 50)
+            print(results.to_string(index=False))
+            print(f"\nSweep completed in {time.time() - start_time:.2f} seconds")
+            print(f"Results saved to: {output_file}")
+            logging.info(
+                f"Sweep of {len(results)} scenarios saved to {output_file}"
+            )
+            return results
+
+        except Exception as e:
+            logging.error(f"An error occurred during the sweep: {str(e)}", exc_info=True)
+            print(f"An error occurred: {str(e)}")
+            print("Please check the logs for more details.")
+            return None
+
+    def process_partitioned(
+        self,
+        buffer,
+        sparse_dense,
+        export_mode=EXPORT_MODE,
+        strategy=ALLOCATION_STRATEGY,
+        output_workers=OUTPUT_WRITERS,
+        partition_dir=PARTITION_DIR,
+    ):
         """
+        Allocate with memory bounded by the largest date/slot rather than the term.
+
+        The CSV exports are split into one file per date/slot under
+        partition_dir, then each partition is conflict-checked, allocated
+        and written out before the next one is read. Writes the same
+        outputs as process_seating, without the seat map, admit cards and
+        run store, which need every student at once.
 
-        for (date, slot), group in date_slot_groups:
-            courses_count = group["course_id"].nunique()
-            rooms_count = group["room_id"].nunique()
-            students_count = group["enrollment"].sum()
-
-            html_content += f"""
-                <tr>
-                    <td>{date}</td>
-                    <td>{slot}</td>
-                    <td>{courses_count}</td>
-                    <td>{rooms_count}</td>
-                    <td>{students_count}</td>
-                </tr>
-            """
-
-        html_content += """
-            </table>
+        Returns:
+            dict: Totals from utils.partitioned.allocate_partitioned
         """
+        start_time = time.time()
 
-        # Add conflicts section if there are conflicts
-        if conflicts:
-            html_content += """
-                <h2 class="conflict">Conflicts Detected</h2>
-                <p>The following students have scheduling conflicts:</p>
-                <table>
-                    <tr>
-                        <th>Student</th>
-                        <th>Date</th>
-                        <th>Slot</th>
-                        <th>Course 1</th>
-                        <th>Course 2</th>
-                    </tr>
-            """
-
-            for conflict in conflicts[
-                :100
-            ]:  # Limit to 100 conflicts to avoid huge HTML files
-                html_content += f"""
-                    <tr>
-                        <td>{conflict['roll_number']}</td>
-                        <td>{conflict['date']}</td>
-                        <td>{conflict['slot']}</td>
-                        <td>{conflict['course1']}</td>
-                        <td>{conflict['course2']}</td>
-                    </tr>
-                """
-
-            if len(conflicts) > 100:
-                html_content += f"""
-                    <tr>
-                        <td colspan="5">... and {len(conflicts) - 100} more conflicts (see Excel reports for full details)</td>
-                    </tr>
-                """
-
-            html_content += """
-                </table>
-            """
-
-        # Close HTML
-        html_content += """
-        </body>
-        </html>
+        try:
+            if sparse_dense not in SEATING_POLICIES:
+                raise ValueError(
+                    f"Invalid input for Sparse/Dense. Please enter one of: {', '.join(SEATING_POLICIES)}."
+                )
+
+            print("Partitioning input data by date and slot...")
+            classrooms, manifest = partition_inputs_from_csv(partition_dir)
+
+            print(
+                f"Allocating {len(manifest['partitions'])} date/slot partitions with "
+                f"buffer={buffer}, density={sparse_dense}..."
+            )
+            from utils.partitioned import allocate_partitioned
+
+            totals = allocate_partitioned(
+                partition_dir,
+                classrooms,
+                buffer,
+                sparse_dense,
+                export_mode=export_mode,
+                strategy=strategy,
+                time_budget=OPTIMAL_TIME_BUDGET,
+                output_workers=output_workers,
+                density_ratios=SPARSE_DENSE,
+            )
+
+            print("\n" + "=" * 50)
+            print("PARTITIONED SEATING ARRANGEMENT SUMMARY")
+            print("=" * 50)
+            print(f"Date/slot partitions: {totals['partitions']}")
+            print(f"Total courses processed: {totals['courses']}")
+            print(f"Total allocations created: {totals['allocations']}")
+            print(f"Conflicts found: {totals['conflicts']}")
+            print(f"Courses not allocated: {totals['unallocated']}")
+            print(
+                f"Largest partition: {totals['largest_partition_enrollment']} enrollments"
+            )
+            print(f"\nExecution completed in {time.time() - start_time:.2f} seconds")
+            print("Results saved to: data/output/op_overall_seating_arrangement.xlsx")
+            return totals
+
+        except Exception as e:
+            logging.error(
+                f"An error occurred during the partitioned run: {str(e)}", exc_info=True
+            )
+            print(f"An error occurred: {str(e)}")
+            print("Please check the logs for more details.")
+            return None
+
+    def _allocate_cached(
+        self,
+        cache,
+        key,
+        cached,
+        courses,
+        classrooms,
+        buffer,
+        sparse_dense,
+        roll_table,
+        export_mode,
+        workers,
+        strategy,
+        output_workers,
+        conflicts,
+        suggestions,
+    ):
+        """
+        Allocate through the result cache, exporting only when needed.
+
+        On a miss the slots are allocated and the allocation, seats left,
+        conflicts and suggestions are stored under key; on a hit they come
+        from `cached`. The seating plans, op_seats_left.xlsx and the conflict
+        reports are written unless data/output still holds this result's files
+        in export_mode.
+
+        Returns:
+            DataFrame: The allocation, students as 'student_ids' arrays
         """
+        if cached is None:
+            seating_arrangement, seats_left, _ = allocate_slots(
+                courses,
+                classrooms,
+                buffer,
+                sparse_dense,
+                roll_table,
+                workers,
+                strategy,
+                OPTIMAL_TIME_BUDGET,
+                SPARSE_DENSE,
+            )
+            seats_left = calculate_seats_left(seats_left)
+            cache.put(
+                key,
+                {
+                    "allocation": seating_arrangement,
+                    "seats_left": seats_left,
+                    "conflicts": conflicts,
+                    "suggestions": suggestions,
+                },
+            )
+        else:
+            seating_arrangement = cached["allocation"]
+            seats_left = cached["seats_left"]
+
+        if seating_arrangement.empty:
+            logging.warning(
+                "No allocations were made. All rooms may be too small for the courses."
+            )
+        elif export_is_current(RESULT_EXPORT_STAMP, key, export_mode, "data/output"):
+            logging.info("Seating plans in data/output are up to date; skipping export")
+            print("Seating plans in data/output are up to date; skipping export")
+        else:
+            paths = export_allocation(
+                seating_arrangement, seats_left, roll_table, export_mode, output_workers
+            )
+            if conflicts:
+                # check_conflicts wrote the conflict reports unless the result was cached
+                if cached is not None:
+                    save_conflict_data(conflicts)
+                paths += [
+                    f"conflicts/{file_name}"
+                    for file_name in CONFLICT_FILES
+                    if os.path.exists(f"data/output/conflicts/{file_name}")
+                ]
+            record_export(RESULT_EXPORT_STAMP, key, export_mode, "data/output", paths)
+        return seating_arrangement
+
+    def _load_inputs(self, source):
+        """Return (roll_name_mapping, classrooms, courses with 'student_ids', roll_table)."""
+        if source == "csv":
+            # Courses come straight from the CSVs as student id arrays
+            return load_inputs_from_csv()
+        if source == "excel":
+            roll_name_mapping = read_excel(
+                "data/input/in_roll_name_mapping.xlsx", INPUT_CACHE_DIR
+            )
+            courses = read_excel("data/input/in_courses.xlsx", INPUT_CACHE_DIR)
+            classrooms = read_excel("data/input/in_classrooms.xlsx", INPUT_CACHE_DIR)
+
+            # Intern roll numbers once; everything downstream works on id arrays
+            courses, roll_table = encode_course_rolls(courses)
+            return roll_name_mapping, classrooms, courses, roll_table
+        raise ValueError(
+            f"Invalid input source '{source}'. Please use 'excel' or 'csv'."
+        )
+
+    def _write_profile(self, profiler, output_dir, trace_format):
+        """Write the run's trace and log the slowest slots."""
+        try:
+            profiler.write(output_dir, trace_format)
+            for record in profiler.slowest("allocate_slot", limit=3):
+                args = record["args"]
+                logging.info(
+                    f"Slow slot {args['date']} {args['slot']}: "
+                    f"{record['seconds']:.3f}s for {args['courses']} courses"
+                )
+        except Exception as e:
+            logging.error(f"Error writing profiling output: {str(e)}")
 
-        # Write to file
-        with open(output_file, "w") as f:
-            f.write(html_content)
+
+def create_html_summary(seating_arrangement, conflicts, metadata, output_file):
+    """
+    Create an HTML summary of the seating arrangement.
+
+    The page is streamed to disk by write_html_report; the full conflict and
+    allocation tables go to paginated data files next to it (summary_data/),
+    so large runs are shown without truncation.
+    """
+    try:
+        schedule = (
+            seating_arrangement.groupby(["date", "slot"], sort=True)
+            .agg(
+                courses=("course_id", "nunique"),
+                rooms=("room_id", "nunique"),
+                students=("enrollment", "sum"),
+            )
+            .reset_index()
+        )
+        allocations = seating_arrangement[ALLOCATION_COLUMNS].itertuples(
+            index=False, name=None
+        )
+
+        write_html_report(
+            output_file,
+            metadata,
+            schedule.to_dict("records"),
+            conflicts,
+            (dict(zip(ALLOCATION_COLUMNS, row)) for row in allocations),
+        )
 
     except Exception as e:
         logging.error(f"Error creating HTML summary: {str(e)}")
@@ -0,0 +1,145 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .instrumentation import activate, count, get_profiler, span
+
+# Files rendered and written at the same time
+DEFAULT_WRITERS = 8
+
+
+class AsyncFileWriter:
+    """
+    Render and write many small output files concurrently.
+
+    Each submitted file is rendered to bytes and written by a pool of worker
+    threads, so slow writes (e.g. to a network share) overlap instead of
+    running one after another. At most `max_pending` files are queued at once;
+    submit() blocks until a worker frees a place, which keeps memory bounded
+    however many files are produced. Directories are created once each.
+
+    Use it as a context manager; leaving the block waits for every file and
+    re-raises the first error a worker hit. When a Profiler is active in the
+    submitting thread, each file is recorded on it as a "write_file" span
+    from the writer thread that wrote it.
+
+    Parameters:
+    - output_dir: Directory that submitted paths are relative to
+    - workers: Number of writer threads (1 writes serially in one thread)
+    - max_pending: Files that may be queued or in progress; default 4 per worker
+    - expected: Number of files expected, used for progress messages
+    """
+
+    def __init__(
+        self,
+        output_dir=".",
+        workers=DEFAULT_WRITERS,
+        max_pending=None,
+        expected=None,
+    ):
+        self.output_dir = output_dir
+        self.workers = max(int(workers), 1)
+        self.expected = expected
+        self.written = 0
+        self.bytes_written = 0
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="output-writer"
+        )
+        self._pending = threading.BoundedSemaphore(max_pending or self.workers * 4)
+        self._lock = threading.Lock()
+        self._directories = set()
+        self._errors = []
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def submit(self, path, render, *args):
+        """
+        Queue one file: `render(*args)` must return the file contents as bytes.
+
+        `path` is relative to output_dir. Blocks while max_pending files are queued.
+        """
+        if self._closed:
+            raise RuntimeError("Cannot submit to a closed AsyncFileWriter")
+        if self._errors:
+            # Stop queueing work once a write has failed
+            raise self._errors[0]
+        self._pending.acquire()
+        try:
+            future = self._pool.submit(
+                self._write, path, render, args, get_profiler()
+            )
+        except Exception:
+            self._pending.release()
+            raise
+        future.add_done_callback(self._done)
+
+    def makedirs(self, directory):
+        """Create `directory` (relative to output_dir) unless it was already created."""
+        full_path = os.path.join(self.output_dir, directory)
+        if full_path in self._directories:
+            return
+        # Created under the lock, so no writer sees the directory before it exists
+        with self._lock:
+            if full_path not in self._directories:
+                os.makedirs(full_path, exist_ok=True)
+                self._directories.add(full_path)
+
+    def close(self):
+        """Wait for every queued file, then raise the first error, if any."""
+        if self._closed:
+            return
+        self._closed = True
+        self._pool.shutdown(wait=True)
+
+        count("files_written", self.written)
+        logging.info(
+            f"Wrote {self.written} files ({self.bytes_written / 1024:.0f} KB) "
+            f"to {self.output_dir} with {self.workers} writers"
+        )
+        if self._errors:
+            raise self._errors[0]
+
+    def _write(self, path, render, args, profiler):
+        # Writer threads have no active profiler of their own
+        with activate(profiler), span("write_file", file=path):
+            payload = render(*args)
+
+            self.makedirs(os.path.dirname(path))
+            with open(os.path.join(self.output_dir, path), "wb") as f:
+                f.write(payload)
+
+        with self._lock:
+            self.written += 1
+            self.bytes_written += len(payload)
+            written = self.written
+        self._report_progress(written)
+
+    def _done(self, future):
+        self._pending.release()
+        error = future.exception()
+        if error is not None:
+            logging.error(f"Error writing output file: {str(error)}")
+            with self._lock:
+                self._errors.append(error)
+
+    def _report_progress(self, written):
+        step = max(self.expected // 10, 1) if self.expected else 100
+        if written % step == 0:
+            total = f"/{self.expected}" if self.expected else ""
+            logging.info(f"Written {written}{total} files to {self.output_dir}")
+
+
+def dataframe_xlsx(df):
+    """Return df as the bytes of an .xlsx file, as df.to_excel(index=False) writes it."""
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False, engine="openpyxl")
+    return buffer.getvalue()
@@ -0,0 +1,176 @@
+import bisect
+from collections import defaultdict
+
+
+def building_of(room_id):
+    """Guess the building of a room from its id (e.g. "B-001" -> "B", "6101" -> "6")."""
+    room_id = str(room_id)
+    return room_id.split("-")[0] if "-" in room_id else room_id[0]
+
+
+class SlotCapacityLedger:
+    """
+    Free-seat ledger for a single (date, slot).
+
+    Rooms are kept in sorted indexes keyed by free seats, one for the whole
+    slot and one per building, so best-fit and largest-fit lookups are a
+    bisect (O(log R)) instead of a full re-sort per course.
+
+    Parameters:
+    - room_capacities: dict mapping room_id to effective capacity for the slot
+    - room_buildings: optional dict mapping room_id to building (the Block
+      column of the room data); rooms missing from it fall back to
+      building_of(room_id)
+    """
+
+    def __init__(self, room_capacities, room_buildings=None):
+        room_buildings = room_buildings or {}
+        self.free = {}
+        self.building = {}
+        self._order = {}
+        self._index = []
+        self._building_index = defaultdict(list)
+        self.total_free = 0
+        self.building_free = defaultdict(int)
+        # Number of best-fit/largest lookups, reported as an allocation counter
+        self.lookups = 0
+
+        for position, (room_id, capacity) in enumerate(room_capacities.items()):
+            capacity = max(int(capacity), 0)
+            self.free[room_id] = capacity
+            self.building[room_id] = room_buildings.get(room_id) or building_of(
+                room_id
+            )
+            # Earlier rooms win ties, matching the allocator's input ordering
+            self._order[room_id] = -position
+            self.total_free += capacity
+            self.building_free[self.building[room_id]] += capacity
+            if capacity > 0:
+                self._insert(room_id)
+
+    def _key(self, room_id):
+        return (self.free[room_id], self._order[room_id], room_id)
+
+    def _insert(self, room_id):
+        key = self._key(room_id)
+        bisect.insort(self._index, key)
+        bisect.insort(self._building_index[self.building[room_id]], key)
+
+    def _remove(self, room_id):
+        key = self._key(room_id)
+        for index in (self._index, self._building_index[self.building[room_id]]):
+            del index[bisect.bisect_left(index, key)]
+
+    def _select(self, building):
+        if building is None:
+            return self._index
+        return self._building_index.get(building, [])
+
+    def largest(self, building=None):
+        """Return the room_id with the most free seats, or None if all rooms are full."""
+        self.lookups += 1
+        index = self._select(building)
+        return index[-1][2] if index else None
+
+    def best_fit(self, seats, building=None):
+        """Return the room_id with the fewest free seats that still holds `seats`, or None."""
+        self.lookups += 1
+        index = self._select(building)
+        position = bisect.bisect_left(index, (seats, float("-inf")))
+        if position == len(index):
+            return None
+        # Among rooms with the same free seats, take the earliest one
+        position = bisect.bisect_left(index, (index[position][0], float("inf"))) - 1
+        return index[position][2]
+
+    def take(self, room_id, seats):
+        """Reserve `seats` seats in `room_id` and reindex it."""
+        if seats > self.free[room_id]:
+            raise ValueError(
+                f"Room {room_id} has only {self.free[room_id]} free seats, requested {seats}"
+            )
+        self._remove(room_id)
+        self.free[room_id] -= seats
+        self.total_free -= seats
+        self.building_free[self.building[room_id]] -= seats
+        if self.free[room_id] > 0:
+            self._insert(room_id)
+
+    def plan(self, seats, building=None):
+        """
+        Reserve seats for one course and return the list of (room_id, seats) placements.
+
+        A course that fits in a single room goes to the best-fitting room,
+        preferring `building`. Larger courses take the largest rooms of
+        `building` first and then the largest rooms anywhere, with the final
+        remainder placed best-fit. Without a preferred building, a course too
+        large for any one room starts in the building that can hold all of it
+        in the fewest rooms, so it is only split across buildings when no
+        single building has room for it. Returns None without reserving
+        anything when the slot does not have enough free seats.
+        """
+        if seats > self.total_free:
+            return None
+
+        # A building picked because it can hold the whole course is used up
+        # before any other building is considered
+        fill_building = None
+        if building is None and self.best_fit(seats) is None:
+            building = fill_building = self.building_for(seats)
+
+        placements = []
+        while seats > 0:
+            if fill_building is not None:
+                buildings = (fill_building,)
+            elif building is not None:
+                buildings = (building, None)
+            else:
+                buildings = (None,)
+            room_id = None
+            for candidate in buildings:
+                room_id = self.best_fit(seats, candidate)
+                if room_id is not None:
+                    break
+            if room_id is None:
+                for candidate in buildings:
+                    room_id = self.largest(candidate)
+                    if room_id is not None:
+                        break
+
+            to_place = min(self.free[room_id], seats)
+            self.take(room_id, to_place)
+            placements.append((room_id, to_place))
+            seats -= to_place
+
+            if building is None:
+                building = self.building[room_id]
+
+        return placements
+
+    def building_for(self, seats):
+        """
+        Return the building that can hold `seats` in the fewest rooms, or None.
+
+        Ties go to the building with the fewest free seats, then to the one
+        whose rooms come first, so large buildings stay free for large courses.
+        """
+        best = None
+        for building, free in self.building_free.items():
+            if free < seats:
+                continue
+            rooms_needed = 0
+            left = seats
+            for room_free, _, _ in reversed(self._building_index[building]):
+                left -= room_free
+                rooms_needed += 1
+                if left <= 0:
+                    break
+            self.lookups += 1
+            key = (rooms_needed, free)
+            if best is None or key < best[0]:
+                best = (key, building)
+        return best[1] if best else None
+
+    def seats_left(self):
+        """Return a dict mapping room_id to remaining free seats."""
+        return dict(self.free)
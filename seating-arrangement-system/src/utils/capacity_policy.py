@@ -0,0 +1,184 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import count
+from .seat_layout import DEFAULT_SEAT_COLUMNS, RoomGeometry, parse_sub_blocks
+
+# Share of the seats left after the buffer that "sparse" and "dense" use;
+# callers pass config.settings.SPARSE_DENSE, which has the same defaults
+DENSITY_RATIOS = {"sparse": 0.5, "dense": 1.0}
+
+# Classroom tables whose capacity vectors are kept
+MODEL_CACHE_SIZE = 8
+
+
+def _ratio_policy(name):
+    def policy(rooms, buffers, ratios):
+        return np.floor((rooms.capacity - buffers) * ratios[name])
+
+    return policy
+
+
+def _checkerboard_policy(rooms, buffers, ratios):
+    return rooms.checkerboard_seats - buffers
+
+
+def _sub_block_policy(rooms, buffers, ratios):
+    return rooms.sub_block_seats - buffers
+
+
+# Seating policies accepted wherever a density is: each maps the rooms and
+# their buffers to usable seats per room
+POLICIES = {
+    "dense": _ratio_policy("dense"),
+    "sparse": _ratio_policy("sparse"),
+    "checkerboard": _checkerboard_policy,
+    "sub_blocks": _sub_block_policy,
+}
+
+
+def get_capacity_policy(name):
+    """
+    Return the capacity function of a seating policy.
+
+    - "dense" / "sparse": (capacity - buffer) scaled by the density ratio
+    - "checkerboard": alternate seats of the room's seat grid, minus the buffer
+    - "sub_blocks": at most the room's sparse sub-block sizes ("6;6;5") of the
+      checkerboard seats in each sub-block, minus the buffer; rooms without
+      sub-block sizes use the plain checkerboard
+    """
+    if name not in POLICIES:
+        raise ValueError(
+            f"Unknown capacity policy '{name}'. Use one of: {', '.join(POLICIES)}."
+        )
+    return POLICIES[name]
+
+
+class RoomCapacities:
+    """
+    Seat counts of a classroom table, with effective capacities cached.
+
+    Effective capacities are computed once per (policy, buffer, ratios) as a
+    read-only NumPy array in room order and reused by every later call, so
+    allocations, sweeps and seats-left tables share one computation.
+
+    A 'buffer' column in the classroom table gives a room its own buffer;
+    blank cells take the run's buffer.
+
+    Parameters:
+    - classrooms_df: DataFrame with 'room_id', 'capacity' and optionally
+      'sub_blocks' and 'buffer'
+    - columns: Seats per row of the seat grid used by the checkerboard policies
+    """
+
+    def __init__(self, classrooms_df, columns=DEFAULT_SEAT_COLUMNS):
+        self.room_ids = classrooms_df["room_id"].tolist()
+        self.capacity = np.maximum(
+            classrooms_df["capacity"].to_numpy(dtype=float).astype(np.int64), 0
+        )
+        self.columns = columns
+        self.room_buffers = (
+            pd.to_numeric(classrooms_df["buffer"], errors="coerce").to_numpy(dtype=float)
+            if "buffer" in classrooms_df.columns
+            else np.full(len(self.room_ids), np.nan)
+        )
+        self.sub_blocks = (
+            [parse_sub_blocks(value) for value in classrooms_df["sub_blocks"]]
+            if "sub_blocks" in classrooms_df.columns
+            else [[] for _ in self.room_ids]
+        )
+        self._checkerboard = None
+        self._sub_block_seats = None
+        self._effective = {}
+        self._lock = threading.Lock()
+
+    @property
+    def checkerboard_seats(self):
+        """Seats with (row + column) even in each room's grid, as RoomGeometry lays it out."""
+        if self._checkerboard is None:
+            capacity = self.capacity
+            columns = np.clip(np.minimum(self.columns, capacity), 1, None)
+            full_rows, rest = np.divmod(capacity, columns)
+            even_rows = (full_rows + 1) // 2
+            seats = even_rows * ((columns + 1) // 2) + (full_rows - even_rows) * (
+                columns // 2
+            )
+            # The last, partial row starts on a used seat when its index is even
+            seats += np.where(full_rows % 2 == 0, (rest + 1) // 2, rest // 2)
+            self._checkerboard = seats
+        return self._checkerboard
+
+    @property
+    def sub_block_seats(self):
+        """Checkerboard seats within each room's sparse sub-block sizes."""
+        if self._sub_block_seats is None:
+            seats = self.checkerboard_seats.copy()
+            for position, blocks in enumerate(self.sub_blocks):
+                if blocks:
+                    geometry = RoomGeometry(self.capacity[position], self.columns, blocks)
+                    seats[position] = geometry.seat_order("sub_blocks")[1]
+            self._sub_block_seats = seats
+        return self._sub_block_seats
+
+    def effective(self, buffer, policy, ratios=None):
+        """Return usable seats per room (in room_ids order) as a read-only int array."""
+        ratios = DENSITY_RATIOS if ratios is None else ratios
+        key = (policy, buffer, tuple(sorted(ratios.items())))
+        seats = self._effective.get(key)
+        if seats is not None:
+            count("capacity_cache_hits")
+            return seats
+
+        function = get_capacity_policy(policy)
+        with self._lock:
+            seats = self._effective.get(key)
+            if seats is None:
+                buffers = np.where(np.isnan(self.room_buffers), buffer, self.room_buffers)
+                seats = np.maximum(function(self, buffers, ratios), 0).astype(np.int64)
+                seats.setflags(write=False)
+                self._effective[key] = seats
+                count("capacity_vectors_built")
+        return seats
+
+    def as_dict(self, buffer, policy, ratios=None):
+        """Return {room_id: usable seats} for a policy and buffer."""
+        return dict(zip(self.room_ids, self.effective(buffer, policy, ratios).tolist()))
+
+
+_models = OrderedDict()
+_models_lock = threading.Lock()
+
+
+def room_capacities(classrooms_df, columns=DEFAULT_SEAT_COLUMNS):
+    """
+    Return the RoomCapacities of a classroom table, reusing a cached one.
+
+    Tables are matched by the contents of the columns capacity depends on, so
+    a copied or re-sorted DataFrame with the same rooms in the same order
+    shares the cached capacity vectors.
+    """
+    present = [
+        column
+        for column in ("room_id", "capacity", "sub_blocks", "buffer")
+        if column in classrooms_df.columns
+    ]
+    key = (
+        tuple(present),
+        columns,
+        pd.util.hash_pandas_object(classrooms_df[present], index=False)
+        .to_numpy()
+        .tobytes(),
+    )
+    with _models_lock:
+        model = _models.get(key)
+        if model is not None:
+            _models.move_to_end(key)
+            return model
+        model = RoomCapacities(classrooms_df, columns)
+        _models[key] = model
+        if len(_models) > MODEL_CACHE_SIZE:
+            _models.popitem(last=False)
+    return model
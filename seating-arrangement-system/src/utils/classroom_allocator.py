@@ -1,223 +1,110 @@
-# filepath: /Users/asmitganguly/Developer/Github_Try/Mayank Sir/seating-arrangement-system/src/utils/classroom_allocator.py
+import numpy as np
 import pandas as pd
 import logging
-import os
-from collections import defaultdict
-
-
-def allocate_classrooms(courses_df, classrooms_df, buffer, density):
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .async_writer import DEFAULT_WRITERS, AsyncFileWriter
+from .capacity_ledger import SlotCapacityLedger
+from .capacity_policy import room_capacities
+from .instrumentation import Profiler, activate, count, get_profiler, span
+from .plan_exporter import (
+    build_seating_plans,
+    export_plans_workbook,
+    export_plans_zip,
+    write_plan_file,
+)
+from .roll_table import encode_course_rolls, materialize_roll_numbers
+
+
+# Inputs with at least this many enrollments are allocated in worker processes;
+# smaller ones use threads, where process start-up would cost more than it saves.
+# benchmarks/bench_workers.py puts the crossover for 4 workers between 100k
+# (0.15 s serial vs 0.20 s in processes) and 200k enrollments (0.36 s vs 0.23 s)
+PROCESS_POOL_MIN_ENROLLMENT = 150000
+
+# Inputs shared by every slot in a worker process (strategy, options, room
+# capacities, roll table), set once by _init_slot_worker
+_slot_inputs = None
+
+# Strategies that accept a per-slot time_budget
+SEARCH_STRATEGIES = {"optimal"}
+
+ALLOCATION_COLUMNS = [
+    "date",
+    "slot",
+    "course_id",
+    "room_id",
+    "capacity",
+    "enrollment",
+    "student_ids",
+]
+
+
+def allocate_classrooms(
+    courses_df,
+    classrooms_df,
+    buffer,
+    density,
+    roll_table=None,
+    export_mode="files",
+    workers=1,
+    strategy="greedy",
+    time_budget=None,
+    output_workers=DEFAULT_WRITERS,
+    density_ratios=None,
+):
     """
     Allocate classrooms to courses based on enrollment and room capacity.
 
+    Every (date, slot) starts from the full capacity of every room, tracked in
+    a SlotCapacityLedger so room lookups stay logarithmic in the number of rooms.
+
     Parameters:
     - courses_df: DataFrame containing course information
     - classrooms_df: DataFrame containing classroom information
     - buffer: Integer representing buffer space in each classroom
-    - density: String 'sparse' or 'dense' to determine seating density
+    - density: Seating policy, 'sparse' or 'dense' (see capacity_policy.POLICIES)
+    - roll_table: RollTable the 'student_ids' column was encoded with; when the
+      courses only carry 'roll_numbers' strings they are encoded here
+    - export_mode: Seating plan layout, see create_individual_seating_plans
+    - workers: Number of slots to allocate concurrently (1 allocates serially)
+    - strategy: Allocation strategy name, see get_allocation_strategy
+    - time_budget: Seconds per slot for searching strategies such as "optimal"
+    - output_workers: Threads writing per-room plan files in "files" mode
+    - density_ratios: Share of seats each density uses (settings.SPARSE_DENSE)
 
     Returns:
-    - DataFrame with seating arrangement information
+    - DataFrame with seating arrangement information, students as 'student_ids' arrays
     """
     try:
-        # Create a copy of the DataFrames to avoid modifying the originals
-        courses = courses_df.copy().sort_values(by="enrollment", ascending=False)
-        classrooms = classrooms_df.copy().sort_values(by="capacity", ascending=False)
-
-        # Dictionary to store allocation results
-        allocations = []
-
-        # Dictionary to track remaining capacity in each classroom
-        remaining_capacity = dict(zip(classrooms["room_id"], classrooms["capacity"]))
-
-        # Track already assigned buildings for each course to minimize movement
-        course_buildings = {}
-
-        # Track all allocated students to check for conflicts
-        allocated_students = set()
-
-        # Group courses by date and slot for conflict checking
-        courses_by_slot = courses.groupby(["date", "slot"])
-
-        # Process each date and slot
-        for (date, slot), group in courses_by_slot:
-            # Reset allocated students for this slot
-            slot_allocated_students = set()
-
-            for _, course in group.sort_values(
-                by="enrollment", ascending=False
-            ).iterrows():
-                course_id = course["course_id"]
-                enrollment = course["enrollment"]
-
-                # Handle roll_numbers which could be NaN or string
-                roll_numbers_str = course.get("roll_numbers", "")
-                if pd.isna(roll_numbers_str):
-                    students = set()
-                else:
-                    students = set(
-                        roll_numbers_str.split(";")
-                        if isinstance(roll_numbers_str, str)
-                        else []
-                    )
-
-                # Check for conflicts (students already allocated to the same slot)
-                conflicts = students.intersection(slot_allocated_students)
-                if conflicts:
-                    logging.error(
-                        f"Conflict detected for course {course_id}: {conflicts}"
-                    )
-                    print(f"Conflict detected for course {course_id}: {conflicts}")
-                    continue
-
-                # Calculate effective capacity based on buffer and density
-                effective_capacity = {}
-                for room_id, capacity in remaining_capacity.items():
-                    effective_cap = capacity - buffer
-                    if density == "sparse":
-                        effective_cap = effective_cap // 2
-                    effective_capacity[room_id] = effective_cap
-
-                # New logic: For large courses, try to allocate across multiple rooms
-                students_to_allocate = list(students)
-                students_left = len(students_to_allocate)
-                current_building = course_buildings.get(course_id)
-                course_allocations = []
-
-                # First try rooms in the same building if previously assigned
-                if current_building:
-                    same_building_rooms = sorted(
-                        [
-                            (r, effective_capacity[r])
-                            for r in effective_capacity.keys()
-                            if r.startswith(current_building)
-                            and effective_capacity[r] > 0
-                        ],
-                        key=lambda x: x[1],
-                        reverse=True,
-                    )
-
-                    # Allocate to rooms in the same building first
-                    for room_id, room_capacity in same_building_rooms:
-                        if students_left <= 0:
-                            break
-
-                        # Determine how many students we can allocate to this room
-                        students_to_place = min(room_capacity, students_left)
-
-                        if students_to_place > 0:
-                            # Extract the students for this room
-                            room_students = students_to_allocate[:students_to_place]
-                            students_to_allocate = students_to_allocate[
-                                students_to_place:
-                            ]
-                            students_left -= students_to_place
-
-                            course_allocations.append(
-                                {
-                                    "date": date,
-                                    "slot": slot,
-                                    "course_id": course_id,
-                                    "room_id": room_id,
-                                    "capacity": remaining_capacity[room_id],
-                                    "enrollment": students_to_place,
-                                    "roll_numbers": ";".join(room_students),
-                                }
-                            )
-
-                            remaining_capacity[room_id] -= students_to_place
-
-                # If there are still students to allocate, try any available rooms
-                if students_left > 0:
-                    # Sort rooms by capacity for efficient allocation
-                    sorted_rooms = sorted(
-                        [
-                            (r, effective_capacity[r])
-                            for r in effective_capacity.keys()
-                            if effective_capacity[r] > 0
-                        ],
-                        key=lambda x: x[1],
-                        reverse=True,
-                    )
-
-                    for room_id, room_capacity in sorted_rooms:
-                        if students_left <= 0:
-                            break
-
-                        # Extract building ID (assuming format like "B101" where "B" is the building)
-                        building = (
-                            room_id.split("-")[0] if "-" in room_id else room_id[0]
-                        )
-
-                        # Set the course building if this is the first allocation for this course
-                        if not current_building:
-                            course_buildings[course_id] = building
-                            current_building = building
-
-                        # Determine how many students we can allocate to this room
-                        students_to_place = min(room_capacity, students_left)
-
-                        if students_to_place > 0:
-                            # Extract the students for this room
-                            room_students = students_to_allocate[:students_to_place]
-                            students_to_allocate = students_to_allocate[
-                                students_to_place:
-                            ]
-                            students_left -= students_to_place
-
-                            course_allocations.append(
-                                {
-                                    "date": date,
-                                    "slot": slot,
-                                    "course_id": course_id,
-                                    "room_id": room_id,
-                                    "capacity": remaining_capacity[room_id],
-                                    "enrollment": students_to_place,
-                                    "roll_numbers": ";".join(room_students),
-                                }
-                            )
-
-                            remaining_capacity[room_id] -= students_to_place
-
-                # Check if all students were allocated
-                if students_left > 0:
-                    error_msg = f"Cannot allocate classroom for course {course_id} with enrollment {enrollment}"
-                    logging.error(error_msg)
-                    print(error_msg)
-                else:
-                    # Add all allocations for this course
-                    allocations.extend(course_allocations)
-
-                    # Add these students to the set of allocated students for this slot
-                    slot_allocated_students.update(students)
-
-            # Add the allocated students for this slot to the overall set
-            allocated_students.update(slot_allocated_students)
-
-        # Create DataFrame from allocations
-        allocation_df = pd.DataFrame(allocations)
+        # Work on compact student id arrays rather than roll number strings
+        courses, roll_table = encode_course_rolls(courses_df, roll_table)
+
+        allocation_df, seats_left, _ = allocate_slots(
+            courses,
+            classrooms_df,
+            buffer,
+            density,
+            roll_table,
+            workers,
+            strategy,
+            time_budget,
+            density_ratios,
+        )
 
         if allocation_df.empty:
             logging.warning(
                 "No allocations were made. All rooms may be too small for the courses."
             )
-            return pd.DataFrame(
-                columns=[
-                    "date",
-                    "slot",
-                    "course_id",
-                    "room_id",
-                    "capacity",
-                    "enrollment",
-                    "roll_numbers",
-                ]
-            )
+            return allocation_df
 
-        # Create folder structure for individual course seating plans
-        create_individual_seating_plans(allocation_df)
-
-        # Calculate and save seats left information
-        seats_left_df = calculate_seats_left(remaining_capacity)
-        seats_left_df.to_excel("data/output/op_seats_left.xlsx", index=False)
+        export_allocation(
+            allocation_df,
+            calculate_seats_left(seats_left),
+            roll_table,
+            export_mode,
+            output_workers,
+        )
 
         return allocation_df
 
@@ -226,103 +113,404 @@ def allocate_classrooms(courses_df, classrooms_df, buffer, density):
         raise
 
 
-def calculate_seats_left(remaining_capacity):
-    """Calculate seats left in each classroom after allocation."""
-    seats_left = [
-        {"room_id": room, "seats_left": capacity}
-        for room, capacity in remaining_capacity.items()
+def export_allocation(
+    allocation_df,
+    seats_left_df,
+    roll_table=None,
+    export_mode="files",
+    output_workers=DEFAULT_WRITERS,
+    output_dir="data/output",
+):
+    """
+    Write an allocation's seating plans and op_seats_left.xlsx.
+
+    Parameters:
+    - allocation_df: Allocations with 'student_ids' encoded with roll_table
+    - seats_left_df: Seats left table, see calculate_seats_left
+    - roll_table, export_mode, output_workers, output_dir: as for
+      create_individual_seating_plans
+
+    Returns:
+    - list of the files written, relative to output_dir
+    """
+    with span("export_plans", export_mode=export_mode):
+        # Create folder structure for individual course seating plans
+        paths = create_individual_seating_plans(
+            allocation_df, roll_table, export_mode, output_dir, output_workers
+        )
+
+        # Save seats left information
+        seats_left_df.to_excel(f"{output_dir}/op_seats_left.xlsx", index=False)
+        count("files_written")
+    return paths + ["op_seats_left.xlsx"]
+
+
+def allocate_slots(
+    courses,
+    classrooms_df,
+    buffer,
+    density,
+    roll_table,
+    workers=1,
+    strategy="greedy",
+    time_budget=None,
+    density_ratios=None,
+):
+    """
+    Allocate every (date, slot) without writing any output files.
+
+    strategy names the per-slot allocation strategy (see
+    get_allocation_strategy); time_budget, in seconds per slot, is passed to
+    strategies that search, such as "optimal".
+
+    Slots are independent, so with workers > 1 they are allocated
+    concurrently (processes for large inputs, threads for small ones).
+    Results are merged in sorted (date, slot) order, so the output is
+    identical to a serial run. When a Profiler is active, every slot is
+    recorded as an "allocate_slot" span, including slots run in workers.
+
+    Returns:
+    - tuple: (allocation DataFrame, {(date, slot): {room_id: seats_left}},
+      list of unallocated course dicts)
+    """
+    classrooms = classrooms_df.copy().sort_values(
+        by="capacity", ascending=False, kind="stable"
+    )
+
+    # Effective capacity (cached per policy and buffer) and building of each room
+    effective_capacity = calculate_effective_capacity(
+        classrooms, buffer, density, density_ratios
+    )
+    buildings = room_buildings(classrooms)
+
+    # Group courses by date and slot for conflict checking
+    slot_groups = [
+        (date, slot, group)
+        for (date, slot), group in courses.groupby(["date", "slot"])
     ]
-    # Sort by seats left in descending order to see which rooms have the most capacity remaining
-    return pd.DataFrame(seats_left).sort_values(by="seats_left", ascending=False)
+    # Fail fast on unknown strategy names, before any worker starts
+    get_allocation_strategy(strategy)
+    options = {"room_buildings": buildings}
+    if time_budget is not None and strategy in SEARCH_STRATEGIES:
+        options["time_budget"] = time_budget
+    profiler = get_profiler()
+    inputs = (strategy, options, effective_capacity, roll_table, profiler is not None)
+
+    if workers > 1 and len(slot_groups) > 1:
+        total_enrollment = sum(len(ids) for ids in courses["student_ids"])
+        if total_enrollment >= PROCESS_POOL_MIN_ENROLLMENT:
+            # Only each slot's courses travel with its task
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_slot_worker, initargs=(inputs,)
+            ) as executor:
+                results = list(executor.map(_slot_task, slot_groups))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(
+                    executor.map(lambda task: _allocate_slot_task(inputs, *task), slot_groups)
+                )
+    else:
+        results = [_allocate_slot_task(inputs, *task) for task in slot_groups]
+
+    if profiler is not None:
+        for _, records in results:
+            profiler.merge(records)
+    results = [result for result, _ in results]
+
+    allocations = []
+    seats_left = {}
+    unallocated = []
+    for (date, slot, _), (slot_allocations, slot_seats_left, slot_unallocated) in zip(
+        slot_groups, results
+    ):
+        allocations.extend(slot_allocations)
+        seats_left[(date, slot)] = slot_seats_left
+        for course in slot_unallocated:
+            logging.error(course["reason"])
+            print(course["reason"])
+        unallocated.extend(slot_unallocated)
+
+    return (
+        pd.DataFrame(allocations, columns=ALLOCATION_COLUMNS),
+        seats_left,
+        unallocated,
+    )
+
+
+def _init_slot_worker(inputs):
+    global _slot_inputs
+    _slot_inputs = inputs
+
+
+def _slot_task(task):
+    return _allocate_slot_task(_slot_inputs, *task)
+
+
+def _allocate_slot_task(inputs, date, slot, group):
+    strategy, options, effective_capacity, roll_table, profile = inputs
+    allocate = get_allocation_strategy(strategy)
+    args = (date, slot, group, effective_capacity, roll_table)
+    if not profile:
+        return allocate(*args, **options), None
+
+    # Workers have no active profiler, so each slot collects its own records
+    profiler = Profiler()
+    with activate(profiler), span(
+        "allocate_slot", date=date, slot=slot, strategy=strategy, courses=len(group)
+    ):
+        result = allocate(*args, **options)
+    return result, profiler.records()
+
+
+def get_allocation_strategy(name):
+    """
+    Return the per-slot allocation function for a strategy name.
+
+    Every strategy takes (date, slot, group, effective_capacity, roll_table,
+    room_buildings=None) and returns (allocations, seats_left, unallocated):
+    - "greedy": largest course first into best-fitting or largest rooms (allocate_slot)
+    - "optimal": branch and bound minimizing unseated students, rooms and
+      splits, within a time budget, falling back to greedy
+      (optimal_allocator.allocate_slot_optimal)
+    """
+    if name == "greedy":
+        return allocate_slot
+    if name == "optimal":
+        from .optimal_allocator import allocate_slot_optimal
 
+        return allocate_slot_optimal
+    raise ValueError(f"Unknown allocation strategy '{name}'. Use 'greedy' or 'optimal'.")
 
-def create_individual_seating_plans(allocation_df):
-    """Create individual seating plan Excel files for each course-classroom combination."""
-    try:
-        # Group allocations by course to generate summaries
-        course_groups = allocation_df.groupby(["date", "slot", "course_id"])
 
-        # Track courses allocated to multiple rooms
-        courses_in_multiple_rooms = []
+def allocate_slot(
+    date, slot, group, effective_capacity, roll_table, room_buildings=None
+):
+    """
+    Allocate the courses of a single (date, slot) from a fresh capacity ledger.
 
-        for (date, slot, course_id), group in course_groups:
-            formatted_date = date.replace("/", "_")
-            slot_folder = slot.capitalize()
+    room_buildings maps room_id to its building (see room_buildings()); a
+    course too large for one room is kept within one building when possible.
 
-            # Create directory structure
-            output_dir = f"data/output/{formatted_date}/{slot_folder}"
-            os.makedirs(output_dir, exist_ok=True)
+    Returns:
+    - tuple: (list of allocation dicts, {room_id: seats_left}, list of
+      unallocated course dicts with 'date', 'slot', 'course_id',
+      'enrollment' and 'reason')
+    """
+    # Every slot gets a fresh copy of the room capacities
+    ledger = SlotCapacityLedger(effective_capacity, room_buildings)
 
-            # For each room allocation
-            room_count = len(group)
-            for _, row in group.iterrows():
-                room_id = row["room_id"]
+    allocations = []
+    unallocated = []
 
-                # Individual room seating plan file
-                output_file = (
-                    f"{output_dir}/{formatted_date}_{course_id}_{room_id}.xlsx"
-                )
+    # Reset allocated students for this slot
+    slot_allocated_students = np.zeros(len(roll_table), dtype=bool)
 
-                # Create seating plan DataFrame for this room
-                seating_data = {
-                    "course_id": [course_id],
-                    "room_id": [room_id],
-                    "date": [date],
-                    "slot": [slot],
-                    "enrollment": [row["enrollment"]],
-                    "roll_numbers": [row["roll_numbers"]],
-                }
-
-                # Add multi-room indicator if applicable
-                if room_count > 1:
-                    seating_data["multi_room"] = [
-                        f"Room {list(group['room_id']).index(room_id) + 1} of {room_count}"
-                    ]
-
-                seating_df = pd.DataFrame(seating_data)
-                seating_df.to_excel(output_file, index=False, engine="openpyxl")
-
-            # If course is allocated across multiple rooms, create a summary file
-            if room_count > 1:
-                courses_in_multiple_rooms.append(
-                    {
-                        "course_id": course_id,
-                        "date": date,
-                        "slot": slot,
-                        "rooms": ", ".join(group["room_id"]),
-                        "room_count": room_count,
-                        "total_enrollment": group["enrollment"].sum(),
-                    }
-                )
+    for course_id, enrollment, students in iter_slot_courses(group):
+        # Check for conflicts (students already allocated to the same slot)
+        clashing = students[slot_allocated_students[students]]
+        if len(clashing):
+            unallocated.append(
+                conflict_record(date, slot, course_id, enrollment, clashing, roll_table)
+            )
+            continue
 
-                # Create summary file
-                summary_file = f"{output_dir}/{formatted_date}_{course_id}_summary.xlsx"
-                summary_df = pd.DataFrame(
-                    [
-                        {
-                            "course_id": course_id,
-                            "date": date,
-                            "slot": slot,
-                            "total_enrollment": group["enrollment"].sum(),
-                            "rooms": ", ".join(group["room_id"]),
-                            "room_count": room_count,
-                        }
-                    ]
-                )
-                summary_df.to_excel(summary_file, index=False, engine="openpyxl")
+        # Reserve rooms, keeping a split course within one building when possible
+        placements = ledger.plan(len(students))
+        if placements is None:
+            unallocated.append(capacity_record(date, slot, course_id, enrollment))
+            continue
 
-        # Create a master list of courses allocated to multiple rooms
-        if courses_in_multiple_rooms:
-            multi_room_df = pd.DataFrame(courses_in_multiple_rooms)
-            multi_room_file = "data/output/courses_in_multiple_rooms.xlsx"
-            logging.info(
-                f"{len(courses_in_multiple_rooms)} courses allocated across multiple rooms"
+        allocations.extend(
+            allocation_records(
+                date, slot, course_id, students, placements, effective_capacity
             )
-            print(
-                f"{len(courses_in_multiple_rooms)} courses allocated across multiple rooms"
+        )
+
+        # Add these students to the set of allocated students for this slot
+        slot_allocated_students[students] = True
+
+    count("room_lookups", ledger.lookups)
+    return allocations, ledger.seats_left(), unallocated
+
+
+def iter_slot_courses(group):
+    """
+    Yield (course_id, enrollment, student_ids) for a slot, largest enrollment first.
+
+    Repeated students within a course are dropped, keeping registration order.
+    """
+    count("rows_iterated", len(group))
+    for _, course in group.sort_values(
+        by="enrollment", ascending=False, kind="stable"
+    ).iterrows():
+        students = course["student_ids"]
+        _, first_seen = np.unique(students, return_index=True)
+        yield course["course_id"], course["enrollment"], students[np.sort(first_seen)]
+
+
+def allocation_records(date, slot, course_id, students, placements, effective_capacity):
+    """Split a course's students over its (room_id, seats) placements, in order."""
+    records = []
+    start = 0
+    for room_id, students_to_place in placements:
+        records.append(
+            {
+                "date": date,
+                "slot": slot,
+                "course_id": course_id,
+                "room_id": room_id,
+                "capacity": effective_capacity[room_id],
+                "enrollment": students_to_place,
+                "student_ids": students[start : start + students_to_place],
+            }
+        )
+        start += students_to_place
+    return records
+
+
+def conflict_record(date, slot, course_id, enrollment, clashing, roll_table):
+    """Unallocated-course record for a course whose students clash within the slot."""
+    conflicts = set(roll_table.decode(clashing))
+    return {
+        "date": date,
+        "slot": slot,
+        "course_id": course_id,
+        "enrollment": enrollment,
+        "reason": f"Conflict detected for course {course_id}: {conflicts}",
+    }
+
+
+def capacity_record(date, slot, course_id, enrollment):
+    """Unallocated-course record for a course the slot has no room left for."""
+    return {
+        "date": date,
+        "slot": slot,
+        "course_id": course_id,
+        "enrollment": enrollment,
+        "reason": f"Cannot allocate classroom for course {course_id} with enrollment {enrollment}",
+    }
+
+
+def calculate_effective_capacity(classrooms_df, buffer, density, density_ratios=None):
+    """
+    Return a dict mapping room_id to usable seats after buffer and density.
+
+    density is a seating policy (see capacity_policy.get_capacity_policy);
+    the per-room capacities are computed once per policy and buffer and
+    cached, so repeated calls only build the dict.
+    """
+    return room_capacities(classrooms_df).as_dict(buffer, density, density_ratios)
+
+
+def room_buildings(classrooms_df):
+    """
+    Return a dict mapping room_id to its building from the 'block' column.
+
+    Rooms without a block, or inputs without the column, are left out so the
+    capacity ledger falls back to guessing the building from the room id.
+    """
+    if "block" not in classrooms_df.columns:
+        return {}
+    return {
+        room_id: str(block).strip()
+        for room_id, block in zip(classrooms_df["room_id"], classrooms_df["block"])
+        if pd.notna(block) and str(block).strip()
+    }
+
+
+def calculate_seats_left(seats_left):
+    """Calculate seats left in each classroom for every date and slot after allocation."""
+    rows = [
+        {"date": date, "slot": slot, "room_id": room, "seats_left": capacity}
+        for (date, slot), rooms in seats_left.items()
+        for room, capacity in rooms.items()
+    ]
+    # Within each slot, sort by seats left in descending order to see which rooms have the most capacity remaining
+    return pd.DataFrame(
+        rows, columns=["date", "slot", "room_id", "seats_left"]
+    ).sort_values(by=["date", "slot", "seats_left"], ascending=[True, True, False])
+
+
+def create_individual_seating_plans(
+    allocation_df,
+    roll_table=None,
+    export_mode="files",
+    output_dir="data/output",
+    output_workers=DEFAULT_WRITERS,
+):
+    """
+    Create seating plans for each course-classroom combination.
+
+    export_mode selects the output layout:
+    - "files": one Excel file per course-room under <date>/<slot>/ (default),
+      rendered and written by output_workers threads
+    - "workbook": a single seating_plans.xlsx with one sheet per date/slot
+    - "zip": a single seating_plans.zip holding the per-room files
+
+    Returns a list of the files written, relative to output_dir.
+    """
+    try:
+        # Roll number strings are only built here, at the output boundary
+        if roll_table is not None:
+            allocation_df = materialize_roll_numbers(allocation_df, roll_table)
+
+        plans, summaries = build_seating_plans(allocation_df)
+
+        if export_mode == "workbook":
+            export_plans_workbook(plans, summaries, f"{output_dir}/seating_plans.xlsx")
+            paths = ["seating_plans.xlsx"]
+        elif export_mode == "zip":
+            export_plans_zip(plans, summaries, f"{output_dir}/seating_plans.zip")
+            paths = ["seating_plans.zip"]
+        elif export_mode == "files":
+            entries = plans + summaries
+            with AsyncFileWriter(
+                output_dir, output_workers, expected=len(entries)
+            ) as writer:
+                for entry in entries:
+                    write_plan_file(entry, output_dir, writer)
+            paths = [f"{entry['folder']}/{entry['file_name']}" for entry in entries]
+        else:
+            raise ValueError(
+                f"Unknown export mode '{export_mode}'. Use 'files', 'workbook' or 'zip'."
             )
-            multi_room_df.to_excel(multi_room_file, index=False, engine="openpyxl")
+
+        # Create a master list of courses allocated to multiple rooms
+        if save_multi_room_summary(summaries, output_dir):
+            paths.append("courses_in_multiple_rooms.xlsx")
+        return paths
 
     except Exception as e:
         logging.error(f"Error creating individual seating plans: {str(e)}")
         raise
+
+
+def save_multi_room_summary(summaries, output_dir="data/output"):
+    """
+    Write courses_in_multiple_rooms.xlsx from the multi-room course summaries.
+
+    Returns True if the file was written (there were multi-room courses).
+    """
+    if summaries:
+        courses_in_multiple_rooms = [
+            {
+                "course_id": data["course_id"],
+                "date": data["date"],
+                "slot": data["slot"],
+                "rooms": data["rooms"],
+                "room_count": data["room_count"],
+                "total_enrollment": data["total_enrollment"],
+            }
+            for data in (summary["data"] for summary in summaries)
+        ]
+        multi_room_df = pd.DataFrame(courses_in_multiple_rooms)
+        multi_room_file = f"{output_dir}/courses_in_multiple_rooms.xlsx"
+        logging.info(
+            f"{len(courses_in_multiple_rooms)} courses allocated across multiple rooms"
+        )
+        print(
+            f"{len(courses_in_multiple_rooms)} courses allocated across multiple rooms"
+        )
+        multi_room_df.to_excel(multi_room_file, index=False, engine="openpyxl")
+        return True
+    return False
@@ -1,69 +1,42 @@
 import logging
-import os
 import pandas as pd
 from collections import defaultdict
 
+from .async_writer import DEFAULT_WRITERS, AsyncFileWriter, dataframe_xlsx
+from .conflict_engine import ConflictEngine
+from .instrumentation import count
 
-def check_conflicts(courses_df):
+# Conflict reports written by save_conflict_data
+CONFLICT_FILES = [
+    "conflicts_detailed.xlsx",
+    "conflicts_by_student.xlsx",
+    "conflicts_by_slot.xlsx",
+    "conflicts_by_course.xlsx",
+]
+
+
+def check_conflicts(courses_df, roll_table=None):
     """
     Check for scheduling conflicts among courses based on student roll numbers.
 
     Args:
         courses_df (DataFrame): A DataFrame containing course information with columns
-                              'course_id', 'date', 'slot', and 'roll_numbers'.
+                              'course_id', 'date', 'slot', and either 'roll_numbers'
+                              or 'student_ids' (encoded with roll_table).
+        roll_table (RollTable): Table used to encode 'student_ids'.
 
     Returns:
         list: A list of conflict dictionaries containing details about each conflict.
     """
-    conflicts = []
-
     try:
-        # Group courses by date and slot
-        grouped = courses_df.groupby(["date", "slot"])
-
-        # Keep track of conflicts by student for reporting purposes
-        conflict_count_by_student = defaultdict(int)
-
-        for (date, slot), group in grouped:
-            # Map to track which course each roll number is assigned to
-            roll_number_map = {}
-
-            for _, course in group.iterrows():
-                course_id = course["course_id"]
-
-                # Skip if roll_numbers is missing or not a string
-                if pd.isna(course["roll_numbers"]) or not isinstance(
-                    course["roll_numbers"], str
-                ):
-                    continue
-
-                # Split the roll numbers by semicolon and check each one
-                roll_numbers = course["roll_numbers"].strip().split(";")
-
-                for roll_number in roll_numbers:
-                    roll_number = roll_number.strip()
-                    if not roll_number:  # Skip empty roll numbers
-                        continue
-
-                    if roll_number in roll_number_map:
-                        # Conflict found - same student assigned to two courses in the same slot
-                        conflict = {
-                            "date": date,
-                            "slot": slot,
-                            "roll_number": roll_number,
-                            "course1": course_id,
-                            "course2": roll_number_map[roll_number],
-                        }
-                        conflicts.append(conflict)
-
-                        # Update conflict count for this student
-                        conflict_count_by_student[roll_number] += 1
-                    else:
-                        roll_number_map[roll_number] = course_id
+        # Find every clash with one vectorized pass over (slot, student) pairs
+        engine = ConflictEngine(courses_df, roll_table)
+        conflicts = engine.conflicts()
+        count("enrollments_checked", len(engine.students))
 
         # Save conflict data to file
         if conflicts:
-            save_conflict_data(conflicts, conflict_count_by_student)
+            save_conflict_data(conflicts)
 
         return conflicts
 
@@ -72,23 +45,33 @@ def check_conflicts(courses_df):
         return []
 
 
-def save_conflict_data(conflicts, conflict_count_by_student):
+def save_conflict_data(
+    conflicts,
+    conflict_count_by_student=None,
+    output_dir="data/output/conflicts",
+    workers=DEFAULT_WRITERS,
+):
     """
     Save conflict data to Excel files for further analysis.
 
+    The four reports are rendered and written concurrently.
+
     Args:
         conflicts (list): List of conflict dictionaries
-        conflict_count_by_student (dict): Dictionary mapping roll numbers to conflict counts
+        conflict_count_by_student (dict): Dictionary mapping roll numbers to conflict
+                                          counts, counted from conflicts if None
+        output_dir (str): Directory for the conflict reports
+        workers (int): Threads rendering and writing the reports
     """
     try:
-        # Create the output directory if it doesn't exist
-        os.makedirs("data/output/conflicts", exist_ok=True)
+        # Keep track of conflicts by student for reporting purposes
+        if conflict_count_by_student is None:
+            conflict_count_by_student = defaultdict(int)
+            for conflict in conflicts:
+                conflict_count_by_student[conflict["roll_number"]] += 1
 
-        # Convert conflicts to DataFrame and save
+        # Convert conflicts to DataFrame
         conflict_df = pd.DataFrame(conflicts)
-        conflict_df.to_excel(
-            "data/output/conflicts/conflicts_detailed.xlsx", index=False
-        )
 
         # Create a summary by student
         student_conflicts = [
@@ -98,9 +81,6 @@ def save_conflict_data(conflicts, conflict_count_by_student):
         student_df = pd.DataFrame(student_conflicts).sort_values(
             by="conflict_count", ascending=False
         )
-        student_df.to_excel(
-            "data/output/conflicts/conflicts_by_student.xlsx", index=False
-        )
 
         # Create a summary by date and slot
         slot_summary = (
@@ -108,9 +88,6 @@ def save_conflict_data(conflicts, conflict_count_by_student):
             .size()
             .reset_index(name="conflict_count")
         )
-        slot_summary.to_excel(
-            "data/output/conflicts/conflicts_by_slot.xlsx", index=False
-        )
 
         # Create a summary by course
         course_conflicts = defaultdict(int)
@@ -125,24 +102,28 @@ def save_conflict_data(conflicts, conflict_count_by_student):
             ]
         ).sort_values(by="conflict_count", ascending=False)
 
-        course_df.to_excel(
-            "data/output/conflicts/conflicts_by_course.xlsx", index=False
-        )
+        with AsyncFileWriter(output_dir, workers) as writer:
+            writer.makedirs("")
+            reports = [conflict_df, student_df, slot_summary, course_df]
+            for file_name, report in zip(CONFLICT_FILES, reports):
+                writer.submit(file_name, dataframe_xlsx, report)
 
     except Exception as e:
         logging.error(f"Error saving conflict data: {str(e)}")
 
 
-def display_conflicts(conflicts):
+def display_conflicts(conflicts, suggestions=None):
     """
     Display the conflicts found in a readable format and provide recommendations.
 
     Args:
         conflicts (list): A list of conflict dictionaries containing
                         'date', 'slot', 'roll_number', 'course1', and 'course2'.
+        suggestions (DataFrame): Optional slot moves from suggest_slot_moves
     """
     if not conflicts:
         print("\n✅ No conflicts found! All student assignments are valid.")
+        display_slot_moves(suggestions)
         return
 
     # Organize conflicts by date and slot for better display
@@ -182,3 +163,24 @@ def display_conflicts(conflicts):
     print(
         "\nTo view all conflicts in detail, check the generated Excel files in 'data/output/conflicts/'."
     )
+    display_slot_moves(suggestions)
+
+
+def display_slot_moves(suggestions):
+    """Print suggested slot moves, in the order they should be applied."""
+    if suggestions is None or not len(suggestions):
+        return
+
+    print("\nSuggested slot moves (apply in order):")
+    for move in suggestions.itertuples(index=False):
+        print(
+            f"  • Move {move.course_id} ({move.enrollment} students) from "
+            f"{move.from_date} {move.from_slot} to {move.to_date} {move.to_slot}: "
+            f"{move.clashes_removed} fewer clashes, {move.overflow_removed} fewer "
+            f"students over capacity"
+        )
+    last = suggestions.iloc[-1]
+    print(
+        f"  After these moves: {last['clashes_left']} clashes, "
+        f"{last['overflow_left']} students over capacity"
+    )
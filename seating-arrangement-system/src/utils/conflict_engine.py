@@ -0,0 +1,235 @@
+import numpy as np
+
+from .roll_table import encode_course_rolls
+
+
+class ClashGraph:
+    """
+    Sparse course-to-course graph of shared students, in CSR form.
+
+    The neighbours of course row i are indices[indptr[i]:indptr[i + 1]] and
+    weights holds how many students each of them shares with i. Only pairs
+    of courses that share a student are stored, so memory grows with the
+    number of clashing pairs rather than with the square of the courses.
+
+    Args:
+        indptr (ndarray): n_courses + 1 offsets into indices and weights
+        indices (ndarray): Neighbour course rows, ascending within each row
+        weights (ndarray): Shared students per neighbour
+    """
+
+    def __init__(self, indptr, indices, weights):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        # Course row owning each stored edge
+        self.edge_rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+
+    @property
+    def n_courses(self):
+        return len(self.indptr) - 1
+
+    def neighbours(self, row):
+        """Return (neighbour rows, shared students) of one course row."""
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+    def degree(self):
+        """Return the students each course shares with all other courses."""
+        return np.bincount(
+            self.edge_rows, weights=self.weights, minlength=self.n_courses
+        ).astype(np.int64)
+
+    def edges_of(self, rows):
+        """Return (position in rows, edge index) of every edge leaving the given rows."""
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        owner = np.repeat(np.arange(len(rows)), lengths)
+        offsets = np.cumsum(lengths) - lengths
+        edges = np.arange(lengths.sum()) - offsets[owner] + starts[owner]
+        return owner, edges
+
+    def block(self, rows, columns):
+        """Return the dense len(rows) x len(columns) matrix of shared students."""
+        position = np.full(self.n_courses, -1, dtype=np.int64)
+        position[columns] = np.arange(len(columns))
+        owner, edges = self.edges_of(rows)
+        column = position[self.indices[edges]]
+        keep = column >= 0
+        block = np.zeros((len(rows), len(columns)), dtype=np.int64)
+        block[owner[keep], column[keep]] = self.weights[edges[keep]]
+        return block
+
+
+class ConflictEngine:
+    """
+    Vectorized clash detection over (slot, student) enrollment pairs.
+
+    Every enrollment is flattened into parallel arrays (slot, student, course
+    row, position) once. Conflicts are then found with a single lexsort and
+    group-by over (slot, student) instead of a per-roll Python loop, and
+    course-to-course overlaps are kept so "what if course X moves to slot Y"
+    queries are a lookup rather than a rescan.
+
+    Args:
+        courses_df (DataFrame): Courses with 'course_id', 'date', 'slot' and
+                              either 'roll_numbers' or 'student_ids'.
+        roll_table (RollTable): Table used to encode 'student_ids'.
+    """
+
+    def __init__(self, courses_df, roll_table=None):
+        courses_df, self.roll_table = encode_course_rolls(courses_df, roll_table)
+        courses_df = courses_df.reset_index(drop=True)
+
+        # Slot codes follow the same sorted (date, slot) order as groupby
+        slot_codes = (
+            courses_df.groupby(["date", "slot"])
+            .ngroup()
+            .fillna(-1)
+            .to_numpy(dtype=np.int64)
+        )
+        slot_keys = courses_df[["date", "slot"]].to_numpy()
+        self.slots = [None] * (slot_codes.max() + 1 if len(slot_codes) else 0)
+        for code, key in zip(slot_codes, slot_keys):
+            if code >= 0:
+                self.slots[code] = tuple(key)
+        self.slot_index = {key: code for code, key in enumerate(self.slots)}
+
+        self.course_ids = courses_df["course_id"].to_numpy()
+        self.course_slot = slot_codes
+        self.course_rows = {}
+        for row, course_id in enumerate(self.course_ids):
+            self.course_rows.setdefault(course_id, []).append(row)
+
+        lengths = np.array(
+            [len(ids) for ids in courses_df["student_ids"]], dtype=np.int64
+        )
+        self.students = (
+            np.concatenate(courses_df["student_ids"].tolist()).astype(np.int64)
+            if lengths.sum()
+            else np.empty(0, dtype=np.int64)
+        )
+        self.course_of = np.repeat(np.arange(len(courses_df)), lengths)
+        self.slot_of = slot_codes[self.course_of]
+
+        # Rows with a missing date or slot are never checked, as with groupby
+        valid = self.slot_of >= 0
+        self.students = self.students[valid]
+        self.course_of = self.course_of[valid]
+        self.slot_of = self.slot_of[valid]
+
+        self._graph = None
+
+    def _group_starts(self, *keys):
+        """Return a boolean mask marking the first element of each run of equal keys."""
+        changed = np.zeros(len(keys[0]), dtype=bool)
+        if len(changed):
+            changed[0] = True
+        for key in keys:
+            changed[1:] |= key[1:] != key[:-1]
+        return changed
+
+    def conflicts(self):
+        """
+        Return conflict records identical to the row-by-row check.
+
+        For each (date, slot) and student, the first course in input order
+        owns the student; every later enrollment is reported as a conflict
+        with 'course1' the later course and 'course2' the owner.
+        """
+        count = len(self.students)
+        if not count:
+            return []
+
+        position = np.arange(count)
+        order = np.lexsort((position, self.students, self.slot_of))
+        first = self._group_starts(self.slot_of[order], self.students[order])
+
+        # Index (into `order`) of the owning enrollment for every element
+        group_start = np.maximum.accumulate(np.where(first, np.arange(count), 0))
+        owner_course = self.course_of[order[group_start]]
+
+        clashing = order[~first]
+        owners = owner_course[~first]
+
+        # Report in the order the row-by-row scan would have found them
+        report = np.lexsort((clashing, self.slot_of[clashing]))
+        clashing, owners = clashing[report], owners[report]
+
+        rolls = self.roll_table.decode(self.students[clashing])
+        records = []
+        for element, owner, roll in zip(clashing.tolist(), owners.tolist(), rolls):
+            date, slot = self.slots[self.slot_of[element]]
+            records.append(
+                {
+                    "date": date,
+                    "slot": slot,
+                    "roll_number": roll,
+                    "course1": self.course_ids[self.course_of[element]],
+                    "course2": self.course_ids[owner],
+                }
+            )
+        return records
+
+    def clash_graph(self):
+        """
+        Return the ClashGraph of students shared between course rows, across all slots.
+
+        Built once from the distinct (student, course) pairs sorted by student
+        and cached; a course is never its own neighbour.
+        """
+        if self._graph is not None:
+            return self._graph
+
+        n_courses = len(self.course_ids)
+        # One entry per distinct (student, course) enrollment, grouped by student
+        pairs = np.unique(self.students * n_courses + self.course_of)
+        students, courses = pairs // n_courses, pairs % n_courses
+
+        # Pair every enrollment with the ones that follow it for the same student
+        edges = []
+        shift = 1
+        while shift < len(students):
+            same = students[shift:] == students[:-shift]
+            if not same.any():
+                break
+            a, b = courses[:-shift][same], courses[shift:][same]
+            edges.extend([a * n_courses + b, b * n_courses + a])
+            shift += 1
+
+        keys, weights = np.unique(
+            np.concatenate(edges) if edges else np.empty(0, dtype=np.int64),
+            return_counts=True,
+        )
+        rows = keys // n_courses
+        indptr = np.zeros(n_courses + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_courses), out=indptr[1:])
+        self._graph = ClashGraph(indptr, keys % n_courses, weights.astype(np.int64))
+        return self._graph
+
+    def move_clashes(self, course_id, date, slot):
+        """
+        Return {other_course_id: shared_students} if `course_id` were held at (date, slot).
+
+        Only courses already scheduled in the target slot are counted; the
+        course's own rows are ignored.
+        """
+        rows = self.course_rows.get(course_id, [])
+        target = self.slot_index.get((date, slot))
+        if not rows or target is None:
+            return {}
+
+        graph = self.clash_graph()
+        _, edges = graph.edges_of(rows)
+        neighbours = graph.indices[edges]
+        keep = (self.course_slot[neighbours] == target) & ~np.isin(neighbours, rows)
+        shared = np.bincount(
+            neighbours[keep], weights=graph.weights[edges[keep]], minlength=graph.n_courses
+        ).astype(np.int64)
+
+        clashes = {}
+        for row in np.flatnonzero(shared).tolist():
+            other = self.course_ids[row]
+            clashes[other] = clashes.get(other, 0) + int(shared[row])
+        return clashes
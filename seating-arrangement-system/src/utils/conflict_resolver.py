@@ -0,0 +1,420 @@
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from .conflict_engine import ConflictEngine
+from .instrumentation import count
+
+SUGGESTION_COLUMNS = [
+    "course_id",
+    "from_date",
+    "from_slot",
+    "to_date",
+    "to_slot",
+    "enrollment",
+    "clashes_removed",
+    "overflow_removed",
+    "clashes_left",
+    "overflow_left",
+]
+
+# Columns of a re-planned timetable from colour_timetable / recolour_timetable
+TIMETABLE_COLUMNS = ["course_id", "date", "slot", "new_date", "new_slot"]
+
+# A clash needs a student to be rescheduled individually, while an extra
+# student in a full slot can still be seated by splitting a course further
+DEFAULT_CLASH_WEIGHT = 10.0
+
+# Moves must improve the cost by more than this to be suggested
+MIN_GAIN = 1e-9
+
+# Clashing courses whose swaps are scored at once, bounding the score matrices
+# to SWAP_BLOCK_ROWS x movable courses
+SWAP_BLOCK_ROWS = 256
+
+
+class ConflictResolver:
+    """
+    Suggest exam slot moves that remove student clashes and room overflow.
+
+    Courses are nodes of the clash graph (ConflictEngine.clash_graph: the
+    number of students two courses share, stored sparsely) and the
+    timetable's (date, slot) pairs are the colours. The cost of a timetable is
+
+        clash_weight * clashing enrollment pairs + overflow_weight * overflow
+
+    where a clashing pair is a student sitting two courses held in the same
+    slot, and overflow is the number of students beyond `slot_capacity` in
+    each slot.
+
+    For every course the resolver keeps how many of its students each slot
+    already holds (an n_courses x n_slots matrix updated after each move), so
+    the cost change of every possible move is scored at once with a few
+    array operations.
+
+    Args:
+        courses_df (DataFrame): Courses with 'course_id', 'date', 'slot',
+                              'enrollment' and 'roll_numbers' or 'student_ids'
+        slot_capacity (int): Seats available in every slot, e.g. the sum of
+                           the rooms' effective capacities
+        roll_table (RollTable): Table used to encode 'student_ids'
+        fixed (iterable): Course ids that must stay in their slot
+        clash_weight (float): Cost of one clashing enrollment pair
+        overflow_weight (float): Cost of one student beyond slot_capacity
+    """
+
+    def __init__(
+        self,
+        courses_df,
+        slot_capacity,
+        roll_table=None,
+        fixed=(),
+        clash_weight=DEFAULT_CLASH_WEIGHT,
+        overflow_weight=1.0,
+    ):
+        self.engine = ConflictEngine(courses_df, roll_table)
+        self.slot_capacity = slot_capacity
+        self.clash_weight = clash_weight
+        self.overflow_weight = overflow_weight
+
+        self.graph = self.engine.clash_graph()
+        self.assignment = self.engine.course_slot.copy()
+        self.enrollment = np.bincount(
+            self.engine.course_of, minlength=len(self.assignment)
+        ).astype(np.int64)
+        fixed = set(fixed)
+        # Courses without a date or slot cannot be moved either
+        self.movable = np.array(
+            [course_id not in fixed for course_id in self.engine.course_ids], dtype=bool
+        ) & (self.assignment >= 0)
+        self.moves_scored = 0
+
+    @property
+    def slots(self):
+        return self.engine.slots
+
+    def cost(self, assignment=None):
+        """Return (clashing enrollment pairs, overflowing students) of an assignment."""
+        assignment = self.assignment if assignment is None else assignment
+        return self._cost(
+            assignment,
+            self._slot_loads(assignment),
+            self._slot_enrollment(assignment),
+        )
+
+    def _cost(self, assignment, loads, slot_enrollment):
+        placed = np.flatnonzero(assignment >= 0)
+        clashes = int(loads[placed, assignment[placed]].sum() // 2)
+        return clashes, int(self._overflow(slot_enrollment).sum())
+
+    def suggest_moves(self, max_moves=10):
+        """
+        Suggest up to max_moves single-course slot moves, best first.
+
+        Steepest descent from the current timetable: every step applies the
+        move (or swap of two courses' slots) that lowers the cost most, and
+        stops when no move improves it. Each course is moved at most once,
+        so every row is a separate change to the timetable. The resolver's
+        assignment is updated; call reset() to start again from the input
+        timetable.
+
+        Returns:
+            DataFrame: One row per suggested move with the SUGGESTION_COLUMNS
+        """
+        start = time.perf_counter()
+        loads = self._slot_loads(self.assignment)
+        slot_enrollment = self._slot_enrollment(self.assignment)
+        clashes, overflow = self._cost(self.assignment, loads, slot_enrollment)
+
+        movable = self.movable.copy()
+        suggestions = []
+        while len(suggestions) < max_moves:
+            move = self._best_move(loads, slot_enrollment, movable)
+            swap = None
+            if len(suggestions) + 2 <= max_moves:
+                swap = self._best_swap(loads, slot_enrollment, movable)
+            if swap is not None and (move is None or swap[0] < move[0]):
+                moves = swap[1]
+            elif move is not None:
+                moves = move[1]
+            else:
+                break
+
+            for row, target in moves:
+                source = self.assignment[row]
+                self._apply(row, target, loads, slot_enrollment)
+                movable[row] = False
+                new_clashes, new_overflow = self._cost(
+                    self.assignment, loads, slot_enrollment
+                )
+                suggestions.append(
+                    self._suggestion(
+                        row,
+                        source,
+                        target,
+                        clashes - new_clashes,
+                        overflow - new_overflow,
+                        new_clashes,
+                        new_overflow,
+                    )
+                )
+                clashes, overflow = new_clashes, new_overflow
+
+        self._log_rate(start)
+        return pd.DataFrame(suggestions, columns=SUGGESTION_COLUMNS)
+
+    def colour_timetable(self, max_moves=None):
+        """
+        Build a new timetable from scratch by greedy graph colouring, then improve it.
+
+        Courses are placed one at a time, most clash-connected first (DSatur
+        order), each into the slot where it adds the least cost; fixed courses
+        keep their slots. Local search then runs on the result. The new
+        timetable is only kept if it is cheaper than the current one.
+
+        Returns:
+            DataFrame: 'course_id', 'date', 'slot', 'new_date', 'new_slot'
+        """
+        start = time.perf_counter()
+        original = self.assignment.copy()
+        n_slots = len(self.slots)
+
+        assignment = np.where(self.movable, -1, original)
+        loads = self._slot_loads(assignment)
+        slot_enrollment = self._slot_enrollment(assignment)
+
+        degree = self.graph.degree()
+        unplaced = set(np.flatnonzero(self.movable).tolist())
+        while unplaced:
+            rows = np.fromiter(unplaced, dtype=np.int64)
+            # Saturation: how many slots already hold a clashing course
+            saturation = (loads[rows] > 0).sum(axis=1)
+            row = int(rows[np.lexsort((-degree[rows], -saturation))[0]])
+
+            added = self.clash_weight * loads[row] + self.overflow_weight * (
+                np.maximum(slot_enrollment + self.enrollment[row] - self.slot_capacity, 0)
+                - np.maximum(slot_enrollment - self.slot_capacity, 0)
+            )
+            self.moves_scored += n_slots
+            target = int(np.argmin(added))
+            assignment[row] = target
+            neighbours, shared = self.graph.neighbours(row)
+            loads[neighbours, target] += shared
+            slot_enrollment[target] += self.enrollment[row]
+            unplaced.remove(row)
+
+        self.assignment = assignment
+        self.suggest_moves(max_moves or len(assignment))
+        if self._weighted(self.cost()) >= self._weighted(self.cost(original)):
+            self.assignment = original
+
+        self._log_rate(start)
+        return self._timetable(original, self.assignment)
+
+    def reset(self):
+        """Return to the timetable the resolver was built from."""
+        self.assignment = self.engine.course_slot.copy()
+
+    def _slot_loads(self, assignment):
+        """Matrix [course, slot] of students the course shares with that slot's courses."""
+        n_slots = len(self.slots)
+        slots = assignment[self.graph.indices]
+        placed = slots >= 0
+        return (
+            np.bincount(
+                self.graph.edge_rows[placed] * n_slots + slots[placed],
+                weights=self.graph.weights[placed],
+                minlength=len(assignment) * n_slots,
+            )
+            .astype(np.int64)
+            .reshape(len(assignment), n_slots)
+        )
+
+    def _slot_enrollment(self, assignment):
+        placed = assignment >= 0
+        return np.bincount(
+            assignment[placed],
+            weights=self.enrollment[placed],
+            minlength=len(self.slots),
+        ).astype(np.int64)
+
+    def _overflow(self, enrollment):
+        return np.maximum(enrollment - self.slot_capacity, 0)
+
+    def _best_move(self, loads, slot_enrollment, movable):
+        """Return (cost change, [(row, slot)]) of the best single move, or None."""
+        rows = np.flatnonzero(movable)
+        if not len(rows) or len(self.slots) < 2:
+            return None
+        current = self.assignment[rows]
+        enrollment = self.enrollment[rows][:, None]
+
+        clash_delta = loads[rows] - loads[rows, current][:, None]
+        overflow_delta = (
+            self._overflow(slot_enrollment[None, :] + enrollment)
+            - self._overflow(slot_enrollment)[None, :]
+            + (self._overflow(slot_enrollment[current] - enrollment[:, 0])
+               - self._overflow(slot_enrollment[current]))[:, None]
+        )
+        delta = self.clash_weight * clash_delta + self.overflow_weight * overflow_delta
+        delta = delta.astype(float)
+        delta[np.arange(len(rows)), current] = np.inf
+        self.moves_scored += delta.size
+
+        best = np.unravel_index(np.argmin(delta), delta.shape)
+        if delta[best] >= -MIN_GAIN:
+            return None
+        return float(delta[best]), [(int(rows[best[0]]), int(best[1]))]
+
+    def _best_swap(self, loads, slot_enrollment, movable):
+        """
+        Return (cost change, [(row, slot), (other, slot)]) of the best swap, or None.
+
+        Only courses that currently clash are swapped, with any movable course
+        in another slot, which keeps the candidate set small.
+        """
+        rows = np.flatnonzero(movable)
+        current = self.assignment
+        clashing = rows[loads[rows, current[rows]] > 0]
+        if not len(clashing) or len(rows) < 2:
+            return None
+
+        best = None
+        for start in range(0, len(clashing), SWAP_BLOCK_ROWS):
+            block = clashing[start : start + SWAP_BLOCK_ROWS]
+            delta = self._swap_deltas(block, rows, loads, slot_enrollment)
+            self.moves_scored += delta.size
+            position = np.unravel_index(np.argmin(delta), delta.shape)
+            # Strictly better only, so ties keep the first swap as one matrix would
+            if best is None or delta[position] < best[0]:
+                best = (float(delta[position]), int(block[position[0]]), int(rows[position[1]]))
+
+        if best[0] >= -MIN_GAIN:
+            return None
+        gain, row, other = best
+        return gain, [(row, int(current[other])), (other, int(current[row]))]
+
+    def _swap_deltas(self, clashing, rows, loads, slot_enrollment):
+        """Matrix [clashing, rows] of the cost change of swapping the two courses' slots."""
+        current = self.assignment
+        a, b = current[clashing][:, None], current[rows][None, :]
+        clash_delta = (
+            loads[clashing][:, current[rows]]
+            - loads[clashing, current[clashing]][:, None]
+            + loads[rows, current[clashing][:, None]]
+            - loads[rows, current[rows]][None, :]
+            - 2 * self.graph.block(clashing, rows)
+        )
+        shift = self.enrollment[rows][None, :] - self.enrollment[clashing][:, None]
+        overflow_delta = (
+            self._overflow(slot_enrollment[a] + shift)
+            - self._overflow(slot_enrollment[a])
+            + self._overflow(slot_enrollment[b] - shift)
+            - self._overflow(slot_enrollment[b])
+        )
+        delta = self.clash_weight * clash_delta + self.overflow_weight * overflow_delta
+        return np.where(a == b, np.inf, delta.astype(float))
+
+    def _apply(self, row, target, loads, slot_enrollment):
+        source = self.assignment[row]
+        neighbours, shared = self.graph.neighbours(row)
+        loads[neighbours, source] -= shared
+        loads[neighbours, target] += shared
+        slot_enrollment[source] -= self.enrollment[row]
+        slot_enrollment[target] += self.enrollment[row]
+        self.assignment[row] = target
+
+    def _weighted(self, cost):
+        clashes, overflow = cost
+        return self.clash_weight * clashes + self.overflow_weight * overflow
+
+    def _suggestion(self, row, source, target, clashes_removed, overflow_removed,
+                    clashes_left, overflow_left):
+        from_date, from_slot = self.slots[source]
+        to_date, to_slot = self.slots[target]
+        return {
+            "course_id": self.engine.course_ids[row],
+            "from_date": from_date,
+            "from_slot": from_slot,
+            "to_date": to_date,
+            "to_slot": to_slot,
+            "enrollment": int(self.enrollment[row]),
+            "clashes_removed": clashes_removed,
+            "overflow_removed": overflow_removed,
+            "clashes_left": clashes_left,
+            "overflow_left": overflow_left,
+        }
+
+    def _timetable(self, before, after):
+        rows = []
+        for row, (old, new) in enumerate(zip(before.tolist(), after.tolist())):
+            date, slot = self.slots[old] if old >= 0 else (None, None)
+            new_date, new_slot = self.slots[new] if new >= 0 else (None, None)
+            rows.append(
+                {
+                    "course_id": self.engine.course_ids[row],
+                    "date": date,
+                    "slot": slot,
+                    "new_date": new_date,
+                    "new_slot": new_slot,
+                }
+            )
+        return pd.DataFrame(rows, columns=TIMETABLE_COLUMNS)
+
+    def _log_rate(self, start):
+        seconds = time.perf_counter() - start
+        count("moves_scored", self.moves_scored)
+        logging.info(
+            f"Scored {self.moves_scored} candidate slot moves in {seconds:.3f} seconds"
+        )
+
+
+def suggest_slot_moves(courses_df, slot_capacity, roll_table=None, max_moves=10, fixed=()):
+    """
+    Return suggested slot moves for the timetable in courses_df, best first.
+
+    See ConflictResolver; this is the one-call form used after the conflict
+    check. Suggestions are advisory, so a failure is logged and no moves are
+    suggested rather than stopping the run.
+    """
+    try:
+        resolver = ConflictResolver(courses_df, slot_capacity, roll_table, fixed)
+        clashes, overflow = resolver.cost()
+        if not clashes and not overflow:
+            return pd.DataFrame(columns=SUGGESTION_COLUMNS)
+        suggestions = resolver.suggest_moves(max_moves)
+        logging.info(
+            f"Suggested {len(suggestions)} slot moves for {clashes} clashing "
+            f"enrollment pairs and {overflow} overflowing students"
+        )
+        return suggestions
+
+    except Exception as e:
+        logging.warning(f"Could not suggest slot moves: {str(e)}")
+        return pd.DataFrame(columns=SUGGESTION_COLUMNS)
+
+
+def recolour_timetable(courses_df, slot_capacity, roll_table=None, fixed=()):
+    """
+    Return a re-planned timetable for courses_df, one row per course.
+
+    See ConflictResolver.colour_timetable; the new timetable is only used when
+    it is cheaper, otherwise every course keeps its slot. As with
+    suggest_slot_moves, a failure is logged and an empty timetable returned.
+    """
+    try:
+        resolver = ConflictResolver(courses_df, slot_capacity, roll_table, fixed)
+        before = resolver.cost()
+        timetable = resolver.colour_timetable()
+        after = resolver.cost()
+        logging.info(
+            f"Recoloured timetable: {before[0]} -> {after[0]} clashing enrollment "
+            f"pairs, {before[1]} -> {after[1]} overflowing students"
+        )
+        return timetable
+
+    except Exception as e:
+        logging.warning(f"Could not recolour the timetable: {str(e)}")
+        return pd.DataFrame(columns=TIMETABLE_COLUMNS)
@@ -1,13 +1,30 @@
 import pandas as pd
 import os
 import logging
+import hashlib
+import json
 
+try:
+    import pyarrow  # noqa: F401
 
-def read_excel(file_path):
-    """Read an Excel file and return its contents as a DataFrame."""
+    CACHE_FORMAT = "feather"
+except ImportError:
+    CACHE_FORMAT = "pickle"
+
+
+def read_excel(file_path, cache_dir=None):
+    """
+    Read an Excel file and return its contents as a DataFrame.
+
+    When cache_dir is given, the parsed DataFrame is cached there in a fast
+    binary format (Feather if pyarrow is installed, pickle otherwise) keyed by
+    the file's content hash, and reused while the file is unchanged.
+    """
     try:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"The file {file_path} does not exist.")
+        if cache_dir:
+            return read_excel_cached(file_path, cache_dir)
         # Explicitly specify engine to avoid detection issues
         return pd.read_excel(file_path, engine="openpyxl")
     except Exception as e:
@@ -15,6 +32,117 @@ def read_excel(file_path):
         raise
 
 
+def read_excel_cached(file_path, cache_dir):
+    """
+    Read an Excel file through the binary input cache.
+
+    A small per-file record stores the source's mtime, size and SHA-256. If
+    mtime and size are unchanged the stored hash is trusted; otherwise the
+    file is rehashed, so touching a file without changing it still hits.
+    When a file changes, the data cached for its old contents is removed
+    unless another source file's record still points to it.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    stat = os.stat(file_path)
+    path_key = hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest()
+    record_file = os.path.join(cache_dir, f"{path_key}.json")
+
+    record = {}
+    if os.path.exists(record_file):
+        with open(record_file) as f:
+            record = json.load(f)
+
+    if record.get("mtime_ns") == stat.st_mtime_ns and record.get("size") == stat.st_size:
+        digest = record["sha256"]
+    else:
+        digest = file_sha256(file_path)
+
+    for fmt in ("feather", "pickle"):
+        data_file = os.path.join(cache_dir, f"{digest}.{fmt}")
+        if os.path.exists(data_file):
+            dataframe = _load_cached(data_file, fmt)
+            break
+    else:
+        dataframe = pd.read_excel(file_path, engine="openpyxl")
+        _store_cached(dataframe, cache_dir, digest)
+        logging.info(f"Cached {file_path} in {cache_dir}")
+
+    if record.get("sha256") != digest or record.get("mtime_ns") != stat.st_mtime_ns:
+        _write_atomic(
+            record_file,
+            json.dumps(
+                {
+                    "source": os.path.abspath(file_path),
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "sha256": digest,
+                }
+            ).encode(),
+        )
+        if record.get("sha256") not in (None, digest):
+            _prune_unreferenced(cache_dir, record["sha256"])
+
+    return dataframe
+
+
+def file_sha256(file_path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_cached(data_file, fmt):
+    if fmt == "feather":
+        return pd.read_feather(data_file)
+    return pd.read_pickle(data_file)
+
+
+def _store_cached(dataframe, cache_dir, digest):
+    fmt = CACHE_FORMAT
+    data_file = os.path.join(cache_dir, f"{digest}.{fmt}")
+    tmp_file = f"{data_file}.{os.getpid()}.tmp"
+    try:
+        if fmt == "feather":
+            dataframe.to_feather(tmp_file)
+        else:
+            dataframe.to_pickle(tmp_file)
+    except Exception:
+        # Feather cannot hold mixed-type object columns (e.g. numeric and
+        # text room ids); fall back to pickle for those
+        fmt = "pickle"
+        data_file = os.path.join(cache_dir, f"{digest}.{fmt}")
+        dataframe.to_pickle(tmp_file)
+    os.replace(tmp_file, data_file)
+
+
+def _prune_unreferenced(cache_dir, digest):
+    """Remove the data cached for digest if no source file's record uses it."""
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(cache_dir, name)) as f:
+                if json.load(f).get("sha256") == digest:
+                    return
+        except (OSError, ValueError):
+            continue
+    for fmt in ("feather", "pickle"):
+        try:
+            os.remove(os.path.join(cache_dir, f"{digest}.{fmt}"))
+        except FileNotFoundError:
+            pass
+
+
+def _write_atomic(file_path, payload):
+    tmp_file = f"{file_path}.{os.getpid()}.tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_file, file_path)
+
+
 def write_excel(file_path, dataframe):
     """Write a DataFrame to an Excel file."""
     try:
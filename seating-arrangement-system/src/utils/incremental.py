@@ -0,0 +1,324 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from .async_writer import DEFAULT_WRITERS, AsyncFileWriter
+from .classroom_allocator import (
+    ALLOCATION_COLUMNS,
+    allocate_slots,
+    calculate_effective_capacity,
+    calculate_seats_left,
+    create_individual_seating_plans,
+    room_buildings,
+    save_multi_room_summary,
+)
+from .plan_exporter import build_seating_plans, write_plan_file
+from .roll_table import materialize_roll_numbers
+
+# Bump whenever the layout of the persisted state changes
+STATE_VERSION = 3
+
+# Allocation columns as persisted, with roll numbers as strings
+STORED_COLUMNS = ALLOCATION_COLUMNS[:-1] + ["roll_numbers"]
+
+
+def allocate_incremental(
+    courses,
+    classrooms_df,
+    buffer,
+    density,
+    roll_table,
+    state_file,
+    export_mode="files",
+    workers=1,
+    output_dir="data/output",
+    strategy="greedy",
+    time_budget=None,
+    output_workers=DEFAULT_WRITERS,
+    density_ratios=None,
+):
+    """
+    Allocate classrooms, re-solving only the (date, slot) groups that changed.
+
+    The previous run's per-slot inputs and results are loaded from state_file.
+    A slot is reused when its courses and students are unchanged and none of
+    the rooms it could use were added, resized or moved to another block
+    (removing a room the slot never used does not invalidate it). Per-room
+    files are rewritten only when their contents changed or the file on disk
+    is missing or no longer the one this run recorded (e.g. overwritten by a
+    non-incremental run); switching export_mode re-solves every slot.
+
+    Parameters:
+    - courses: DataFrame of courses with 'student_ids' encoded with roll_table
+    - classrooms_df, buffer, density, roll_table, export_mode, workers,
+      strategy, time_budget, output_workers, density_ratios: as for
+      allocate_classrooms
+    - state_file: Path of the pickled state from the previous incremental run
+
+    Returns:
+    - DataFrame with seating arrangement information, students as 'student_ids' arrays
+    """
+    try:
+        params = {
+            "buffer": buffer,
+            "density": density,
+            "strategy": strategy,
+            "export_mode": export_mode,
+        }
+        previous = load_state(state_file)
+        previous_slots = (
+            previous["slots"]
+            if previous
+            and previous.get("version") == STATE_VERSION
+            and previous.get("params") == params
+            else {}
+        )
+
+        classrooms = classrooms_df.copy().sort_values(
+            by="capacity", ascending=False, kind="stable"
+        )
+        capacity = calculate_effective_capacity(
+            classrooms, buffer, density, density_ratios
+        )
+        buildings = room_buildings(classrooms)
+        fingerprints = slot_fingerprints(courses, roll_table)
+
+        changed = [
+            key
+            for key in sorted(fingerprints)
+            if not _is_reusable(
+                previous_slots.get(key), fingerprints[key], capacity, buildings
+            )
+        ]
+        removed = [key for key in previous_slots if key not in fingerprints]
+        logging.info(
+            f"Incremental run: re-solving {len(changed)} of {len(fingerprints)} slots, "
+            f"{len(removed)} slots removed"
+        )
+        print(
+            f"Incremental run: re-solving {len(changed)} of {len(fingerprints)} slots"
+        )
+
+        # Re-solve only the changed slots
+        changed_set = set(changed)
+        in_changed = np.array(
+            [key in changed_set for key in zip(courses["date"], courses["slot"])],
+            dtype=bool,
+        )
+        solved_df, solved_seats_left, solved_unallocated = allocate_slots(
+            courses[in_changed],
+            classrooms_df,
+            buffer,
+            density,
+            roll_table,
+            workers,
+            strategy,
+            time_budget,
+            density_ratios,
+        )
+
+        slots = {}
+        for key in sorted(fingerprints):
+            if key in changed_set:
+                date, slot = key
+                slot_df = solved_df[
+                    (solved_df["date"] == date) & (solved_df["slot"] == slot)
+                ]
+                slots[key] = _slot_state(
+                    fingerprints[key],
+                    capacity,
+                    buildings,
+                    materialize_roll_numbers(slot_df, roll_table),
+                    solved_seats_left.get(key, {}),
+                    [u for u in solved_unallocated if (u["date"], u["slot"]) == key],
+                )
+            else:
+                slots[key] = dict(previous_slots[key])
+                # Drop rooms that no longer exist (this slot never used them)
+                slots[key]["seats_left"] = {
+                    room: seats
+                    for room, seats in slots[key]["seats_left"].items()
+                    if room in capacity
+                }
+                slots[key]["capacity"] = capacity
+                slots[key]["buildings"] = buildings
+                for course in slots[key]["unallocated"]:
+                    logging.error(course["reason"])
+                    print(course["reason"])
+
+        # Rebuild the full allocation table in (date, slot) order
+        allocation_df = pd.DataFrame(
+            [record for key in sorted(slots) for record in slots[key]["allocations"]],
+            columns=STORED_COLUMNS,
+        )
+        allocation_df["student_ids"] = [
+            roll_table.encode_joined(roll_numbers)
+            for roll_numbers in allocation_df.pop("roll_numbers")
+        ]
+
+        # Write outputs: per-room files whose contents or files on disk changed
+        if export_mode == "files":
+            for key in removed:
+                _remove_files(previous_slots[key]["files"], output_dir)
+            digests = {}
+            with AsyncFileWriter(output_dir, output_workers) as writer:
+                for key in sorted(slots):
+                    digests[key] = _write_changed_files(
+                        slots[key]["plans"],
+                        previous_slots.get(key, {}).get("files", {}),
+                        output_dir,
+                        writer,
+                    )
+            # Files are only complete once the writer has closed
+            for key, files in digests.items():
+                slots[key]["files"] = _stat_files(files, output_dir)
+            save_multi_room_summary(
+                [summary for key in sorted(slots) for summary in slots[key]["summaries"]],
+                output_dir,
+            )
+        elif not allocation_df.empty:
+            create_individual_seating_plans(
+                allocation_df, roll_table, export_mode, output_dir, output_workers
+            )
+
+        seats_left_df = calculate_seats_left(
+            {key: slots[key]["seats_left"] for key in sorted(slots)}
+        )
+        seats_left_df.to_excel(f"{output_dir}/op_seats_left.xlsx", index=False)
+
+        save_state(
+            state_file, {"version": STATE_VERSION, "params": params, "slots": slots}
+        )
+        return allocation_df
+
+    except Exception as e:
+        logging.error(f"Error in incremental classroom allocation: {str(e)}")
+        raise
+
+
+def slot_fingerprints(courses, roll_table):
+    """Return {(date, slot): sha256} over each slot's courses and their roll numbers."""
+    fingerprints = {}
+    for (date, slot), group in courses.groupby(["date", "slot"]):
+        digest = hashlib.sha256()
+        for course_id, ids in zip(group["course_id"], group["student_ids"]):
+            digest.update(f"{course_id}\x1f".encode())
+            digest.update(roll_table.join(ids).encode())
+            digest.update(b"\x1e")
+        fingerprints[(date, slot)] = digest.hexdigest()
+    return fingerprints
+
+
+def load_state(state_file):
+    """Load the state persisted by the previous incremental run, or None."""
+    if not state_file or not os.path.exists(state_file):
+        return None
+    try:
+        with open(state_file, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable allocation state {state_file}: {str(e)}")
+        return None
+
+
+def save_state(state_file, state):
+    """Persist the incremental state atomically."""
+    os.makedirs(os.path.dirname(state_file) or ".", exist_ok=True)
+    tmp_file = f"{state_file}.{os.getpid()}.tmp"
+    with open(tmp_file, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, state_file)
+
+
+def _is_reusable(previous_slot, fingerprint, capacity, buildings):
+    if previous_slot is None or previous_slot["fingerprint"] != fingerprint:
+        return False
+    # New, resized or re-blocked rooms can change which rooms the allocator picks
+    old_capacity = previous_slot["capacity"]
+    if any(old_capacity.get(room) != seats for room, seats in capacity.items()):
+        return False
+    old_buildings = previous_slot.get("buildings", {})
+    if any(old_buildings.get(room) != buildings.get(room) for room in capacity):
+        return False
+    # Removed rooms only matter if the slot was using them
+    removed_rooms = set(old_capacity) - set(capacity)
+    return not (removed_rooms & previous_slot["rooms_used"])
+
+
+def _slot_state(fingerprint, capacity, buildings, slot_df, seats_left, unallocated):
+    # Roll numbers are stored as strings so the state does not depend on a RollTable
+    allocations = slot_df[STORED_COLUMNS].to_dict("records")
+    plans, summaries = build_seating_plans(slot_df) if len(slot_df) else ([], [])
+    return {
+        "fingerprint": fingerprint,
+        "capacity": capacity,
+        "buildings": buildings,
+        "rooms_used": set(slot_df["room_id"]),
+        "allocations": allocations,
+        "seats_left": seats_left,
+        "unallocated": unallocated,
+        "plans": plans + summaries,
+        "summaries": summaries,
+        "files": {},
+    }
+
+
+def _entry_digest(entry):
+    payload = json.dumps(entry["data"], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _write_changed_files(entries, previous_files, output_dir, writer=None):
+    """
+    Write entries whose file is not current, delete stale ones, return {path: digest}.
+
+    previous_files maps each path to the [digest, size, mtime_ns] recorded
+    when it was last written; a file is current when its digest matches and
+    the file on disk still has that size and modification time.
+    """
+    files = {}
+    written = 0
+    for entry in entries:
+        path = f"{entry['folder']}/{entry['file_name']}"
+        digest = _entry_digest(entry)
+        files[path] = digest
+        if not _is_current(previous_files.get(path), digest, f"{output_dir}/{path}"):
+            write_plan_file(entry, output_dir, writer)
+            written += 1
+    _remove_files(
+        {path: None for path in previous_files if path not in files}, output_dir
+    )
+    if written:
+        logging.info(f"Rewrote {written} of {len(entries)} seating plan files")
+    return files
+
+
+def _is_current(recorded, digest, full_path):
+    if recorded is None or recorded[0] != digest:
+        return False
+    try:
+        stat = os.stat(full_path)
+    except FileNotFoundError:
+        return False
+    return [stat.st_size, stat.st_mtime_ns] == list(recorded[1:])
+
+
+def _stat_files(digests, output_dir):
+    """Return {path: [digest, size, mtime_ns]} for files that were just written."""
+    files = {}
+    for path, digest in digests.items():
+        stat = os.stat(f"{output_dir}/{path}")
+        files[path] = [digest, stat.st_size, stat.st_mtime_ns]
+    return files
+
+
+def _remove_files(files, output_dir):
+    for path in files:
+        full_path = f"{output_dir}/{path}"
+        if os.path.exists(full_path):
+            os.remove(full_path)
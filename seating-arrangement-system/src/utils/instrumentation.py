@@ -0,0 +1,245 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+PROFILE_MODES = (None, "cprofile", "tracemalloc")
+TRACE_FORMATS = ("json", "chrome")
+
+# The profiler spans and counters go to, per thread; worker threads and
+# processes start without one and report through their own local Profiler
+_active = threading.local()
+
+
+class Profiler:
+    """
+    Collects timed spans and counters for one seating run.
+
+    Spans are nested with span(); counters are summed with count(). Records
+    from worker threads or processes are collected in their own Profiler and
+    folded in with merge(), keeping their pid and thread id so a Chrome trace
+    shows one track per worker.
+
+    Args:
+        mode (str): None for spans and counters only, "cprofile" to also
+                    profile function calls, or "tracemalloc" to also record
+                    memory growth per span and the top allocation sites.
+    """
+
+    def __init__(self, mode=None):
+        if mode not in PROFILE_MODES:
+            raise ValueError(
+                f"Unknown profile mode '{mode}'. Use None, 'cprofile' or 'tracemalloc'."
+            )
+        self.mode = mode
+        self.spans = []
+        self.counters = defaultdict(int)
+        self._lock = threading.Lock()
+        self._cprofile = None
+        self._snapshot = None
+        self._started_tracemalloc = False
+
+    @contextmanager
+    def span(self, name, **args):
+        """Time the enclosed block as a span called `name`, with `args` as details."""
+        memory_before = self._traced_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {
+                "name": name,
+                "start": start,
+                "seconds": time.perf_counter() - start,
+                "pid": os.getpid(),
+                "thread": threading.get_ident(),
+                "args": args,
+            }
+            if memory_before is not None:
+                record["memory_kb"] = (self._traced_memory() - memory_before) // 1024
+            with self._lock:
+                self.spans.append(record)
+
+    def count(self, name, value=1):
+        """Add `value` to the counter called `name`."""
+        with self._lock:
+            self.counters[name] += value
+
+    def records(self):
+        """Return the spans and counters as plain data, e.g. to send back from a worker."""
+        with self._lock:
+            return {"spans": list(self.spans), "counters": dict(self.counters)}
+
+    def merge(self, records):
+        """Fold in records returned by another Profiler's records()."""
+        with self._lock:
+            self.spans.extend(records["spans"])
+            for name, value in records["counters"].items():
+                self.counters[name] += value
+
+    def start(self):
+        """Start the cProfile or tracemalloc collection selected by mode."""
+        if self.mode == "cprofile":
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        elif self.mode == "tracemalloc" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop(self):
+        """Stop the collection started by start()."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self.mode == "tracemalloc" and tracemalloc.is_tracing():
+            self._snapshot = tracemalloc.take_snapshot()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+    def _traced_memory(self):
+        if self.mode == "tracemalloc" and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        return None
+
+    def stage_seconds(self):
+        """Return {span name: total seconds} over every recorded span."""
+        totals = defaultdict(float)
+        for record in self.spans:
+            totals[record["name"]] += record["seconds"]
+        return dict(totals)
+
+    def slowest(self, name, limit=5):
+        """Return the `limit` slowest spans called `name`, slowest first."""
+        spans = [record for record in self.spans if record["name"] == name]
+        return sorted(spans, key=lambda record: record["seconds"], reverse=True)[:limit]
+
+    def write(self, output_dir, trace_format="json"):
+        """
+        Write the trace, plus any cProfile or tracemalloc report, into output_dir.
+
+        trace_format selects profile.json (spans, per-stage totals and
+        counters) or trace.json (Chrome trace, for chrome://tracing or Perfetto).
+
+        Returns:
+            list: Paths of the files written
+        """
+        if trace_format not in TRACE_FORMATS:
+            raise ValueError(
+                f"Unknown trace format '{trace_format}'. Use 'json' or 'chrome'."
+            )
+        os.makedirs(output_dir, exist_ok=True)
+        written = []
+
+        if trace_format == "json":
+            path = f"{output_dir}/profile.json"
+            _write_json(path, self.to_json())
+        else:
+            path = f"{output_dir}/trace.json"
+            _write_json(path, self.to_chrome_trace())
+        written.append(path)
+
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(f"{output_dir}/profile.pstats")
+            report = io.StringIO()
+            pstats.Stats(self._cprofile, stream=report).sort_stats(
+                "cumulative"
+            ).print_stats(40)
+            with open(f"{output_dir}/profile.txt", "w") as f:
+                f.write(report.getvalue())
+            written += [f"{output_dir}/profile.pstats", f"{output_dir}/profile.txt"]
+
+        if self._snapshot is not None:
+            with open(f"{output_dir}/tracemalloc.txt", "w") as f:
+                for stat in self._snapshot.statistics("lineno")[:40]:
+                    f.write(f"{stat}\n")
+            written.append(f"{output_dir}/tracemalloc.txt")
+
+        logging.info(f"Wrote profiling output: {', '.join(written)}")
+        return written
+
+    def to_json(self):
+        """Return spans (start relative to the first span), per-stage totals and counters."""
+        origin = min((record["start"] for record in self.spans), default=0.0)
+        spans = [
+            dict(record, start=round(record["start"] - origin, 6))
+            for record in sorted(self.spans, key=lambda record: record["start"])
+        ]
+        return {
+            "mode": self.mode,
+            "stages": self.stage_seconds(),
+            "counters": dict(self.counters),
+            "spans": spans,
+        }
+
+    def to_chrome_trace(self):
+        """Return the spans and counters in the Chrome trace event format."""
+        origin = min((record["start"] for record in self.spans), default=0.0)
+        end = max(
+            (record["start"] + record["seconds"] for record in self.spans),
+            default=origin,
+        )
+        events = [
+            {
+                "name": record["name"],
+                "cat": "seating",
+                "ph": "X",
+                "ts": (record["start"] - origin) * 1e6,
+                "dur": record["seconds"] * 1e6,
+                "pid": record["pid"],
+                "tid": record["thread"],
+                "args": record["args"],
+            }
+            for record in self.spans
+        ]
+        if self.counters:
+            events.append(
+                {
+                    "name": "counters",
+                    "ph": "C",
+                    "ts": (end - origin) * 1e6,
+                    "pid": os.getpid(),
+                    "args": dict(self.counters),
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _write_json(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+
+
+def get_profiler():
+    """Return the Profiler active in this thread, or None."""
+    return getattr(_active, "profiler", None)
+
+
+@contextmanager
+def activate(profiler):
+    """Make `profiler` receive span() and count() calls from this thread."""
+    previous = get_profiler()
+    _active.profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _active.profiler = previous
+
+
+def span(name, **args):
+    """Span on the active Profiler; does nothing when no profiler is active."""
+    profiler = get_profiler()
+    return profiler.span(name, **args) if profiler is not None else nullcontext()
+
+
+def count(name, value=1):
+    """Counter on the active Profiler; does nothing when no profiler is active."""
+    profiler = get_profiler()
+    if profiler is not None:
+        profiler.count(name, value)
+
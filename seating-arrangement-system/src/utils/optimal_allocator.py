@@ -0,0 +1,269 @@
+import logging
+import time
+
+import numpy as np
+
+from .capacity_ledger import SlotCapacityLedger
+from .instrumentation import count
+from .classroom_allocator import (
+    allocation_records,
+    capacity_record,
+    conflict_record,
+    iter_slot_courses,
+)
+
+# Default search budget per (date, slot), in seconds
+DEFAULT_TIME_BUDGET = 2.0
+
+# Marks a search frame whose choices have all been tried
+_EXHAUSTED = object()
+
+
+def allocate_slot_optimal(
+    date,
+    slot,
+    group,
+    effective_capacity,
+    roll_table,
+    room_buildings=None,
+    time_budget=DEFAULT_TIME_BUDGET,
+):
+    """
+    Allocate one (date, slot) with a branch-and-bound search over room placements.
+
+    Placements are scored lexicographically by (students left unseated, rooms
+    used, course-room pieces), so the search first seats as many students as
+    possible, then uses as few rooms as it can, then splits courses as little
+    as possible. Buffer and density are already applied in effective_capacity.
+
+    The greedy ledger allocation seeds the incumbent, so the result is never
+    worse than greedy. If the time budget runs out, the best placement found
+    so far is returned, which is the greedy one if nothing better was found.
+
+    Returns the same (allocations, seats_left, unallocated) tuple as allocate_slot.
+    """
+    room_ids = list(effective_capacity)
+    capacities = [max(int(effective_capacity[room]), 0) for room in room_ids]
+
+    # Conflicting courses are rejected up front, in the same order as greedy
+    courses = []
+    unallocated = []
+    slot_students = np.zeros(len(roll_table), dtype=bool)
+    for course_id, enrollment, students in iter_slot_courses(group):
+        clashing = students[slot_students[students]]
+        if len(clashing):
+            unallocated.append(
+                conflict_record(date, slot, course_id, enrollment, clashing, roll_table)
+            )
+            continue
+        slot_students[students] = True
+        courses.append((course_id, enrollment, students))
+
+    search = _PlacementSearch(
+        [len(students) for _, _, students in courses], capacities, time_budget
+    )
+    search.seed(
+        _greedy_placements(courses, effective_capacity, room_ids, room_buildings)
+    )
+    search.run()
+    count("search_nodes", search.nodes)
+    if not search.finished:
+        logging.info(
+            f"Optimal allocation for {date} {slot} stopped after {time_budget}s; "
+            "using the best placement found"
+        )
+
+    allocations = []
+    free = dict(zip(room_ids, capacities))
+    for (course_id, enrollment, students), placement in zip(
+        courses, search.best_placements
+    ):
+        if placement is None:
+            unallocated.append(capacity_record(date, slot, course_id, enrollment))
+            continue
+        placements = [(room_ids[room], seats) for room, seats in placement]
+        for room_id, seats in placements:
+            free[room_id] -= seats
+        allocations.extend(
+            allocation_records(
+                date, slot, course_id, students, placements, effective_capacity
+            )
+        )
+
+    return allocations, free, unallocated
+
+
+def _greedy_placements(courses, effective_capacity, room_ids, room_buildings=None):
+    """Greedy ledger placements, as room indexes, used to seed the search."""
+    ledger = SlotCapacityLedger(effective_capacity, room_buildings)
+    index = {room_id: position for position, room_id in enumerate(room_ids)}
+    placements = []
+    for _, _, students in courses:
+        plan = ledger.plan(len(students))
+        placements.append(
+            None if plan is None else [(index[room], seats) for room, seats in plan]
+        )
+    return placements
+
+
+class _PlacementSearch:
+    """Depth-first branch and bound over per-course room placements."""
+
+    def __init__(self, demands, capacities, time_budget):
+        self.demands = demands
+        self.free = list(capacities)
+        self.used = [False] * len(capacities)
+        self.deadline = time.perf_counter() + time_budget
+        self.best_score = None
+        self.best_placements = [None] * len(demands)
+        self.finished = False
+        self.nodes = 0
+        self._current = [None] * len(demands)
+        # Remaining demand from course i onwards, for the lower bound
+        self._suffix_demand = np.cumsum([0] + demands[::-1])[::-1].tolist()
+
+    def seed(self, placements):
+        unseated = sum(
+            demand
+            for demand, placement in zip(self.demands, placements)
+            if placement is None
+        )
+        rooms = {room for placement in placements if placement for room, _ in placement}
+        pieces = sum(len(placement) for placement in placements if placement)
+        self.best_score = (unseated, len(rooms), pieces)
+        self.best_placements = list(placements)
+
+    def run(self):
+        try:
+            self._search()
+            self.finished = True
+        except TimeoutError:
+            self.finished = False
+
+    def _lower_bound(self, course, unseated, rooms, pieces):
+        remaining = self._suffix_demand[course]
+        open_free = sum(f for f, used in zip(self.free, self.used) if used)
+        closed_free = sorted(
+            (f for f, used in zip(self.free, self.used) if not used), reverse=True
+        )
+        # Students that cannot be seated even using every free seat
+        short = max(remaining - open_free - sum(closed_free), 0)
+        # Fewest new rooms that could cover the rest of the demand
+        needed = max(remaining - short - open_free, 0)
+        new_rooms = 0
+        for capacity in closed_free:
+            if needed <= 0:
+                break
+            needed -= capacity
+            new_rooms += 1
+        courses_left = sum(1 for demand in self.demands[course:] if demand > 0)
+        return (unseated + short, rooms + new_rooms, pieces + courses_left)
+
+    def _search(self):
+        """
+        Depth-first search with an explicit stack of one frame per course.
+
+        Each frame is [course, unseated, rooms, pieces, remaining choices,
+        placement applied for the child being explored], so slots with more
+        courses than the recursion limit are searched like any other.
+        """
+        stack = []
+        self._push(stack, 0, 0, 0, 0)
+        while stack:
+            frame = stack[-1]
+            self._release(frame)
+            course, unseated, rooms, pieces, choices, _ = frame
+            placement = next(choices, _EXHAUSTED)
+            if placement is _EXHAUSTED:
+                stack.pop()
+                continue
+
+            self._current[course] = placement
+            if placement is None:
+                # Leave the course unseated
+                self._push(stack, course + 1, unseated + self.demands[course], rooms, pieces)
+                continue
+
+            opened = [room for room, _ in placement if not self.used[room]]
+            for room, seats in placement:
+                self.free[room] -= seats
+            for room in opened:
+                self.used[room] = True
+            frame[5] = (placement, opened)
+            self._push(
+                stack, course + 1, unseated, rooms + len(opened), pieces + len(placement)
+            )
+
+    def _push(self, stack, course, unseated, rooms, pieces):
+        """Visit a search node; push a frame for it unless it is a leaf or pruned."""
+        self.nodes += 1
+        if time.perf_counter() > self.deadline:
+            raise TimeoutError
+
+        if course == len(self.demands):
+            score = (unseated, rooms, pieces)
+            if score < self.best_score:
+                self.best_score = score
+                self.best_placements = list(self._current)
+            return
+
+        if self._lower_bound(course, unseated, rooms, pieces) >= self.best_score:
+            return
+
+        demand = self.demands[course]
+        # An empty course has a single, empty placement
+        choices = [[]] if demand == 0 else self._candidates(demand) + [None]
+        stack.append([course, unseated, rooms, pieces, iter(choices), None])
+
+    def _release(self, frame):
+        """Undo the placement the frame applied for its last child, if any."""
+        if frame[5] is None:
+            return
+        placement, opened = frame[5]
+        for room in opened:
+            self.used[room] = False
+        for room, seats in placement:
+            self.free[room] += seats
+        frame[5] = None
+
+    def _candidates(self, demand):
+        """Candidate placements for one course, most promising first."""
+        candidates = []
+        seen = set()
+
+        # Single rooms that hold the whole course: rooms already in use first,
+        # then best fit; rooms with the same free seats and state are equivalent
+        singles = sorted(
+            (
+                (not self.used[room], free, room)
+                for room, free in enumerate(self.free)
+                if free >= demand
+            )
+        )
+        for unused, free, room in singles:
+            if (unused, free) in seen:
+                continue
+            seen.add((unused, free))
+            candidates.append([(room, demand)])
+
+        # Splits: fill rooms already in use first, or simply the largest rooms
+        for prefer_used in (True, False):
+            order = sorted(
+                (room for room, free in enumerate(self.free) if free > 0),
+                key=lambda room: (
+                    (not self.used[room]) if prefer_used else False,
+                    -self.free[room],
+                ),
+            )
+            placement = []
+            left = demand
+            for room in order:
+                if left <= 0:
+                    break
+                seats = min(self.free[room], left)
+                placement.append((room, seats))
+                left -= seats
+            if left == 0 and len(placement) > 1 and placement not in candidates:
+                candidates.append(placement)
+
+        return candidates
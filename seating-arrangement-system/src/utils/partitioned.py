@@ -0,0 +1,362 @@
+import json
+import logging
+import os
+import zipfile
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from .async_writer import DEFAULT_WRITERS, AsyncFileWriter, dataframe_xlsx
+from .classroom_allocator import (
+    ALLOCATION_COLUMNS,
+    SEARCH_STRATEGIES,
+    calculate_effective_capacity,
+    calculate_seats_left,
+    get_allocation_strategy,
+    room_buildings,
+    save_multi_room_summary,
+)
+from .conflict_engine import ConflictEngine
+from .instrumentation import count, span
+from .plan_exporter import (
+    PLAN_COLUMNS,
+    SUMMARY_COLUMNS,
+    SheetStream,
+    build_seating_plans,
+    render_plan_file,
+    write_plan_file,
+)
+from .roll_table import RollTable, materialize_roll_numbers
+
+MANIFEST_FILE = "manifest.json"
+OUTPUT_COLUMNS = ALLOCATION_COLUMNS[:-1] + ["roll_numbers"]
+SEATS_LEFT_COLUMNS = ["date", "slot", "room_id", "seats_left"]
+CONFLICT_COLUMNS = ["date", "slot", "roll_number", "course1", "course2"]
+
+
+def write_partitions(timetable_df, course_roll_csv, partition_dir, chunksize=50000):
+    """
+    Split the course-roll mapping into one file per (date, slot) of the timetable.
+
+    The mapping is read in chunks and each chunk's rows are appended to the
+    files of the slots their course is examined in, so memory stays bounded
+    by the chunk size however large the mapping is. A manifest lists the
+    partitions in (date, slot) order with their courses in timetable order.
+
+    Parameters:
+    - timetable_df: Exam schedule with 'course_id', 'date', 'day' and 'slot'
+    - course_roll_csv: CSV with 'rollno' and 'course_code' columns
+    - partition_dir: Directory for the partition files and manifest
+    - chunksize: Mapping rows read at a time
+
+    Returns:
+    - The manifest dict
+    """
+    try:
+        os.makedirs(partition_dir, exist_ok=True)
+        schedule = timetable_df.dropna(subset=["date", "slot"])
+        keys = sorted(set(zip(schedule["date"], schedule["slot"])))
+        partition_of = {key: position for position, key in enumerate(keys)}
+
+        partitions = [
+            {"date": date, "slot": slot, "file": f"{position:05d}.csv", "courses": []}
+            for position, (date, slot) in enumerate(keys)
+        ]
+        course_partitions = {}
+        for course_id, date, day, slot in zip(
+            schedule["course_id"], schedule["date"], schedule["day"], schedule["slot"]
+        ):
+            position = partition_of[(date, slot)]
+            partitions[position]["courses"].append([course_id, day])
+            positions = course_partitions.setdefault(course_id, [])
+            if position not in positions:
+                positions.append(position)
+
+        # Start every partition file empty, so reruns do not append twice
+        for partition in partitions:
+            open(os.path.join(partition_dir, partition["file"]), "w").close()
+
+        reader = pd.read_csv(
+            course_roll_csv,
+            usecols=lambda col: col.strip() in ("rollno", "course_code"),
+            dtype=str,
+            chunksize=chunksize,
+        )
+        for chunk in reader:
+            chunk.columns = [col.strip() for col in chunk.columns]
+            count("csv_rows_read", len(chunk))
+            chunk = chunk.dropna(subset=["rollno", "course_code"])
+            rows = pd.DataFrame(
+                {
+                    "course_id": chunk["course_code"].str.strip(),
+                    "roll_number": chunk["rollno"].str.strip(),
+                }
+            )
+            rows = rows[(rows["course_id"] != "") & (rows["roll_number"] != "")]
+
+            # A course examined in several slots goes to each of their files
+            rows["partition"] = rows["course_id"].map(course_partitions)
+            rows = rows.dropna(subset=["partition"]).explode("partition")
+            for position, part in rows.groupby("partition", sort=False):
+                part[["course_id", "roll_number"]].to_csv(
+                    os.path.join(partition_dir, partitions[int(position)]["file"]),
+                    mode="a",
+                    header=False,
+                    index=False,
+                )
+
+        manifest = {"partitions": partitions}
+        with open(os.path.join(partition_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=1)
+        logging.info(f"Wrote {len(partitions)} date/slot partitions to {partition_dir}")
+        return manifest
+
+    except Exception as e:
+        logging.error(f"Error partitioning inputs: {str(e)}")
+        raise
+
+
+def load_manifest(partition_dir):
+    """Return the manifest written by write_partitions."""
+    with open(os.path.join(partition_dir, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def read_partition(partition_dir, partition):
+    """
+    Load one partition as a courses DataFrame with its own RollTable.
+
+    Each partition interns only its own students, so the roll table, like
+    everything else, is sized by the slot rather than the whole term.
+
+    Returns:
+    - tuple: (courses DataFrame with 'course_id', 'date', 'day', 'slot',
+      'student_ids' and 'enrollment', RollTable)
+    """
+    rows = pd.read_csv(
+        os.path.join(partition_dir, partition["file"]),
+        header=None,
+        names=["course_id", "roll_number"],
+        dtype=str,
+        keep_default_na=False,
+    )
+    roll_table = RollTable()
+    codes, uniques = pd.factorize(rows["roll_number"])
+    unique_ids = np.array([roll_table.intern(roll) for roll in uniques], dtype=np.int32)
+    student_ids = pd.Series(unique_ids[codes], index=rows.index)
+    by_course = {
+        course_id: ids.to_numpy(dtype=np.int32)
+        for course_id, ids in student_ids.groupby(rows["course_id"], sort=False)
+    }
+
+    empty = np.empty(0, dtype=np.int32)
+    course_ids = [course_id for course_id, _ in partition["courses"]]
+    courses = pd.DataFrame(
+        {
+            "course_id": course_ids,
+            "date": partition["date"],
+            "day": [day for _, day in partition["courses"]],
+            "slot": partition["slot"],
+        }
+    )
+    courses["student_ids"] = [by_course.get(course_id, empty) for course_id in course_ids]
+    courses["enrollment"] = courses["student_ids"].map(len)
+    return courses, roll_table
+
+
+def allocate_partitioned(
+    partition_dir,
+    classrooms_df,
+    buffer,
+    density,
+    output_dir="data/output",
+    export_mode="files",
+    strategy="greedy",
+    time_budget=None,
+    output_workers=DEFAULT_WRITERS,
+    density_ratios=None,
+):
+    """
+    Check conflicts and allocate classrooms one (date, slot) partition at a time.
+
+    Only one partition is in memory at once. Its allocations, seats left,
+    conflicts and seating plans are appended to the outputs before the next
+    partition is read, so peak memory follows the largest slot, not the
+    term. The outputs match a normal run: op_overall_seating_arrangement.xlsx,
+    op_seats_left.xlsx, conflicts/, courses_in_multiple_rooms.xlsx and the
+    seating plans in export_mode layout.
+
+    Parameters:
+    - partition_dir: Directory written by write_partitions
+    - classrooms_df, buffer, density, strategy, time_budget, output_workers,
+      density_ratios: as for allocate_classrooms
+    - output_dir: Directory for the outputs
+    - export_mode: "files", "workbook" or "zip", see create_individual_seating_plans
+
+    Returns:
+    - dict of totals: partitions, courses, allocations, conflicts,
+      unallocated and the largest partition's enrollment
+    """
+    try:
+        if export_mode not in ("files", "workbook", "zip"):
+            raise ValueError(
+                f"Unknown export mode '{export_mode}'. Use 'files', 'workbook' or 'zip'."
+            )
+        manifest = load_manifest(partition_dir)
+
+        # Same room order and capacities as allocate_slots
+        classrooms = classrooms_df.copy().sort_values(
+            by="capacity", ascending=False, kind="stable"
+        )
+        effective_capacity = calculate_effective_capacity(
+            classrooms, buffer, density, density_ratios
+        )
+        allocate = get_allocation_strategy(strategy)
+        options = {"room_buildings": room_buildings(classrooms)}
+        if time_budget is not None and strategy in SEARCH_STRATEGIES:
+            options["time_budget"] = time_budget
+
+        os.makedirs(f"{output_dir}/conflicts", exist_ok=True)
+        totals = Counter()
+        largest = 0
+        summaries = []
+        by_student, by_slot, by_course = Counter(), Counter(), Counter()
+
+        with SheetStream(
+            f"{output_dir}/op_overall_seating_arrangement.xlsx"
+        ) as arrangement, SheetStream(
+            f"{output_dir}/op_seats_left.xlsx"
+        ) as seats_left, SheetStream(
+            f"{output_dir}/conflicts/conflicts_detailed.xlsx"
+        ) as conflict_sheet, _PlanSink(
+            export_mode, output_dir, output_workers
+        ) as plans:
+            for partition in manifest["partitions"]:
+                date, slot = partition["date"], partition["slot"]
+                with span("partition", date=date, slot=slot):
+                    courses, roll_table = read_partition(partition_dir, partition)
+                    largest = max(largest, int(courses["enrollment"].sum()))
+
+                    conflicts = ConflictEngine(courses, roll_table).conflicts()
+                    conflict_sheet.append("Sheet1", CONFLICT_COLUMNS, conflicts)
+                    for conflict in conflicts:
+                        by_student[conflict["roll_number"]] += 1
+                        by_slot[(date, slot)] += 1
+                        by_course[conflict["course1"]] += 1
+                        by_course[conflict["course2"]] += 1
+
+                    allocations, slot_seats_left, unallocated = allocate(
+                        date, slot, courses, effective_capacity, roll_table, **options
+                    )
+                    for course in unallocated:
+                        logging.error(course["reason"])
+                        print(course["reason"])
+
+                    allocation_df = materialize_roll_numbers(
+                        pd.DataFrame(allocations, columns=ALLOCATION_COLUMNS), roll_table
+                    )
+                    records = allocation_df.to_dict("records")
+                    arrangement.append("Sheet1", OUTPUT_COLUMNS, records)
+                    seats_left.append(
+                        "Sheet1",
+                        SEATS_LEFT_COLUMNS,
+                        calculate_seats_left({(date, slot): slot_seats_left}).to_dict(
+                            "records"
+                        ),
+                    )
+                    slot_plans, slot_summaries = build_seating_plans(allocation_df)
+                    plans.add(slot_plans, slot_summaries)
+                    summaries.extend(slot_summaries)
+
+                    totals["partitions"] += 1
+                    totals["courses"] += len(courses)
+                    totals["allocations"] += len(allocations)
+                    totals["conflicts"] += len(conflicts)
+                    totals["unallocated"] += len(unallocated)
+
+        save_multi_room_summary(summaries, output_dir)
+        if totals["conflicts"]:
+            _save_conflict_summaries(
+                by_student, by_slot, by_course, f"{output_dir}/conflicts", output_workers
+            )
+
+        totals = dict(totals, largest_partition_enrollment=largest)
+        logging.info(f"Partitioned allocation finished: {totals}")
+        return totals
+
+    except Exception as e:
+        logging.error(f"Error in partitioned classroom allocation: {str(e)}")
+        raise
+
+
+class _PlanSink:
+    """Seating plans for one export mode, added a partition at a time."""
+
+    def __init__(self, export_mode, output_dir, output_workers):
+        self.export_mode = export_mode
+        self.output_dir = output_dir
+        self._writer = None
+        self._archive = None
+        self._workbook = None
+        # The workbook keeps multi-room summaries for a last sheet, as export_plans_workbook does
+        self._summaries = []
+        if export_mode == "files":
+            self._writer = AsyncFileWriter(output_dir, output_workers)
+        elif export_mode == "zip":
+            self._archive = zipfile.ZipFile(
+                f"{output_dir}/seating_plans.zip", "w", zipfile.ZIP_DEFLATED
+            )
+        else:
+            self._workbook = SheetStream(f"{output_dir}/seating_plans.xlsx")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._writer is not None:
+            self._writer.close()
+        elif self._archive is not None:
+            self._archive.close()
+            count("files_written")
+        else:
+            if self._summaries:
+                self._workbook.append(
+                    "Multi-room courses",
+                    SUMMARY_COLUMNS,
+                    [summary["data"] for summary in self._summaries],
+                )
+            self._workbook.close()
+        return False
+
+    def add(self, plans, summaries):
+        if self._workbook is not None:
+            for plan in plans:
+                self._workbook.append(plan["folder"], PLAN_COLUMNS, [plan["data"]])
+            self._summaries.extend(summaries)
+            return
+        for entry in plans + summaries:
+            if self._writer is not None:
+                write_plan_file(entry, self.output_dir, self._writer)
+            else:
+                self._archive.writestr(
+                    f"{entry['folder']}/{entry['file_name']}", render_plan_file(entry)
+                )
+
+
+def _save_conflict_summaries(by_student, by_slot, by_course, output_dir, workers):
+    """Write the by-student, by-slot and by-course conflict counts, as save_conflict_data does."""
+    student_df = pd.DataFrame(
+        list(by_student.items()), columns=["roll_number", "conflict_count"]
+    ).sort_values(by="conflict_count", ascending=False)
+    slot_df = pd.DataFrame(
+        [(date, slot, total) for (date, slot), total in by_slot.items()],
+        columns=["date", "slot", "conflict_count"],
+    )
+    course_df = pd.DataFrame(
+        list(by_course.items()), columns=["course_id", "conflict_count"]
+    ).sort_values(by="conflict_count", ascending=False)
+    with AsyncFileWriter(output_dir, workers) as writer:
+        writer.submit("conflicts_by_student.xlsx", dataframe_xlsx, student_df)
+        writer.submit("conflicts_by_slot.xlsx", dataframe_xlsx, slot_df)
+        writer.submit("conflicts_by_course.xlsx", dataframe_xlsx, course_df)
@@ -0,0 +1,235 @@
+import io
+import logging
+import os
+import zipfile
+from itertools import groupby
+
+from openpyxl import Workbook
+
+from .instrumentation import count, span
+
+PLAN_COLUMNS = [
+    "course_id",
+    "room_id",
+    "date",
+    "slot",
+    "enrollment",
+    "roll_numbers",
+    "multi_room",
+]
+SUMMARY_COLUMNS = [
+    "course_id",
+    "date",
+    "slot",
+    "total_enrollment",
+    "rooms",
+    "room_count",
+]
+
+
+def build_seating_plans(allocation_df):
+    """
+    Build the per course-room seating plans and multi-room course summaries.
+
+    Args:
+        allocation_df (DataFrame): Allocations with materialized 'roll_numbers'
+
+    Returns:
+        tuple: (plans, summaries) where each plan is a dict with 'folder',
+               'file_name' and 'data' (one row of PLAN_COLUMNS), and each
+               summary is a dict with 'folder', 'file_name' and 'data' (one
+               row of SUMMARY_COLUMNS).
+    """
+    plans = []
+    summaries = []
+
+    for (date, slot, course_id), group in allocation_df.groupby(
+        ["date", "slot", "course_id"]
+    ):
+        formatted_date = date.replace("/", "_")
+        folder = f"{formatted_date}/{slot.capitalize()}"
+        room_ids = [str(room_id) for room_id in group["room_id"]]
+        room_count = len(group)
+
+        for position, row in enumerate(group.itertuples(index=False)):
+            data = {
+                "course_id": course_id,
+                "room_id": row.room_id,
+                "date": date,
+                "slot": slot,
+                "enrollment": row.enrollment,
+                "roll_numbers": row.roll_numbers,
+            }
+            # Add multi-room indicator if applicable
+            if room_count > 1:
+                data["multi_room"] = f"Room {position + 1} of {room_count}"
+            plans.append(
+                {
+                    "folder": folder,
+                    "file_name": f"{formatted_date}_{course_id}_{row.room_id}.xlsx",
+                    "data": data,
+                }
+            )
+
+        if room_count > 1:
+            summaries.append(
+                {
+                    "folder": folder,
+                    "file_name": f"{formatted_date}_{course_id}_summary.xlsx",
+                    "data": {
+                        "course_id": course_id,
+                        "date": date,
+                        "slot": slot,
+                        "total_enrollment": group["enrollment"].sum(),
+                        "rooms": ", ".join(room_ids),
+                        "room_count": room_count,
+                    },
+                }
+            )
+
+    return plans, summaries
+
+
+def write_plan_file(entry, output_dir="data/output", writer=None):
+    """
+    Write one seating plan or summary entry to <output_dir>/<folder>/<file_name>.
+
+    With an AsyncFileWriter (whose output_dir is output_dir) the file is
+    queued and rendered and written by the writer's threads instead.
+    """
+    path = f"{entry['folder']}/{entry['file_name']}"
+    if writer is not None:
+        writer.submit(path, render_plan_file, entry)
+        return
+    # Create directory structure
+    os.makedirs(f"{output_dir}/{entry['folder']}", exist_ok=True)
+    with span("write_file", file=path):
+        with open(f"{output_dir}/{path}", "wb") as f:
+            f.write(render_plan_file(entry))
+    count("files_written")
+
+
+def render_plan_file(entry):
+    """Return one seating plan or summary entry as the bytes of an .xlsx file."""
+    columns = PLAN_COLUMNS if "roll_numbers" in entry["data"] else SUMMARY_COLUMNS
+    # Only keep the multi-room column when it applies
+    entry_columns = [column for column in columns if column in entry["data"]]
+    buffer = io.BytesIO()
+    write_rows_xlsx(buffer, entry_columns, [entry["data"]])
+    return buffer.getvalue()
+
+
+def write_rows_xlsx(target, columns, rows, title=None):
+    """
+    Write rows of dicts to a single-sheet workbook using openpyxl's write-only mode.
+
+    Args:
+        target: File path or binary file object to save to
+        columns (list): Column names, written as the header row
+        rows (iterable): Dicts keyed by column name; missing keys are left blank
+        title (str): Optional sheet title
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=title)
+    sheet.append(columns)
+    for row in rows:
+        sheet.append([_cell(row.get(column)) for column in columns])
+    workbook.save(target)
+
+
+class SheetStream:
+    """
+    Append rows to the sheets of one write-only workbook as they are produced.
+
+    Rows go straight to openpyxl's write-only (constant-memory) sheets, so a
+    workbook can be filled one date/slot at a time without holding every row.
+
+    Args:
+        output_file (str): Workbook to save when the stream is closed
+    """
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.rows = 0
+        self._workbook = Workbook(write_only=True)
+        self._sheets = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def append(self, title, columns, rows):
+        """Append dicts keyed by column name to sheet `title`, creating it with a header."""
+        sheet = self._sheets.get(title)
+        if sheet is None:
+            # Sheet names cannot contain '/' and are limited to 31 characters
+            sheet = self._workbook.create_sheet(title=title.replace("/", " ")[:31])
+            sheet.append(columns)
+            self._sheets[title] = sheet
+        for row in rows:
+            sheet.append([_cell(row.get(column)) for column in columns])
+            self.rows += 1
+
+    def close(self):
+        os.makedirs(os.path.dirname(self.output_file) or ".", exist_ok=True)
+        if not self._sheets:
+            self._workbook.create_sheet()
+        self._workbook.save(self.output_file)
+        count("files_written")
+        count("rows_written", self.rows)
+
+
+def export_plans_workbook(plans, summaries, output_file):
+    """
+    Stream every seating plan into one workbook with a sheet per date/slot.
+
+    Rows go through a SheetStream, so they are flushed as they are appended
+    instead of building hundreds of separate workbooks. Multi-room course
+    summaries follow on a last sheet.
+    """
+    try:
+        with SheetStream(output_file) as stream:
+            for folder, folder_plans in groupby(plans, key=lambda plan: plan["folder"]):
+                stream.append(folder, PLAN_COLUMNS, [plan["data"] for plan in folder_plans])
+            if summaries:
+                stream.append(
+                    "Multi-room courses",
+                    SUMMARY_COLUMNS,
+                    [summary["data"] for summary in summaries],
+                )
+        logging.info(f"Wrote {len(plans)} seating plans to {output_file}")
+
+    except Exception as e:
+        logging.error(f"Error exporting seating plan workbook: {str(e)}")
+        raise
+
+
+def export_plans_zip(plans, summaries, output_file):
+    """
+    Write every per-room seating plan and multi-room summary into one zip archive.
+
+    Entries keep the usual <date>/<slot>/<file>.xlsx layout, but are written
+    in a single pass into one file instead of hundreds of small files.
+    """
+    try:
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as archive:
+            for entry in plans + summaries:
+                archive.writestr(
+                    f"{entry['folder']}/{entry['file_name']}", render_plan_file(entry)
+                )
+        count("files_written")
+        count("rows_written", len(plans) + len(summaries))
+        logging.info(f"Wrote {len(plans)} seating plans to {output_file}")
+
+    except Exception as e:
+        logging.error(f"Error exporting seating plan archive: {str(e)}")
+        raise
+
+
+def _cell(value):
+    """Convert NumPy scalars to plain Python values openpyxl can write."""
+    return value.item() if hasattr(value, "item") else value
@@ -0,0 +1,219 @@
+import html
+import json
+import logging
+import os
+from itertools import islice
+
+from .instrumentation import count
+
+# Table rows per data page; the HTML shows the first page and loads the rest on demand
+PAGE_SIZE = 500
+
+SCHEDULE_COLUMNS = ["date", "slot", "courses", "rooms", "students"]
+CONFLICT_COLUMNS = ["roll_number", "date", "slot", "course1", "course2"]
+ALLOCATION_COLUMNS = ["date", "slot", "course_id", "room_id", "enrollment"]
+
+COLUMN_LABELS = {
+    "roll_number": "Student",
+    "course1": "Course 1",
+    "course2": "Course 2",
+    "course_id": "Course",
+    "room_id": "Room",
+    "enrollment": "Students",
+}
+
+STYLE = """
+    body { font-family: Arial, sans-serif; margin: 20px; }
+    h1, h2, h3 { color: #2c3e50; }
+    table { border-collapse: collapse; width: 100%; margin-bottom: 20px; }
+    th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+    th { background-color: #f2f2f2; }
+    tr:nth-child(even) { background-color: #f9f9f9; }
+    .summary-box { background-color: #f8f9fa; border: 1px solid #e9ecef; padding: 15px; margin-bottom: 20px; border-radius: 5px; }
+    .conflict { color: red; }
+    .pager { margin-bottom: 20px; }
+"""
+
+# Pages are small scripts rather than .json files, so they also load from file://
+PAGER_SCRIPT = """
+<script>
+var reportTables = {};
+function reportPage(table, page, rows) {
+  var body = document.getElementById(table + "-rows");
+  body.innerHTML = "";
+  rows.forEach(function (row) {
+    var tr = document.createElement("tr");
+    row.forEach(function (value) {
+      var td = document.createElement("td");
+      td.textContent = value === null ? "" : value;
+      tr.appendChild(td);
+    });
+    body.appendChild(tr);
+  });
+  reportTables[table].page = page;
+  document.getElementById(table + "-page").textContent =
+    "Page " + (page + 1) + " of " + reportTables[table].pages;
+}
+function showPage(table, step) {
+  var info = reportTables[table];
+  var page = info.page + step;
+  if (page < 0 || page >= info.pages) return;
+  var script = document.createElement("script");
+  script.src = info.dir + "/" + table + "_" + String(page).padStart(5, "0") + ".js";
+  document.body.appendChild(script);
+}
+</script>
+"""
+
+
+def write_html_report(
+    output_file,
+    metadata,
+    schedule_rows,
+    conflict_rows,
+    allocation_rows,
+    page_size=PAGE_SIZE,
+):
+    """
+    Stream the HTML run summary and its paginated data files.
+
+    The page is written to the file in chunks as it is generated, and every
+    row of the conflict and allocation tables is written to page files under
+    <output_file stem>_data/ (e.g. summary_data/conflicts_00000.js), each a
+    JSON array of at most page_size rows. The HTML shows the first page of
+    each table and loads the others on demand, so nothing is truncated and
+    memory use does not grow with the number of rows.
+
+    Parameters:
+    - output_file: HTML file to write
+    - metadata: Run metadata dict (timestamp, buffer, density, counts, time)
+    - schedule_rows: Iterable of SCHEDULE_COLUMNS dicts, one per date/slot
+    - conflict_rows: Iterable of conflict dicts with the CONFLICT_COLUMNS
+    - allocation_rows: Iterable of allocation dicts with the ALLOCATION_COLUMNS
+
+    Returns:
+    - dict mapping table name to its number of rows
+    """
+    data_name = f"{os.path.splitext(os.path.basename(output_file))[0]}_data"
+    data_dir = os.path.join(os.path.dirname(output_file), data_name)
+    os.makedirs(data_dir, exist_ok=True)
+
+    tables = {}
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.writelines(_header(metadata))
+        f.writelines(_static_table("Schedule Overview", SCHEDULE_COLUMNS, schedule_rows))
+        for name, title, columns, rows in (
+            ("conflicts", "Conflicts Detected", CONFLICT_COLUMNS, conflict_rows),
+            ("allocations", "Room Allocations", ALLOCATION_COLUMNS, allocation_rows),
+        ):
+            pages = _write_pages(data_dir, name, columns, rows, page_size)
+            tables[name] = pages["rows"]
+            if pages["rows"] or name != "conflicts":
+                f.writelines(_paged_table(name, title, columns, pages, data_name))
+        f.write("</body>\n</html>\n")
+
+    with open(os.path.join(data_dir, "index.json"), "w") as f:
+        json.dump({"page_size": page_size, "rows": tables}, f)
+    count("files_written")
+    logging.info(f"Wrote HTML summary to {output_file} with {tables} rows")
+    return tables
+
+
+def _header(metadata):
+    conflict_class = "conflict" if metadata["num_conflicts"] > 0 else ""
+    yield "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+    yield "<title>Seating Arrangement Summary</title>\n"
+    yield f"<style>{STYLE}</style>\n{PAGER_SCRIPT}</head>\n<body>\n"
+    yield "<h1>Seating Arrangement Summary</h1>\n"
+    yield "<div class=\"summary-box\">\n<h2>Run Information</h2>\n"
+    for label, value in (
+        ("Timestamp", metadata["timestamp"]),
+        ("Buffer", f"{metadata['buffer']} seats"),
+        ("Density", str(metadata["density"]).capitalize()),
+        ("Courses", metadata["num_courses"]),
+        ("Classrooms", metadata["num_classrooms"]),
+        ("Allocations", metadata["num_allocations"]),
+    ):
+        yield f"<p><strong>{label}:</strong> {_escape(value)}</p>\n"
+    yield (
+        f"<p><strong>Conflicts:</strong> <span class=\"{conflict_class}\">"
+        f"{metadata['num_conflicts']}</span></p>\n"
+    )
+    yield (
+        f"<p><strong>Execution Time:</strong> "
+        f"{metadata['execution_time_seconds']:.2f} seconds</p>\n</div>\n"
+    )
+
+
+def _static_table(title, columns, rows):
+    yield f"<h2>{title}</h2>\n<table>\n"
+    yield _header_row(columns)
+    for row in rows:
+        yield _row(row[column] for column in columns)
+    yield "</table>\n"
+
+
+def _paged_table(name, title, columns, pages, data_name):
+    heading_class = " class=\"conflict\"" if name == "conflicts" else ""
+    yield f"<h2{heading_class}>{title}</h2>\n"
+    yield f"<p>{pages['rows']} rows.</p>\n<table>\n"
+    yield _header_row(columns)
+    yield f"<tbody id=\"{name}-rows\">\n"
+    for row in pages["first"]:
+        yield _row(row)
+    yield "</tbody>\n</table>\n"
+    if pages["pages"] > 1:
+        yield (
+            f"<script>reportTables[{json.dumps(name)}] = "
+            f"{{page: 0, pages: {pages['pages']}, dir: {json.dumps(data_name)}}};</script>\n"
+            f"<div class=\"pager\">"
+            f"<button onclick=\"showPage('{name}', -1)\">Previous</button> "
+            f"<span id=\"{name}-page\">Page 1 of {pages['pages']}</span> "
+            f"<button onclick=\"showPage('{name}', 1)\">Next</button></div>\n"
+        )
+
+
+def _write_pages(data_dir, name, columns, rows, page_size):
+    """Write rows to page files of page_size rows; keep only the first page in memory."""
+    rows = iter(rows)
+    first = []
+    total = 0
+    page = 0
+    while True:
+        chunk = [
+            [_plain(row.get(column)) for column in columns]
+            for row in islice(rows, page_size)
+        ]
+        if not chunk and page:
+            break
+        with open(os.path.join(data_dir, f"{name}_{page:05d}.js"), "w") as f:
+            f.write(f"reportPage({json.dumps(name)}, {page}, ")
+            json.dump(chunk, f, separators=(",", ":"))
+            f.write(");\n")
+        if page == 0:
+            first = chunk
+        total += len(chunk)
+        page += 1
+        if len(chunk) < page_size:
+            break
+    return {"rows": total, "pages": page, "first": first}
+
+
+def _header_row(columns):
+    cells = "".join(
+        f"<th>{_escape(COLUMN_LABELS.get(column, column.title()))}</th>" for column in columns
+    )
+    return f"<tr>{cells}</tr>\n"
+
+
+def _row(values):
+    return "<tr>" + "".join(f"<td>{_escape(value)}</td>" for value in values) + "</tr>\n"
+
+
+def _escape(value):
+    return html.escape("" if value is None else str(value))
+
+
+def _plain(value):
+    """Convert NumPy scalars to plain Python values json can write."""
+    return value.item() if hasattr(value, "item") else value
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import count
+
+# Bump when the cached result layout or the allocation rules change
+RESULT_CACHE_VERSION = 1
+
+
+def result_key(courses, classrooms_df, roll_table, params):
+    """
+    Return the SHA-256 of an allocation's inputs and parameters.
+
+    Hashes each course's id, date, slot, enrollment and student ids, the roll
+    numbers those ids stand for, every classroom column (as text, so a room
+    id read as 6101 or "6101" hashes alike), and `params` (buffer, density,
+    strategy and anything else that changes the result).
+    """
+    digest = hashlib.sha256()
+    digest.update(
+        json.dumps(
+            {"version": RESULT_CACHE_VERSION, **params}, sort_keys=True, default=str
+        ).encode()
+    )
+
+    for course_id, date, slot, enrollment, ids in zip(
+        courses["course_id"],
+        courses["date"],
+        courses["slot"],
+        courses["enrollment"],
+        courses["student_ids"],
+    ):
+        digest.update(f"{course_id}\x1f{date}\x1f{slot}\x1f{enrollment}\x1f".encode())
+        digest.update(np.asarray(ids, dtype=np.int64).tobytes())
+        digest.update(b"\x1e")
+    digest.update("\n".join(roll_table.rolls).encode())
+
+    rooms = classrooms_df.astype(str)
+    digest.update("\x1f".join(rooms.columns).encode())
+    digest.update(pd.util.hash_pandas_object(rooms, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of allocation results, evicting least recently used entries.
+
+    Each entry is one pickle file named by its result_key, holding whatever
+    dict was stored (the allocation with compact 'student_ids' arrays, seats
+    left and conflicts). A hit refreshes the file's modification time, and
+    after every store the oldest entries are removed until the cache fits in
+    max_bytes.
+
+    Parameters:
+    - cache_dir: Directory holding the entries
+    - max_bytes: Total size the entries may take
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key):
+        """Return the stored result for key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            count("result_cache_misses")
+            return None
+        except Exception as e:
+            logging.warning(f"Discarding unreadable cached result {path}: {str(e)}")
+            self._remove(path)
+            count("result_cache_misses")
+            return None
+
+        # Reading an entry makes it the most recently used
+        os.utime(path)
+        count("result_cache_hits")
+        logging.info(f"Result cache hit {key[:12]}")
+        return result
+
+    def put(self, key, result):
+        """Store result under key, then evict entries beyond max_bytes."""
+        path = self._path(key)
+        tmp_file = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_file, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, path)
+        logging.info(
+            f"Cached result {key[:12]} ({os.path.getsize(path) / 1024:.0f} KB)"
+        )
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime_ns, stat.st_size, name))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(os.path.join(self.cache_dir, name))
+            total -= size
+            count("result_cache_evictions")
+            logging.info(f"Evicted cached result {name[:12]}")
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def record_export(stamp_file, key, export_mode, output_dir, paths):
+    """
+    Remember which result the files at `paths` (relative to output_dir) hold.
+
+    Each file's size and modification time are stored, so export_is_current
+    notices files that were deleted or rewritten by a later run.
+    """
+    files = {}
+    for path in paths:
+        stat = os.stat(os.path.join(output_dir, path))
+        files[path] = [stat.st_size, stat.st_mtime_ns]
+    os.makedirs(os.path.dirname(stamp_file) or ".", exist_ok=True)
+    tmp_file = f"{stamp_file}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(
+            {
+                "key": key,
+                "export_mode": export_mode,
+                "output_dir": output_dir,
+                "files": files,
+            },
+            f,
+        )
+    os.replace(tmp_file, stamp_file)
+
+
+def export_is_current(stamp_file, key, export_mode, output_dir):
+    """Return True if output_dir still holds the files exported for key in export_mode."""
+    try:
+        with open(stamp_file) as f:
+            stamp = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return False
+    if (stamp.get("key"), stamp.get("export_mode"), stamp.get("output_dir")) != (
+        key,
+        export_mode,
+        output_dir,
+    ):
+        return False
+
+    for path, (size, mtime_ns) in stamp["files"].items():
+        try:
+            stat = os.stat(os.path.join(output_dir, path))
+        except FileNotFoundError:
+            return False
+        if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+            return False
+    return True
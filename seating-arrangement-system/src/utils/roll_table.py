@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+
+class RollTable:
+    """
+    Interned table of student roll numbers.
+
+    Every roll number is stored once and referred to everywhere else by its
+    integer id, so a course's students travel as a compact int32 array
+    instead of a ';'-joined string. Strings are only rebuilt at the output
+    boundary through decode()/join().
+    """
+
+    def __init__(self, rolls=()):
+        self.rolls = []
+        self._ids = {}
+        self._lookup = None
+        for roll in rolls:
+            self.intern(roll)
+
+    def __len__(self):
+        return len(self.rolls)
+
+    def intern(self, roll):
+        """Return the id of `roll`, adding it to the table if it is new."""
+        roll_id = self._ids.get(roll)
+        if roll_id is None:
+            roll_id = len(self.rolls)
+            self._ids[roll] = roll_id
+            self.rolls.append(roll)
+            self._lookup = None
+        return roll_id
+
+    def id_of(self, roll):
+        """Return the id of `roll`, or None if it has never been interned."""
+        return self._ids.get(str(roll).strip())
+
+    def encode(self, rolls):
+        """Encode an iterable of roll numbers as an int32 array, skipping blanks."""
+        ids = [
+            self.intern(roll)
+            for roll in (str(roll).strip() for roll in rolls)
+            if roll and roll != "nan"
+        ]
+        return np.array(ids, dtype=np.int32)
+
+    def encode_joined(self, roll_numbers):
+        """Encode a ';'-joined roll number string (NaN or non-strings give an empty array)."""
+        if pd.isna(roll_numbers) or not isinstance(roll_numbers, str):
+            return np.empty(0, dtype=np.int32)
+        return self.encode(roll_numbers.split(";"))
+
+    def decode(self, ids):
+        """Return the roll number strings for an array of ids."""
+        if self._lookup is None:
+            self._lookup = np.array(self.rolls, dtype=object)
+        return self._lookup[np.asarray(ids, dtype=np.int64)].tolist()
+
+    def join(self, ids, sep=";"):
+        """Return the ';'-joined roll number string for an array of ids."""
+        return sep.join(self.decode(ids))
+
+
+def encode_course_rolls(courses_df, roll_table=None):
+    """
+    Replace the 'roll_numbers' column of a courses DataFrame with 'student_ids' arrays.
+
+    Args:
+        courses_df (DataFrame): Courses with a ';'-joined 'roll_numbers' column
+        roll_table (RollTable): Table to intern into; a new one is created if omitted
+
+    Returns:
+        tuple: (DataFrame with a 'student_ids' column, RollTable)
+    """
+    if roll_table is None:
+        roll_table = RollTable()
+    courses = courses_df.copy()
+    if "student_ids" not in courses.columns:
+        roll_numbers = (
+            courses["roll_numbers"]
+            if "roll_numbers" in courses.columns
+            else pd.Series([""] * len(courses), index=courses.index)
+        )
+        courses["student_ids"] = [roll_table.encode_joined(r) for r in roll_numbers]
+    return courses.drop(columns=["roll_numbers"], errors="ignore"), roll_table
+
+
+def materialize_roll_numbers(df, roll_table):
+    """Return a copy of `df` with 'student_ids' turned back into ';'-joined 'roll_numbers'."""
+    if "student_ids" not in df.columns:
+        return df
+    result = df.copy()
+    result["roll_numbers"] = [roll_table.join(ids) for ids in result["student_ids"]]
+    return result.drop(columns=["student_ids"])
@@ -0,0 +1,305 @@
+import json
+import logging
+import os
+import sqlite3
+
+# pandas, numpy and the allocator are imported by the functions that need them,
+# so seat lookups (find_student) stay import-light
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    buffer INTEGER,
+    density TEXT,
+    strategy TEXT,
+    num_courses INTEGER,
+    num_classrooms INTEGER,
+    num_allocations INTEGER,
+    num_conflicts INTEGER,
+    execution_time_seconds REAL,
+    metadata TEXT
+);
+CREATE TABLE IF NOT EXISTS allocations (
+    run_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    room_id TEXT NOT NULL,
+    capacity INTEGER,
+    enrollment INTEGER
+);
+CREATE TABLE IF NOT EXISTS seats (
+    run_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    room_id TEXT NOT NULL,
+    roll_number TEXT NOT NULL,
+    seat TEXT
+);
+CREATE TABLE IF NOT EXISTS seats_left (
+    run_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    room_id TEXT NOT NULL,
+    seats_left INTEGER
+);
+CREATE TABLE IF NOT EXISTS conflicts (
+    run_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    roll_number TEXT NOT NULL,
+    course1 TEXT,
+    course2 TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_allocations_slot ON allocations (run_id, date, slot);
+CREATE INDEX IF NOT EXISTS idx_allocations_course ON allocations (course_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_allocations_room ON allocations (room_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_seats_roll ON seats (roll_number, run_id, date);
+CREATE INDEX IF NOT EXISTS idx_seats_slot ON seats (run_id, date, slot);
+CREATE INDEX IF NOT EXISTS idx_seats_left_slot ON seats_left (run_id, date, slot);
+CREATE INDEX IF NOT EXISTS idx_conflicts_slot ON conflicts (run_id, date, slot);
+CREATE INDEX IF NOT EXISTS idx_conflicts_roll ON conflicts (roll_number, run_id);
+"""
+
+RUN_TABLES = ["allocations", "seats", "seats_left", "conflicts"]
+RUN_COLUMNS = [
+    "buffer",
+    "density",
+    "strategy",
+    "num_courses",
+    "num_classrooms",
+    "num_allocations",
+    "num_conflicts",
+    "execution_time_seconds",
+]
+
+
+def connect(db_path):
+    """Open the run store at db_path, creating its tables and indexes if needed."""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    connection = sqlite3.connect(db_path)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def save_run(
+    db_path,
+    run_id,
+    metadata,
+    allocation_df,
+    roll_table,
+    conflicts,
+    seats_left,
+    seat_map=None,
+):
+    """
+    Store one run's allocations, per-student seats, seats left, conflicts and metadata.
+
+    Everything is written with executemany in a single transaction, so a run
+    is either stored completely or not at all. Saving a run_id again replaces it.
+
+    Parameters:
+    - db_path: SQLite database file
+    - run_id: Identifier of the run, e.g. its timestamp
+    - metadata: The run metadata dict written to metadata.xlsx
+    - allocation_df: Allocations with 'student_ids' encoded with roll_table
+    - roll_table: RollTable used to decode the student ids
+    - conflicts: Conflict dicts from check_conflicts
+    - seats_left: DataFrame with 'date', 'slot', 'room_id', 'seats_left'
+    - seat_map: Optional seat map from build_seat_maps, to store seat labels
+    """
+    try:
+        connection = connect(db_path)
+        try:
+            with connection:
+                for table in ["runs"] + RUN_TABLES:
+                    connection.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+                connection.execute(
+                    f"INSERT INTO runs (run_id, {', '.join(RUN_COLUMNS)}, metadata) "
+                    f"VALUES ({', '.join('?' * (len(RUN_COLUMNS) + 2))})",
+                    [run_id]
+                    + [_plain(metadata.get(column)) for column in RUN_COLUMNS]
+                    + [json.dumps(metadata, default=str)],
+                )
+                _insert(
+                    connection,
+                    "allocations",
+                    run_id,
+                    allocation_df,
+                    ["date", "slot", "course_id", "room_id", "capacity", "enrollment"],
+                )
+                _insert(
+                    connection,
+                    "seats",
+                    run_id,
+                    _seat_rows(allocation_df, roll_table, seat_map),
+                    ["date", "slot", "course_id", "room_id", "roll_number", "seat"],
+                )
+                _insert(
+                    connection,
+                    "seats_left",
+                    run_id,
+                    seats_left,
+                    ["date", "slot", "room_id", "seats_left"],
+                )
+                import pandas as pd
+
+                _insert(
+                    connection,
+                    "conflicts",
+                    run_id,
+                    pd.DataFrame(
+                        conflicts,
+                        columns=["date", "slot", "roll_number", "course1", "course2"],
+                    ),
+                    ["date", "slot", "roll_number", "course1", "course2"],
+                )
+        finally:
+            connection.close()
+        logging.info(f"Stored run {run_id} in {db_path}")
+
+    except Exception as e:
+        logging.error(f"Error saving run to the run store: {str(e)}")
+        raise
+
+
+def _insert(connection, table, run_id, df, columns):
+    """Bulk insert df[columns] into table, prefixed with run_id."""
+    if len(df) == 0:
+        return
+    values = [df[column].tolist() for column in columns]
+    # Room ids may be numbers in one input and text in another
+    for position, column in enumerate(columns):
+        if column.endswith("_id") or column == "roll_number":
+            values[position] = [str(value) for value in values[position]]
+    connection.executemany(
+        f"INSERT INTO {table} (run_id, {', '.join(columns)}) "
+        f"VALUES (?, {', '.join('?' * len(columns))})",
+        ((run_id, *row) for row in zip(*values)),
+    )
+
+
+def _seat_rows(allocation_df, roll_table, seat_map):
+    """One row per seated student, with the seat label when a seat map exists."""
+    if seat_map is not None:
+        return seat_map
+    import numpy as np
+
+    counts = [len(ids) for ids in allocation_df["student_ids"]]
+    rows = np.repeat(np.arange(len(allocation_df)), counts)
+    students = (
+        np.concatenate(allocation_df["student_ids"].tolist())
+        if sum(counts)
+        else np.empty(0, dtype=np.int64)
+    )
+    seats = allocation_df[["date", "slot", "course_id", "room_id"]].iloc[rows]
+    seats = seats.reset_index(drop=True)
+    seats["roll_number"] = roll_table.decode(students)
+    seats["seat"] = None
+    return seats
+
+
+def _plain(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+def seats_left_table(
+    allocation_df, classrooms_df, buffer, density, slots, density_ratios=None
+):
+    """
+    Return seats left per room for every (date, slot) in `slots`.
+
+    Matches op_seats_left.xlsx: every room starts at its effective capacity
+    in every slot, minus the students allocated to it.
+    """
+    import pandas as pd
+
+    from .classroom_allocator import calculate_effective_capacity
+
+    capacity = calculate_effective_capacity(
+        classrooms_df, buffer, density, density_ratios
+    )
+    used = allocation_df.groupby(["date", "slot", "room_id"])["enrollment"].sum()
+    rows = [
+        {
+            "date": date,
+            "slot": slot,
+            "room_id": room_id,
+            "seats_left": seats - int(used.get((date, slot, room_id), 0)),
+        }
+        for date, slot in slots
+        for room_id, seats in capacity.items()
+    ]
+    return pd.DataFrame(rows, columns=["date", "slot", "room_id", "seats_left"])
+
+
+def latest_run_id(db_path):
+    """Return the most recent run_id in the store, or None."""
+    connection = connect(db_path)
+    try:
+        row = connection.execute("SELECT MAX(run_id) FROM runs").fetchone()
+        return row[0]
+    finally:
+        connection.close()
+
+
+def find_student(db_path, roll_number, date=None, run_id=None):
+    """
+    Return where a student sits: a list of dicts with date, slot, course_id,
+    room_id and seat, for one date or all dates, in run_id or the latest run.
+    """
+    run_id = run_id or latest_run_id(db_path)
+    query = (
+        "SELECT date, slot, course_id, room_id, seat FROM seats "
+        "WHERE roll_number = ? AND run_id = ?"
+    )
+    params = [str(roll_number), run_id]
+    if date is not None:
+        query += " AND date = ?"
+        params.append(date)
+    query += " ORDER BY date, slot"
+
+    connection = connect(db_path)
+    try:
+        return [dict(row) for row in connection.execute(query, params)]
+    finally:
+        connection.close()
+
+
+def compare_runs(db_path, run_a, run_b):
+    """
+    Return a DataFrame of students whose room differs between two runs.
+
+    Columns: roll_number, date, slot, course_id, room_a, room_b; a missing
+    room means the student was not seated in that run.
+    """
+    import pandas as pd
+
+    query = """
+        SELECT a.roll_number, a.date, a.slot, a.course_id,
+               a.room_id AS room_a, b.room_id AS room_b
+        FROM seats a
+        LEFT JOIN seats b
+          ON b.run_id = ? AND b.roll_number = a.roll_number
+         AND b.date = a.date AND b.slot = a.slot AND b.course_id = a.course_id
+        WHERE a.run_id = ? AND (b.room_id IS NULL OR b.room_id != a.room_id)
+        UNION ALL
+        SELECT b.roll_number, b.date, b.slot, b.course_id, NULL, b.room_id
+        FROM seats b
+        WHERE b.run_id = ? AND NOT EXISTS (
+            SELECT 1 FROM seats a
+            WHERE a.run_id = ? AND a.roll_number = b.roll_number
+              AND a.date = b.date AND a.slot = b.slot AND a.course_id = b.course_id
+        )
+        ORDER BY 2, 3, 1
+    """
+    connection = connect(db_path)
+    try:
+        return pd.read_sql_query(
+            query, connection, params=(run_b, run_a, run_b, run_a)
+        )
+    finally:
+        connection.close()
@@ -0,0 +1,244 @@
+import logging
+import math
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import count
+
+# Seats per row when a room's layout is not known
+DEFAULT_SEAT_COLUMNS = 6
+
+SEAT_MAP_COLUMNS = [
+    "date",
+    "slot",
+    "room_id",
+    "seat",
+    "row",
+    "column",
+    "sub_block",
+    "course_id",
+    "roll_number",
+]
+
+
+def parse_sub_blocks(value):
+    """Parse a 'sub_blocks' cell such as "6;6;5" into [6, 6, 5]; blanks give []."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return []
+    return [int(float(part)) for part in str(value).split(";") if part.strip()]
+
+
+class RoomGeometry:
+    """
+    Seat grid of one room: `capacity` seats in rows of `columns`.
+
+    Columns are split evenly into sub-blocks. In sparse mode seats are used
+    in a checkerboard, and when the room lists sparse sub-block sizes (the
+    sub1/sub 2/... columns of the room capacity sheet) at most that many
+    seats are used in each sub-block.
+
+    Parameters:
+    - capacity: Number of seats in the room
+    - columns: Seats per row
+    - sub_blocks: Optional list of sparse seat counts per sub-block
+    """
+
+    def __init__(self, capacity, columns=DEFAULT_SEAT_COLUMNS, sub_blocks=None):
+        self.capacity = max(int(capacity), 0)
+        self.columns = max(min(int(columns), self.capacity), 1)
+        self.rows = math.ceil(self.capacity / self.columns)
+        self.sub_blocks = list(sub_blocks or [])
+
+        seats = np.arange(self.capacity)
+        self.row = seats // self.columns
+        self.column = seats % self.columns
+        self.block = self.column * max(len(self.sub_blocks), 1) // self.columns
+        self._orders = {}
+
+    def seat_order(self, density):
+        """
+        Return (seat indexes in fill order, number of usable seats).
+
+        Rows are filled alternately left-to-right and right-to-left, so the
+        interleaved course sequence also alternates from one row to the next.
+        Usable seats come first; the rest follow for overfull rooms. The
+        "sparse", "checkerboard" and "sub_blocks" policies use the
+        checkerboard; all but "checkerboard" also keep to the sub-block sizes.
+        """
+        if density in self._orders:
+            return self._orders[density]
+
+        snake_column = np.where(
+            self.row % 2 == 1, self.columns - 1 - self.column, self.column
+        )
+        order = np.lexsort((snake_column, self.row))
+
+        usable = np.ones(self.capacity, dtype=bool)
+        if density in ("sparse", "checkerboard", "sub_blocks"):
+            usable = (self.row + self.column) % 2 == 0
+            if self.sub_blocks and density != "checkerboard":
+                usable &= self._within_sub_block_limits(order, usable)
+
+        ordered_usable = usable[order]
+        result = (
+            np.concatenate([order[ordered_usable], order[~ordered_usable]]),
+            int(ordered_usable.sum()),
+        )
+        self._orders[density] = result
+        return result
+
+    def _within_sub_block_limits(self, order, usable):
+        """Mask keeping only the first sub_blocks[b] usable seats of each sub-block b."""
+        candidates = order[usable[order]]
+        blocks = self.block[candidates]
+        by_block = np.argsort(blocks, kind="stable")
+        sorted_blocks = blocks[by_block]
+        rank = np.empty(len(candidates), dtype=np.int64)
+        rank[by_block] = np.arange(len(candidates)) - np.searchsorted(
+            sorted_blocks, sorted_blocks
+        )
+        limits = np.array(self.sub_blocks)[
+            np.minimum(blocks, len(self.sub_blocks) - 1)
+        ]
+        keep = np.zeros(self.capacity, dtype=bool)
+        keep[candidates[rank < limits]] = True
+        return keep
+
+
+def interleave(counts):
+    """
+    Return the group index of every position when groups are spread evenly.
+
+    Each group's members are placed at fractional positions (rank + 0.5) /
+    size, so courses alternate and a large course is spread across the
+    whole sequence rather than bunched at the end.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    labels = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    rank = np.arange(len(labels)) - np.repeat(starts, counts)
+    position = (rank + 0.5) / np.repeat(np.maximum(counts, 1), counts)
+    return labels[np.lexsort((labels, position))]
+
+
+def assign_room_seats(student_groups, geometry, density):
+    """
+    Assign every student in one room and slot to a seat.
+
+    Args:
+        student_groups (list): One student id array per course in the room
+        geometry (RoomGeometry): The room's seat grid
+        density (str): Seating policy, e.g. 'sparse' or 'dense'
+
+    Returns:
+        tuple: (seat index, course position in student_groups, student id)
+               arrays, one entry per student
+    """
+    counts = [len(students) for students in student_groups]
+    total = sum(counts)
+    order, usable = geometry.seat_order(density)
+    if total > len(order):
+        raise ValueError(
+            f"{total} students do not fit in a room of {geometry.capacity} seats"
+        )
+    if total > usable:
+        logging.warning(
+            f"{total} students exceed the {usable} usable {density} seats; "
+            "filling the remaining seats"
+        )
+        usable = total
+
+    # Empty seats are spread between students as one more group
+    groups = interleave(counts + [usable - total])
+    filled = np.flatnonzero(groups < len(counts))
+    courses = groups[filled]
+
+    # Students of each course take that course's positions in order
+    students = np.empty(total, dtype=np.int64)
+    for position, group in enumerate(student_groups):
+        students[courses == position] = group
+    return order[filled], courses, students
+
+
+def build_seat_maps(
+    allocation_df, classrooms_df, density, roll_table, columns=DEFAULT_SEAT_COLUMNS
+):
+    """
+    Build the seat-level map of every room in every date and slot.
+
+    Courses sharing a room are interleaved so that neighbours in a row sit
+    different papers whenever the room holds more than one course.
+
+    Parameters:
+    - allocation_df: Allocations with 'student_ids' encoded with roll_table
+    - classrooms_df: Classrooms with 'room_id', 'capacity' and optionally
+      'sub_blocks' ("6;6;5" style sparse seat counts)
+    - density: Seating policy, e.g. 'sparse' or 'dense'
+    - roll_table: RollTable used to decode the student ids
+    - columns: Seats per row
+
+    Returns:
+    - DataFrame with the SEAT_MAP_COLUMNS, one row per seated student
+    """
+    try:
+        sub_blocks = (
+            classrooms_df["sub_blocks"]
+            if "sub_blocks" in classrooms_df.columns
+            else [None] * len(classrooms_df)
+        )
+        geometries = {
+            room_id: RoomGeometry(capacity, columns, parse_sub_blocks(blocks))
+            for room_id, capacity, blocks in zip(
+                classrooms_df["room_id"], classrooms_df["capacity"], sub_blocks
+            )
+        }
+
+        student_ids = allocation_df["student_ids"].to_numpy()
+        course_ids = allocation_df["course_id"].to_numpy()
+        groups = allocation_df.groupby(["date", "slot", "room_id"]).indices
+
+        # Collect plain arrays per room and build a single DataFrame at the end
+        keys, sizes, seat_rows, seat_columns, blocks, courses, students = (
+            [], [], [], [], [], [], []
+        )
+        for key, positions in groups.items():
+            geometry = geometries[key[2]]
+            seats, room_courses, room_students = assign_room_seats(
+                list(student_ids[positions]), geometry, density
+            )
+            ordered = np.lexsort((geometry.column[seats], geometry.row[seats]))
+            seats = seats[ordered]
+            keys.append(key)
+            sizes.append(len(seats))
+            seat_rows.append(geometry.row[seats] + 1)
+            seat_columns.append(geometry.column[seats] + 1)
+            blocks.append(geometry.block[seats] + 1)
+            courses.append(course_ids[positions][room_courses[ordered]])
+            students.append(room_students[ordered])
+        count("seats_assigned", sum(sizes))
+
+        if not keys:
+            return pd.DataFrame(columns=SEAT_MAP_COLUMNS)
+
+        group_of = np.repeat(np.arange(len(keys)), sizes)
+        row = np.concatenate(seat_rows)
+        column = np.concatenate(seat_columns)
+        return pd.DataFrame(
+            {
+                "date": np.array([key[0] for key in keys], dtype=object)[group_of],
+                "slot": np.array([key[1] for key in keys], dtype=object)[group_of],
+                "room_id": np.array([key[2] for key in keys], dtype=object)[group_of],
+                "seat": [f"R{r}-C{c}" for r, c in zip(row.tolist(), column.tolist())],
+                "row": row,
+                "column": column,
+                "sub_block": np.concatenate(blocks),
+                "course_id": np.concatenate(courses),
+                "roll_number": roll_table.decode(np.concatenate(students)),
+            },
+            columns=SEAT_MAP_COLUMNS,
+        )
+
+    except Exception as e:
+        logging.error(f"Error building seat maps: {str(e)}")
+        raise
@@ -0,0 +1,149 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .plan_exporter import write_rows_xlsx
+
+EXAM_FIELDS = ["date", "slot", "course_id", "room_id", "seat"]
+ADMIT_CARD_COLUMNS = ["roll_number", "name"] + EXAM_FIELDS
+
+
+class StudentSeatIndex:
+    """
+    In-memory roll number -> exam seats index, built once after allocation.
+
+    Lookups are a single dict access, so the index can answer thousands of
+    seat queries per second without touching the allocation table.
+
+    Args:
+        exams (dict): roll number -> list of (date, slot, course_id, room_id, seat)
+        names (dict): roll number -> student name
+    """
+
+    def __init__(self, exams, names=None):
+        self.exams = exams
+        self.names = names or {}
+
+    @classmethod
+    def from_allocations(cls, allocation_df, roll_table, seat_map=None, names=None):
+        """
+        Build the index from allocations, using the seat map for seat labels if given.
+
+        Args:
+            allocation_df (DataFrame): Allocations with 'student_ids' encoded with roll_table
+            roll_table (RollTable): Table used to decode the student ids
+            seat_map (DataFrame): Optional output of build_seat_maps
+            names (dict): Optional roll number -> name mapping
+        """
+        if seat_map is not None:
+            rolls = seat_map["roll_number"].to_numpy()
+            columns = [seat_map[field].to_numpy() for field in EXAM_FIELDS]
+        else:
+            counts = [len(ids) for ids in allocation_df["student_ids"]]
+            rows = np.repeat(np.arange(len(allocation_df)), counts)
+            ids = (
+                np.concatenate(allocation_df["student_ids"].tolist())
+                if sum(counts)
+                else np.empty(0, dtype=np.int64)
+            )
+            rolls = np.array(roll_table.decode(ids), dtype=object)
+            columns = [
+                allocation_df[field].to_numpy()[rows] for field in EXAM_FIELDS[:-1]
+            ] + [np.full(len(rows), None, dtype=object)]
+
+        # Group rows by roll number, keeping each student's exams in table order
+        order = np.argsort(rolls, kind="stable")
+        rolls = rolls[order]
+        records = list(zip(*(column[order].tolist() for column in columns)))
+        starts = np.flatnonzero(np.r_[True, rolls[1:] != rolls[:-1]]) if len(rolls) else []
+        ends = list(starts[1:]) + [len(rolls)]
+
+        exams = {
+            str(rolls[start]): records[start:end] for start, end in zip(starts, ends)
+        }
+        logging.info(f"Built seat index for {len(exams)} students")
+        return cls(exams, names)
+
+    def __len__(self):
+        return len(self.exams)
+
+    def __contains__(self, roll_number):
+        return str(roll_number).strip() in self.exams
+
+    def lookup(self, roll_number):
+        """Return the student's exams as dicts of EXAM_FIELDS; [] if not seated."""
+        records = self.exams.get(str(roll_number).strip(), [])
+        return [dict(zip(EXAM_FIELDS, record)) for record in records]
+
+    def name_of(self, roll_number):
+        return self.names.get(str(roll_number).strip(), "Unknown Name")
+
+    def admit_cards(self):
+        """Return one row per student exam, sorted by roll number, for admit cards."""
+        rows = [
+            (roll, self.name_of(roll)) + tuple(record)
+            for roll in sorted(self.exams)
+            for record in self.exams[roll]
+        ]
+        return pd.DataFrame(rows, columns=ADMIT_CARD_COLUMNS)
+
+    def export_admit_cards(self, output_file):
+        """Write every student's exams to a single admit-card workbook."""
+        try:
+            cards = self.admit_cards()
+            write_rows_xlsx(
+                output_file, ADMIT_CARD_COLUMNS, cards.to_dict("records"), "Admit cards"
+            )
+            logging.info(f"Wrote admit cards for {len(self)} students to {output_file}")
+        except Exception as e:
+            logging.error(f"Error exporting admit cards: {str(e)}")
+            raise
+
+
+def names_from_mapping(roll_name_df):
+    """Return a roll number -> name dict from the roll-name mapping DataFrame."""
+    return dict(
+        zip(
+            roll_name_df["Roll Number"].astype(str).str.strip(),
+            roll_name_df["Name"].fillna("Unknown Name"),
+        )
+    )
+
+
+def create_app(index):
+    """
+    Create the Flask app serving seat lookups from `index`.
+
+    GET /students/<roll_number> returns the student's name and exams, or 404.
+    GET /health returns the number of indexed students.
+    """
+    # Flask is only needed when the lookup service is actually started
+    from flask import Flask, jsonify
+
+    app = Flask(__name__)
+
+    @app.route("/students/<roll_number>")
+    def student(roll_number):
+        if roll_number not in index:
+            return jsonify({"error": f"No exams found for {roll_number}"}), 404
+        return jsonify(
+            {
+                "roll_number": roll_number,
+                "name": index.name_of(roll_number),
+                "exams": index.lookup(roll_number),
+            }
+        )
+
+    @app.route("/health")
+    def health():
+        return jsonify({"students": len(index)})
+
+    return app
+
+
+def serve(index, host="127.0.0.1", port=5000):
+    """Serve seat lookups over HTTP until interrupted."""
+    logging.info(f"Serving seat lookups for {len(index)} students on {host}:{port}")
+    print(f"Serving seat lookups on http://{host}:{port}/students/<roll_number>")
+    create_app(index).run(host=host, port=port, threaded=True)
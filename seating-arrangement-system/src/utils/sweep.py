@@ -0,0 +1,135 @@
+import itertools
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from .capacity_policy import get_capacity_policy
+from .classroom_allocator import allocate_slots
+
+SWEEP_COLUMNS = [
+    "buffer",
+    "density",
+    "allocated_courses",
+    "unallocated_courses",
+    "unseated_students",
+    "split_courses",
+    "room_slots_used",
+    "peak_rooms_used",
+    "seats_left",
+]
+
+# Inputs with at least this many enrollments sweep in worker processes. Each
+# scenario is a whole allocation, so process start-up pays off sooner than
+# for allocate_slots' single slots
+SWEEP_PROCESS_MIN_ENROLLMENT = 20000
+
+# Inputs shared by every scenario in a worker, set once by _init_worker
+_shared_inputs = None
+
+
+def run_sweep(
+    courses,
+    classrooms_df,
+    roll_table,
+    buffers,
+    densities,
+    workers=1,
+    strategy="greedy",
+    time_budget=None,
+    density_ratios=None,
+):
+    """
+    Allocate every (buffer, density) scenario and compare the results.
+
+    Inputs are loaded once by the caller and shared: worker processes
+    receive them once at start-up rather than with every scenario, and
+    worker threads use them directly. No seating plans are written.
+
+    Parameters:
+    - courses: DataFrame of courses with 'student_ids' encoded with roll_table
+    - classrooms_df: DataFrame of classrooms with 'room_id' and 'capacity'
+    - roll_table: RollTable the courses were encoded with
+    - buffers: Buffer sizes to try
+    - densities: Densities (seating policies) to try, e.g. 'sparse' and 'dense'
+    - workers: Number of scenarios to allocate concurrently
+    - strategy, time_budget, density_ratios: as for allocate_slots
+
+    Returns:
+    - DataFrame with one row per scenario and the SWEEP_COLUMNS
+    """
+    try:
+        for density in densities:
+            get_capacity_policy(density)
+        scenarios = list(itertools.product(buffers, densities))
+        tasks = [
+            (buffer, density, strategy, time_budget, density_ratios)
+            for buffer, density in scenarios
+        ]
+        inputs = (courses, classrooms_df, roll_table)
+        logging.info(f"Sweeping {len(scenarios)} buffer/density scenarios")
+
+        if workers > 1 and len(tasks) > 1:
+            total_enrollment = sum(len(ids) for ids in courses["student_ids"])
+            if total_enrollment >= SWEEP_PROCESS_MIN_ENROLLMENT:
+                with ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_worker, initargs=(inputs,)
+                ) as executor:
+                    rows = list(executor.map(_sweep_task, tasks))
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    rows = list(
+                        executor.map(lambda task: _run_scenario(inputs, *task), tasks)
+                    )
+        else:
+            rows = [_run_scenario(inputs, *task) for task in tasks]
+
+        return pd.DataFrame(rows, columns=SWEEP_COLUMNS)
+
+    except Exception as e:
+        logging.error(f"Error running buffer/density sweep: {str(e)}")
+        raise
+
+
+def _init_worker(inputs):
+    global _shared_inputs
+    _shared_inputs = inputs
+
+
+def _sweep_task(task):
+    return _run_scenario(_shared_inputs, *task)
+
+
+def _run_scenario(inputs, buffer, density, strategy, time_budget, density_ratios):
+    courses, classrooms_df, roll_table = inputs
+    allocation_df, seats_left, unallocated = allocate_slots(
+        courses,
+        classrooms_df,
+        buffer,
+        density,
+        roll_table,
+        1,
+        strategy,
+        time_budget,
+        density_ratios,
+    )
+    return summarize_scenario(buffer, density, allocation_df, seats_left, unallocated)
+
+
+def summarize_scenario(buffer, density, allocation_df, seats_left, unallocated):
+    """Reduce one scenario's allocation to a row of SWEEP_COLUMNS."""
+    rooms_per_course = allocation_df.groupby(["date", "slot", "course_id"])[
+        "room_id"
+    ].nunique()
+    rooms_per_slot = allocation_df.groupby(["date", "slot"])["room_id"].nunique()
+    return {
+        "buffer": buffer,
+        "density": density,
+        "allocated_courses": len(rooms_per_course),
+        "unallocated_courses": len(unallocated),
+        "unseated_students": int(sum(course["enrollment"] for course in unallocated)),
+        "split_courses": int((rooms_per_course > 1).sum()),
+        "room_slots_used": int(rooms_per_slot.sum()),
+        "peak_rooms_used": int(rooms_per_slot.max()) if len(rooms_per_slot) else 0,
+        "seats_left": int(sum(sum(rooms.values()) for rooms in seats_left.values())),
+    }
@@ -0,0 +1,56 @@
+import pandas as pd
+
+SCHEDULE_COLUMNS = ["date", "day", "slot", "course_id"]
+
+# Cells of a slot column that hold no courses
+NO_EXAM = ("NO EXAM", "nan", "")
+
+
+def exam_schedule(timetable_df):
+    """
+    Turn a timetable (one row per date) into one row per exam.
+
+    Every column other than Date and Day is a slot (Morning, Evening, or as
+    many others as the timetable has) holding a ";" or "," separated course
+    list, or "NO EXAM". The slot columns are melted and the course lists
+    exploded with pandas string operations instead of a loop over rows, and
+    exams keep the order of dates, then slots, then courses within a cell.
+    Unnamed columns (left by trailing commas) and rows without a date are
+    skipped.
+
+    Parameters:
+    - timetable_df: DataFrame with 'Date', 'Day' and one column per slot
+
+    Returns:
+    - DataFrame with the SCHEDULE_COLUMNS
+    """
+    timetable_df = timetable_df.rename(columns=lambda col: str(col).strip())
+    slots = [
+        col
+        for col in timetable_df.columns
+        if col not in ("Date", "Day") and not col.startswith("Unnamed:")
+    ]
+    timetable_df = timetable_df[timetable_df["Date"].notna()].reset_index(drop=True)
+
+    schedule = timetable_df.reset_index().rename(columns={"index": "row"}).melt(
+        id_vars=["row", "Date", "Day"],
+        value_vars=slots,
+        var_name="slot",
+        value_name="course_id",
+    )
+    # melt stacks slot by slot; restore date order, then slot column order
+    schedule["slot_position"] = schedule["slot"].map(
+        {slot: position for position, slot in enumerate(slots)}
+    )
+    schedule = schedule.sort_values(["row", "slot_position"], kind="stable")
+
+    cells = schedule["course_id"].astype(str).str.strip()
+    schedule = schedule.assign(
+        course_id=cells.str.split(r"[;,]", regex=True)
+    )[cells.notna() & ~cells.isin(NO_EXAM)].explode("course_id")
+    schedule["course_id"] = schedule["course_id"].str.strip()
+    schedule = schedule[schedule["course_id"] != ""]
+
+    return schedule.rename(columns={"Date": "date", "Day": "day"})[
+        SCHEDULE_COLUMNS
+    ].reset_index(drop=True)
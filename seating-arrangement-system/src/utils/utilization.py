@@ -0,0 +1,223 @@
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .capacity_ledger import building_of
+from .plan_exporter import write_rows_xlsx
+
+UTILIZATION_COLUMNS = [
+    "date",
+    "slot",
+    "rooms_used",
+    "partial_rooms",
+    "seats",
+    "seats_used",
+    "utilization",
+    "stranded_seats",
+    "pending_students",
+    "demand",
+]
+
+ROOM_COLUMNS = [
+    "room_id",
+    "building",
+    "seats",
+    "slots_used",
+    "seats_used",
+    "utilization",
+    "partial_slots",
+    "stranded_seats",
+]
+
+BUILDING_COLUMNS = ["building", "rooms", "seats", "seats_used", "utilization"]
+
+DATE_COLUMNS = ["date", "peak_demand", "supply", "peak_utilization", "shortfall"]
+
+
+def analyze_utilization(allocation_df, courses, effective_capacity, room_buildings=None):
+    """
+    Compute room utilization and fragmentation from an allocation.
+
+    Every room is counted in every (date, slot), with its effective capacity
+    as the seats on offer. A room is partially filled when some but not all
+    of its seats are used. Free seats are stranded when their room has fewer
+    free seats than the smallest course left pending in that slot (the
+    smallest course of the slot when nothing is pending), so no whole course
+    could use them.
+
+    Parameters:
+    - allocation_df: Allocations with 'date', 'slot', 'course_id', 'room_id'
+      and 'enrollment'
+    - courses: Scheduled courses with 'date', 'slot', 'course_id' and 'enrollment'
+    - effective_capacity: dict mapping room_id to usable seats
+    - room_buildings: Optional dict mapping room_id to building; other rooms
+      fall back to building_of(room_id)
+
+    Returns:
+    - dict of DataFrames: "slots" (UTILIZATION_COLUMNS), "rooms"
+      (ROOM_COLUMNS), "buildings" (BUILDING_COLUMNS) and "dates" (peak
+      demand against supply per date, DATE_COLUMNS)
+    """
+    room_buildings = room_buildings or {}
+    rooms = pd.Index(list(effective_capacity), name="room_id")
+    seats = np.fromiter(effective_capacity.values(), dtype=np.int64, count=len(rooms))
+    slots = pd.MultiIndex.from_frame(
+        courses[["date", "slot"]].drop_duplicates().sort_values(["date", "slot"])
+    )
+
+    # One row per (date, slot, room): seats used out of the seats on offer
+    used = (
+        allocation_df.groupby(["date", "slot", "room_id"])["enrollment"]
+        .sum()
+        .reindex(_slot_room_index(slots, rooms), fill_value=0)
+        .to_numpy(dtype=np.int64)
+        .reshape(len(slots), len(rooms))
+    )
+    free = np.maximum(seats - used, 0)
+
+    # Students of each scheduled course that were not seated
+    scheduled = courses.groupby(["date", "slot", "course_id"])["enrollment"].sum()
+    seated = allocation_df.groupby(["date", "slot", "course_id"])["enrollment"].sum()
+    pending = (scheduled - seated.reindex(scheduled.index, fill_value=0)).clip(lower=0)
+    pending_courses = pending[pending > 0]
+
+    # Smallest course that free seats would have to hold, per slot
+    smallest = (
+        pending_courses.groupby(level=[0, 1]).min()
+        .combine_first(scheduled[scheduled > 0].groupby(level=[0, 1]).min())
+        .reindex(slots, fill_value=0)
+        .to_numpy(dtype=np.int64)
+    )
+    stranded = np.where((free > 0) & (free < smallest[:, None]), free, 0)
+    partial = (used > 0) & (free > 0)
+
+    slot_seats = int(seats.sum())
+    slot_used = used.sum(axis=1)
+    slot_pending = pending.groupby(level=[0, 1]).sum().reindex(slots, fill_value=0)
+    slot_table = pd.DataFrame(
+        {
+            "date": slots.get_level_values(0),
+            "slot": slots.get_level_values(1),
+            "rooms_used": (used > 0).sum(axis=1),
+            "partial_rooms": partial.sum(axis=1),
+            "seats": slot_seats,
+            "seats_used": slot_used,
+            "utilization": _ratio(slot_used, slot_seats),
+            "stranded_seats": stranded.sum(axis=1),
+            "pending_students": slot_pending.to_numpy(dtype=np.int64),
+            "demand": slot_used + slot_pending.to_numpy(dtype=np.int64),
+        },
+        columns=UTILIZATION_COLUMNS,
+    )
+
+    buildings = np.array(
+        [room_buildings.get(room_id) or building_of(room_id) for room_id in rooms],
+        dtype=object,
+    )
+    room_used = used.sum(axis=0)
+    room_table = pd.DataFrame(
+        {
+            "room_id": rooms,
+            "building": buildings,
+            "seats": seats,
+            "slots_used": (used > 0).sum(axis=0),
+            "seats_used": room_used,
+            "utilization": _ratio(room_used, seats * len(slots)),
+            "partial_slots": partial.sum(axis=0),
+            "stranded_seats": stranded.sum(axis=0),
+        },
+        columns=ROOM_COLUMNS,
+    )
+
+    building_table = (
+        room_table.groupby("building", sort=True)
+        .agg(rooms=("room_id", "size"), seats=("seats", "sum"), seats_used=("seats_used", "sum"))
+        .reset_index()
+    )
+    building_table["utilization"] = _ratio(
+        building_table["seats_used"].to_numpy(), building_table["seats"].to_numpy() * len(slots)
+    )
+
+    date_table = (
+        slot_table.groupby("date", sort=True)
+        .agg(peak_demand=("demand", "max"), peak_utilization=("utilization", "max"))
+        .reset_index()
+    )
+    date_table["supply"] = slot_seats
+    date_table["shortfall"] = (date_table["peak_demand"] - slot_seats).clip(lower=0)
+
+    return {
+        "slots": slot_table,
+        "rooms": room_table,
+        "buildings": building_table[BUILDING_COLUMNS],
+        "dates": date_table[DATE_COLUMNS],
+    }
+
+
+def utilization_summary(analysis):
+    """Reduce analyze_utilization's tables to a JSON-serializable summary."""
+    slots = analysis["slots"]
+    seats = int(slots["seats"].sum())
+    used = int(slots["seats_used"].sum())
+    return {
+        "slots": len(slots),
+        "seats_per_slot": int(slots["seats"].max()) if len(slots) else 0,
+        "utilization": round(used / seats, 4) if seats else 0.0,
+        "partial_rooms": int(slots["partial_rooms"].sum()),
+        "stranded_seats": int(slots["stranded_seats"].sum()),
+        "pending_students": int(slots["pending_students"].sum()),
+        "peak_demand": int(slots["demand"].max()) if len(slots) else 0,
+        "dates_short_of_seats": int((analysis["dates"]["shortfall"] > 0).sum()),
+        "buildings": analysis["buildings"].to_dict("records"),
+        "rooms": analysis["rooms"].to_dict("records"),
+        "dates": analysis["dates"].to_dict("records"),
+    }
+
+
+def save_utilization_report(analysis, output_dir):
+    """
+    Write utilization.xlsx (one row per date/slot) and utilization.json.
+
+    Returns:
+    - The summary dict written to utilization.json
+    """
+    try:
+        write_rows_xlsx(
+            f"{output_dir}/utilization.xlsx",
+            UTILIZATION_COLUMNS,
+            analysis["slots"].to_dict("records"),
+            "Utilization",
+        )
+        summary = utilization_summary(analysis)
+        with open(f"{output_dir}/utilization.json", "w") as f:
+            json.dump(summary, f, indent=2)
+        logging.info(
+            f"Utilization {summary['utilization']:.1%}, "
+            f"{summary['stranded_seats']} stranded seats, "
+            f"{summary['partial_rooms']} partially filled room-slots"
+        )
+        return summary
+
+    except Exception as e:
+        logging.error(f"Error saving utilization report: {str(e)}")
+        raise
+
+
+def _slot_room_index(slots, rooms):
+    """MultiIndex of every (date, slot, room_id), slot-major."""
+    return pd.MultiIndex.from_arrays(
+        [
+            np.repeat(slots.get_level_values(0), len(rooms)),
+            np.repeat(slots.get_level_values(1), len(rooms)),
+            np.tile(rooms.to_numpy(), len(slots)),
+        ],
+        names=["date", "slot", "room_id"],
+    )
+
+
+def _ratio(used, seats):
+    used = np.asarray(used, dtype=float)
+    seats = np.asarray(seats, dtype=float)
+    return np.round(np.divide(used, seats, out=np.zeros_like(used), where=seats > 0), 4)
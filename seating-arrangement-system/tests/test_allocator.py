@@ -1,38 +1,110 @@
+import os
+import tempfile
 import unittest
-from src.utils.classroom_allocator import allocate_classrooms
-from src.models.course import Course
-from src.models.classroom import Classroom
+import numpy as np
+import pandas as pd
+from unittest import mock
+from src.utils import classroom_allocator
+from src.utils.classroom_allocator import allocate_classrooms, allocate_slots, room_buildings
+from src.utils.roll_table import encode_course_rolls
 
 class TestClassroomAllocator(unittest.TestCase):
 
     def setUp(self):
-        self.classrooms = [
-            Classroom(room_number="101", capacity=50),
-            Classroom(room_number="102", capacity=30),
-            Classroom(room_number="103", capacity=40)
-        ]
-        self.courses = [
-            Course(course_code="CS249", capacity=45, enrolled_students=[1, 2, 3, 4, 5]),
-            Course(course_code="CH426", capacity=25, enrolled_students=[6, 7, 8, 9, 10]),
-            Course(course_code="MM304", capacity=35, enrolled_students=[11, 12, 13, 14, 15])
-        ]
+        # allocate_classrooms writes its outputs under data/output
+        self.previous_dir = os.getcwd()
+        self.work_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.work_dir.name)
+
+        self.classrooms = pd.DataFrame({
+            'room_id': ['101', '102', '103'],
+            'capacity': [50, 30, 40],
+        })
+        self.courses = pd.DataFrame({
+            'course_id': ['CS249', 'CH426', 'MM304'],
+            'enrollment': [45, 25, 35],
+            'date': ['5/1/16'] * 3,
+            'slot': ['Morning'] * 3,
+            'roll_numbers': [self._rolls('A', 45), self._rolls('B', 25), self._rolls('C', 35)],
+        })
+
+    def tearDown(self):
+        os.chdir(self.previous_dir)
+        self.work_dir.cleanup()
+
+    def _rolls(self, prefix, count):
+        return ';'.join(f'{prefix}{number:03d}' for number in range(count))
+
+    def _rooms_by_course(self, allocation):
+        return dict(zip(allocation['course_id'], allocation['room_id']))
 
     def test_allocate_classrooms_success(self):
-        allocation = allocate_classrooms(self.courses, self.classrooms)
+        allocation = allocate_classrooms(self.courses, self.classrooms, 0, 'dense')
         self.assertEqual(len(allocation), 3)
-        self.assertEqual(allocation["CS249"], "101")
-        self.assertEqual(allocation["CH426"], "102")
-        self.assertEqual(allocation["MM304"], "103")
+        rooms = self._rooms_by_course(allocation)
+        self.assertEqual(rooms['CS249'], '101')
+        self.assertEqual(rooms['CH426'], '102')
+        self.assertEqual(rooms['MM304'], '103')
+        self.assertTrue(os.path.exists('data/output/op_seats_left.xlsx'))
 
     def test_allocate_classrooms_exceed_capacity(self):
-        self.courses.append(Course(course_code="PH422", capacity=60, enrolled_students=[16, 17, 18, 19, 20]))
-        allocation = allocate_classrooms(self.courses, self.classrooms)
-        self.assertNotIn("PH422", allocation)
+        self.courses.loc[len(self.courses)] = ['PH422', 130, '5/1/16', 'Morning', self._rolls('D', 130)]
+        courses, roll_table = encode_course_rolls(self.courses)
+        allocation, seats_left, unallocated = allocate_slots(
+            courses, self.classrooms, 0, 'dense', roll_table
+        )
+        self.assertNotIn('PH422', set(allocation['course_id']))
+        self.assertEqual([course['course_id'] for course in unallocated], ['PH422'])
+        self.assertEqual(seats_left[('5/1/16', 'Morning')], {'101': 5, '102': 5, '103': 5})
 
     def test_allocate_classrooms_no_available_rooms(self):
-        self.classrooms = []
-        allocation = allocate_classrooms(self.courses, self.classrooms)
-        self.assertEqual(allocation, {})
+        self.classrooms = self.classrooms.iloc[0:0]
+        allocation = allocate_classrooms(self.courses, self.classrooms, 0, 'dense')
+        self.assertTrue(allocation.empty)
+
+    def test_student_ids_follow_rooms(self):
+        courses, roll_table = encode_course_rolls(self.courses)
+        allocation, _, _ = allocate_slots(courses, self.classrooms, 0, 'dense', roll_table)
+        for ids, enrollment in zip(allocation['student_ids'], allocation['enrollment']):
+            self.assertIsInstance(ids, np.ndarray)
+            self.assertEqual(len(ids), enrollment)
+
+    def test_block_column_keeps_split_course_in_one_building(self):
+        # By room id 101/102/103 all look like building "1"; the blocks say otherwise
+        self.classrooms['block'] = ['B1', 'B2', 'B2']
+        self.assertEqual(room_buildings(self.classrooms), {'101': 'B1', '102': 'B2', '103': 'B2'})
+        courses = self.courses.iloc[[0]].copy()
+        courses['enrollment'] = [60]
+        courses['roll_numbers'] = [self._rolls('A', 60)]
+        courses, roll_table = encode_course_rolls(courses)
+        allocation, _, _ = allocate_slots(courses, self.classrooms, 0, 'dense', roll_table)
+        self.assertEqual(sorted(allocation['room_id']), ['102', '103'])
+
+    def test_threads_and_processes_match_serial(self):
+        # Four slots over the same rooms, each with a course split across rooms
+        rows = []
+        for day, slot in [('5/1/16', 'Morning'), ('5/1/16', 'Evening'),
+                          ('5/2/16', 'Morning'), ('5/2/16', 'Evening')]:
+            key = f'{day[2]}{slot[0]}'
+            for course, size in [('BIG', 70), ('MID', 28), ('SMALL', 12)]:
+                rows.append([f'{course}{key}', size, day, slot, self._rolls(f'{course}{key}-', size)])
+        courses, roll_table = encode_course_rolls(pd.DataFrame(rows, columns=self.courses.columns))
+
+        def allocate(workers, min_enrollment):
+            with mock.patch.object(classroom_allocator, 'PROCESS_POOL_MIN_ENROLLMENT', min_enrollment):
+                allocation, seats_left, unallocated = allocate_slots(
+                    courses, self.classrooms, 0, 'dense', roll_table, workers)
+            allocation['student_ids'] = allocation['student_ids'].map(list)
+            return allocation, seats_left, unallocated
+
+        serial = allocate(1, 0)
+        self.assertGreater(serial[0].groupby(['date', 'slot', 'course_id']).size().max(), 1)
+        self.assertEqual(len(serial[1]), 4)
+        for workers, min_enrollment in [(3, float('inf')), (3, 0)]:
+            allocation, seats_left, unallocated = allocate(workers, min_enrollment)
+            pd.testing.assert_frame_equal(allocation, serial[0])
+            self.assertEqual(seats_left, serial[1])
+            self.assertEqual(unallocated, serial[2])
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
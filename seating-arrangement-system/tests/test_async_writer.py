@@ -0,0 +1,76 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+import pandas as pd
+from src.utils.async_writer import AsyncFileWriter, dataframe_xlsx
+from src.utils.instrumentation import Profiler, activate
+
+class TestAsyncFileWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writes_every_file_into_its_directory(self):
+        with AsyncFileWriter(self.output_dir, workers=4) as writer:
+            for i in range(20):
+                writer.submit(f'5_3_16/Morning/{i}.txt', str.encode, f'plan {i}')
+            writer.submit('5_3_16/Evening/summary.txt', bytes, b'summary')
+        self.assertEqual(writer.written, 21)
+        self.assertEqual(len(os.listdir(os.path.join(self.output_dir, '5_3_16', 'Morning'))), 20)
+        with open(os.path.join(self.output_dir, '5_3_16', 'Morning', '7.txt')) as f:
+            self.assertEqual(f.read(), 'plan 7')
+
+    def test_pending_files_are_bounded(self):
+        in_progress = []
+        peak = []
+        lock = threading.Lock()
+
+        def render(i):
+            with lock:
+                in_progress.append(i)
+                peak.append(len(in_progress))
+            time.sleep(0.01)
+            with lock:
+                in_progress.remove(i)
+            return b'x'
+
+        with AsyncFileWriter(self.output_dir, workers=2, max_pending=3) as writer:
+            for i in range(10):
+                writer.submit(f'{i}.txt', render, i)
+        self.assertLessEqual(max(peak), 2)
+        self.assertEqual(writer.written, 10)
+
+    def test_render_error_is_raised_on_close(self):
+        def render():
+            raise ValueError('bad plan')
+
+        with self.assertRaises(ValueError):
+            with AsyncFileWriter(self.output_dir, workers=2) as writer:
+                writer.submit('ok.txt', bytes, b'ok')
+                writer.submit('bad.txt', render)
+
+    def test_writes_are_spans_on_submitting_profiler(self):
+        profiler = Profiler()
+        with activate(profiler), AsyncFileWriter(self.output_dir, workers=2) as writer:
+            for i in range(3):
+                writer.submit(f'{i}.txt', str.encode, f'plan {i}')
+        files = sorted(record['args']['file'] for record in profiler.spans
+                       if record['name'] == 'write_file')
+        self.assertEqual(files, ['0.txt', '1.txt', '2.txt'])
+        self.assertEqual(profiler.counters['files_written'], 3)
+
+    def test_dataframe_xlsx_round_trips(self):
+        df = pd.DataFrame({'course_id': ['CS249', 'CH426'], 'conflict_count': [2, 1]})
+        with AsyncFileWriter(self.output_dir) as writer:
+            writer.submit('conflicts.xlsx', dataframe_xlsx, df)
+        result = pd.read_excel(os.path.join(self.output_dir, 'conflicts.xlsx'))
+        self.assertEqual(result.values.tolist(), df.values.tolist())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from src.utils.capacity_ledger import SlotCapacityLedger
+
+class TestSlotCapacityLedger(unittest.TestCase):
+
+    def setUp(self):
+        self.ledger = SlotCapacityLedger(
+            {"B-001": 35, "B-002": 35, "6101": 15, "6102": 36},
+            {"B-001": "B2", "B-002": "B2", "6101": "B1", "6102": "B1"},
+        )
+
+    def test_best_fit_and_largest(self):
+        self.assertEqual(self.ledger.best_fit(10), "6101")
+        self.assertEqual(self.ledger.best_fit(20), "B-001")
+        self.assertEqual(self.ledger.best_fit(20, "B1"), "6102")
+        self.assertIsNone(self.ledger.best_fit(40))
+        self.assertEqual(self.ledger.largest(), "6102")
+        self.assertEqual(self.ledger.largest("B2"), "B-001")
+
+    def test_plan_single_room(self):
+        placements = self.ledger.plan(12)
+        self.assertEqual(placements, [("6101", 12)])
+        self.assertEqual(self.ledger.free["6101"], 3)
+        self.assertEqual(self.ledger.total_free, 109)
+
+    def test_plan_split_prefers_building(self):
+        placements = self.ledger.plan(60, "B2")
+        self.assertEqual(placements, [("B-001", 35), ("B-002", 25)])
+
+    def test_plan_insufficient_capacity(self):
+        self.assertIsNone(self.ledger.plan(200))
+        self.assertEqual(self.ledger.total_free, 121)
+
+    def test_take_reindexes(self):
+        self.ledger.take("6102", 30)
+        self.assertEqual(self.ledger.largest(), "B-001")
+        self.assertEqual(self.ledger.best_fit(5, "B1"), "6102")
+
+    def test_large_course_stays_in_one_building(self):
+        # 60 seats fit in B2 (35 + 35) but not in B1 (15 + 36), so no cross-building split
+        placements = self.ledger.plan(60)
+        self.assertEqual(placements, [("B-001", 35), ("B-002", 25)])
+        self.assertEqual(self.ledger.building_free["B2"], 10)
+
+    def test_building_for_prefers_fewest_rooms(self):
+        ledger = SlotCapacityLedger(
+            {"A1": 20, "A2": 20, "A3": 20, "C1": 40, "C2": 30},
+            {"A1": "A", "A2": "A", "A3": "A", "C1": "C", "C2": "C"},
+        )
+        self.assertEqual(ledger.building_for(50), "C")
+        self.assertIsNone(ledger.building_for(80))
+        self.assertEqual(ledger.plan(80)[0], ("C1", 40))
+
+    def test_chosen_building_is_filled_before_others(self):
+        # Building A holds 150 in three rooms; B1 must not take the remainder
+        ledger = SlotCapacityLedger(
+            {"A1": 100, "A2": 40, "A3": 40, "B1": 60},
+            {"A1": "A", "A2": "A", "A3": "A", "B1": "B"},
+        )
+        self.assertEqual(ledger.plan(150), [("A1", 100), ("A2", 40), ("A3", 10)])
+        self.assertEqual(ledger.free["B1"], 60)
+
+if __name__ == '__main__':
+    unittest.main()
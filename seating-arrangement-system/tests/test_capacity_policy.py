@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.utils.capacity_policy import RoomCapacities, get_capacity_policy, room_capacities
+from src.utils.classroom_allocator import calculate_effective_capacity
+from src.utils.seat_layout import RoomGeometry
+
+class TestCapacityPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.classrooms = pd.DataFrame({
+            'room_id': ['6101', '6102', '7101', '7102'],
+            'capacity': [40, 25, 7, 3],
+            'sub_blocks': ['6;6;5', '', None, ''],
+        })
+
+    def test_sparse_and_dense_match_previous_rule(self):
+        for density in ('sparse', 'dense'):
+            expected = {}
+            for room_id, capacity in zip(self.classrooms['room_id'], self.classrooms['capacity']):
+                seats = capacity - 5
+                expected[room_id] = max(seats // 2 if density == 'sparse' else seats, 0)
+            self.assertEqual(calculate_effective_capacity(self.classrooms, 5, density), expected)
+
+    def test_density_ratios(self):
+        capacity = calculate_effective_capacity(self.classrooms, 0, 'sparse', {'sparse': 0.75, 'dense': 1.0})
+        self.assertEqual(capacity, {'6101': 30, '6102': 18, '7101': 5, '7102': 2})
+
+    def test_checkerboard_matches_seat_grid(self):
+        rooms = pd.DataFrame({'room_id': [str(c) for c in range(40)], 'capacity': range(40)})
+        seats = RoomCapacities(rooms, columns=5).effective(0, 'checkerboard')
+        expected = [RoomGeometry(c, 5).seat_order('checkerboard')[1] for c in range(40)]
+        self.assertEqual(seats.tolist(), expected)
+
+    def test_sub_blocks_policy(self):
+        seats = RoomCapacities(self.classrooms).effective(2, 'sub_blocks')
+        geometry = RoomGeometry(40, 6, [6, 6, 5])
+        self.assertEqual(seats[0], geometry.seat_order('sparse')[1] - 2)
+        self.assertEqual(seats[1:].tolist(), [11, 1, 0])
+
+    def test_per_room_buffer(self):
+        classrooms = self.classrooms.assign(buffer=[10, None, 0, None])
+        capacity = calculate_effective_capacity(classrooms, 5, 'dense')
+        self.assertEqual(capacity, {'6101': 30, '6102': 20, '7101': 7, '7102': 0})
+
+    def test_vectors_are_cached(self):
+        model = room_capacities(self.classrooms)
+        self.assertIs(room_capacities(self.classrooms.copy()), model)
+        first = model.effective(5, 'dense')
+        self.assertIs(model.effective(5, 'dense'), first)
+        self.assertFalse(first.flags.writeable)
+        self.assertIsNot(room_capacities(self.classrooms.iloc[::-1]), model)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            get_capacity_policy('packed')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,40 +1,61 @@
+import os
+import tempfile
 import unittest
+import pandas as pd
 from src.utils.conflict_checker import check_conflicts
 
 class TestConflictChecker(unittest.TestCase):
 
     def setUp(self):
-        self.course1 = {
-            'code': 'CS249',
-            'students': {1, 2, 3, 4, 5}
-        }
-        self.course2 = {
-            'code': 'CH426',
-            'students': {6, 7, 8, 9, 10}
-        }
-        self.course3 = {
-            'code': 'MM304',
-            'students': {3, 4, 11, 12, 13}
-        }
+        # Conflict reports are written under data/output/conflicts
+        self.previous_dir = os.getcwd()
+        self.work_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.work_dir.name)
+
+        self.course1 = ('CS249', '1;2;3;4;5')
+        self.course2 = ('CH426', '6;7;8;9;10')
+        self.course3 = ('MM304', '3;4;11;12;13')
+
+    def tearDown(self):
+        os.chdir(self.previous_dir)
+        self.work_dir.cleanup()
+
+    def _courses(self, *courses, slot='Morning'):
+        return pd.DataFrame({
+            'course_id': [course_id for course_id, _ in courses],
+            'date': ['5/1/16'] * len(courses),
+            'slot': [slot] * len(courses),
+            'roll_numbers': [rolls for _, rolls in courses],
+        })
+
+    def _pairs(self, conflicts):
+        return [(conflict['course2'], conflict['roll_number']) for conflict in conflicts]
 
     def test_no_conflict(self):
-        courses = [self.course1, self.course2]
-        result = check_conflicts(courses)
+        result = check_conflicts(self._courses(self.course1, self.course2))
         self.assertEqual(result, [])
 
     def test_with_conflict(self):
-        courses = [self.course1, self.course3]
-        result = check_conflicts(courses)
-        self.assertEqual(result, [('CS249', 3), ('CS249', 4)])
+        result = check_conflicts(self._courses(self.course1, self.course3))
+        self.assertEqual(self._pairs(result), [('CS249', '3'), ('CS249', '4')])
+        self.assertTrue(all(conflict['course1'] == 'MM304' for conflict in result))
+        self.assertTrue(os.path.exists('data/output/conflicts/conflicts_detailed.xlsx'))
 
     def test_multiple_conflicts(self):
-        course4 = {
-            'code': 'CB308',
-            'students': {4, 5, 14, 15}
-        }
-        courses = [self.course1, self.course3, course4]
-        result = check_conflicts(courses)
-        self.assertEqual(result, [('CS249', 4), ('MM304', 4), ('MM304', 5)])
+        course4 = ('CB308', '4;5;14;15')
+        result = check_conflicts(self._courses(self.course1, self.course3, course4))
+        self.assertEqual(
+            self._pairs(result), [('CS249', '3'), ('CS249', '4'), ('CS249', '4'), ('CS249', '5')]
+        )
+        self.assertEqual([conflict['course1'] for conflict in result],
+                         ['MM304', 'MM304', 'CB308', 'CB308'])
+
+    def test_different_slots_do_not_conflict(self):
+        courses = pd.concat([
+            self._courses(self.course1),
+            self._courses(self.course3, slot='Evening'),
+        ])
+        self.assertEqual(check_conflicts(courses), [])
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import pandas as pd
+from src.utils.conflict_engine import ConflictEngine
+
+class TestConflictEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.courses = pd.DataFrame({
+            'course_id': ['CS249', 'CH426', 'MM304', 'CB308'],
+            'date': ['4/30/16', '4/30/16', '4/30/16', '5/1/16'],
+            'slot': ['Morning', 'Morning', 'Morning', 'Morning'],
+            'roll_numbers': ['R1;R2;R3', 'R4;R5', 'R3;R4;R6', 'R1;R4'],
+        })
+
+    def test_conflicts(self):
+        result = ConflictEngine(self.courses).conflicts()
+        self.assertEqual(result, [
+            {'date': '4/30/16', 'slot': 'Morning', 'roll_number': 'R3', 'course1': 'MM304', 'course2': 'CS249'},
+            {'date': '4/30/16', 'slot': 'Morning', 'roll_number': 'R4', 'course1': 'MM304', 'course2': 'CH426'},
+        ])
+
+    def test_no_conflicts(self):
+        result = ConflictEngine(self.courses.iloc[[0, 1, 3]]).conflicts()
+        self.assertEqual(result, [])
+
+    def test_move_clashes(self):
+        engine = ConflictEngine(self.courses)
+        self.assertEqual(engine.move_clashes('CB308', '4/30/16', 'Morning'),
+                         {'CS249': 1, 'CH426': 1, 'MM304': 1})
+        self.assertEqual(engine.move_clashes('CH426', '5/1/16', 'Morning'), {'CB308': 1})
+        self.assertEqual(engine.move_clashes('CH426', '6/1/16', 'Morning'), {})
+
+    def test_clash_graph(self):
+        graph = ConflictEngine(self.courses).clash_graph()
+        # Rows: CS249, CH426, MM304, CB308
+        self.assertEqual(graph.indptr.tolist(), [0, 2, 4, 7, 10])
+        self.assertEqual(graph.neighbours(3)[0].tolist(), [0, 1, 2])
+        self.assertEqual(graph.neighbours(3)[1].tolist(), [1, 1, 1])
+        self.assertEqual(graph.degree().tolist(), [2, 2, 3, 3])
+        self.assertEqual(graph.block([2, 3], [0, 1, 3]).tolist(), [[1, 1, 1], [1, 1, 0]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import numpy as np
+import pandas as pd
+from unittest import mock
+from src.utils import conflict_resolver
+from src.utils.conflict_resolver import ConflictResolver, recolour_timetable, suggest_slot_moves
+
+class TestConflictResolver(unittest.TestCase):
+
+    def setUp(self):
+        self.courses = pd.DataFrame({
+            'course_id': ['CS249', 'CH426', 'MM304', 'CB308'],
+            'date': ['4/30/16', '4/30/16', '5/1/16', '5/1/16'],
+            'slot': ['Morning', 'Morning', 'Morning', 'Morning'],
+            'roll_numbers': ['R1;R2;R3', 'R3;R4', 'R5', 'R6;R7'],
+        })
+
+    def test_cost(self):
+        self.assertEqual(ConflictResolver(self.courses, 10).cost(), (1, 0))
+        self.assertEqual(ConflictResolver(self.courses, 4).cost(), (1, 1))
+
+    def test_suggests_move_that_removes_clash(self):
+        moves = suggest_slot_moves(self.courses, 10)
+        self.assertEqual(len(moves), 1)
+        move = moves.iloc[0]
+        self.assertEqual((move['to_date'], move['to_slot']), ('5/1/16', 'Morning'))
+        self.assertEqual(move['clashes_removed'], 1)
+        self.assertEqual(move['clashes_left'], 0)
+
+    def test_fixed_courses_stay(self):
+        resolver = ConflictResolver(self.courses, 10, fixed=['CH426'])
+        moves = resolver.suggest_moves()
+        self.assertEqual(moves['course_id'].tolist(), ['CS249'])
+
+    def test_no_suggestions_without_clashes_or_overflow(self):
+        self.assertTrue(suggest_slot_moves(self.courses.iloc[[0, 2, 3]], 10).empty)
+
+    def test_overflow_is_moved_to_free_slot(self):
+        courses = pd.DataFrame({
+            'course_id': ['CS249', 'CH426', 'MM304'],
+            'date': ['4/30/16', '4/30/16', '5/1/16'],
+            'slot': ['Morning', 'Morning', 'Morning'],
+            'roll_numbers': ['R1;R2;R3', 'R4;R5', 'R6'],
+        })
+        moves = suggest_slot_moves(courses, 3)
+        self.assertEqual(moves['course_id'].tolist(), ['CH426'])
+        self.assertEqual(moves.iloc[0]['overflow_left'], 0)
+
+    def test_suggested_costs_match_recomputed_costs(self):
+        rng = np.random.default_rng(0)
+        slots = [('5/%d/16' % day, slot) for day in range(1, 4) for slot in ('Morning', 'Evening')]
+        rows = []
+        for i in range(30):
+            date, slot = slots[rng.integers(len(slots))]
+            students = rng.choice(60, size=rng.integers(1, 12), replace=False)
+            rows.append({'course_id': f'C{i}', 'date': date, 'slot': slot,
+                         'roll_numbers': ';'.join(f'R{s}' for s in students)})
+        resolver = ConflictResolver(pd.DataFrame(rows), 40)
+        before = resolver.cost()
+        moves = resolver.suggest_moves(max_moves=30)
+        self.assertEqual(resolver.cost(), (moves.iloc[-1]['clashes_left'], moves.iloc[-1]['overflow_left']))
+        self.assertLess(resolver._weighted(resolver.cost()), resolver._weighted(before))
+        self.assertTrue(moves['course_id'].is_unique)
+
+    def test_swaps_scored_in_blocks_match(self):
+        rng = np.random.default_rng(1)
+        rows = [{'course_id': f'C{i}', 'date': '5/%d/16' % rng.integers(1, 3), 'slot': 'Morning',
+                 'roll_numbers': ';'.join(f'R{s}' for s in rng.choice(40, size=6, replace=False))}
+                for i in range(20)]
+        expected = ConflictResolver(pd.DataFrame(rows), 100).suggest_moves(max_moves=6)
+        with mock.patch.object(conflict_resolver, 'SWAP_BLOCK_ROWS', 1):
+            moves = ConflictResolver(pd.DataFrame(rows), 100).suggest_moves(max_moves=6)
+        pd.testing.assert_frame_equal(moves, expected)
+
+    def test_failure_suggests_nothing(self):
+        with mock.patch.object(conflict_resolver.ConflictResolver, 'suggest_moves', side_effect=MemoryError('too big')), \
+                self.assertLogs(level='WARNING'):
+            self.assertTrue(suggest_slot_moves(self.courses, 10).empty)
+
+    def test_colour_timetable_does_not_get_worse(self):
+        resolver = ConflictResolver(self.courses, 10)
+        before = resolver.cost()
+        timetable = resolver.colour_timetable()
+        self.assertEqual(len(timetable), 4)
+        self.assertLessEqual(resolver._weighted(resolver.cost()), resolver._weighted(before))
+        self.assertEqual(resolver.cost()[0], 0)
+
+    def test_recolour_timetable_separates_clashing_courses(self):
+        timetable = recolour_timetable(self.courses, 10).set_index('course_id')
+        self.assertEqual(sorted(timetable.index), ['CB308', 'CH426', 'CS249', 'MM304'])
+        new_slots = list(zip(timetable['new_date'], timetable['new_slot']))
+        self.assertNotEqual(new_slots[timetable.index.get_loc('CS249')],
+                            new_slots[timetable.index.get_loc('CH426')])
+
+    def test_recolour_failure_returns_empty_timetable(self):
+        with mock.patch.object(conflict_resolver.ConflictResolver, 'colour_timetable', side_effect=MemoryError('too big')), \
+                self.assertLogs(level='WARNING'):
+            timetable = recolour_timetable(self.courses, 10)
+        self.assertTrue(timetable.empty)
+        self.assertEqual(list(timetable.columns), conflict_resolver.TIMETABLE_COLUMNS)
+
+if __name__ == '__main__':
+    unittest.main()
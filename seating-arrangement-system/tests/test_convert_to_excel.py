@@ -0,0 +1,104 @@
+import os
+import sys
+import tempfile
+import unittest
+import pandas as pd
+from src.utils.roll_table import encode_course_rolls
+
+# convert_to_excel imports its helpers as a top-level script (from utils...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import convert_to_excel  # noqa: E402
+
+TIMETABLE = """Date,Day,Morning,Evening,
+4/30/16,Sunday,CS249; CH426,NO EXAM,
+5/1/16,Monday,MM304,CB308;  HS202,
+"""
+
+COURSE_ROLL = """rollno,register_sem,schedule_sem,course_code,
+1401CB01,4,4,CS249,
+1401CB02,4,4,CS249,
+ 1401CB03 ,4,4, CH426 ,
+1401CB01,4,4,MM304,
+1401CB04,4,4,CB308,
+1401CB02,4,4,CB308,
+,4,4,CB308,
+1401CB05,4,4,HS202,
+1401CB03,4,4,CS249,
+"""
+
+ROLL_NAME = """Roll,Name,,,
+1401CB01,Ajit Singh,,,
+1401CB02,Jaishree Mayank,,,
+1401CB03,Rohan Das,,,
+"""
+
+ROOMS = """Room No.,Exam Capacity,Block,sparse,,,,,
+6101,30,B1,sub1,6,sub 2,6,sub 3,5
+6102,72,B1,,,,,,
+B-001,40,B2,,,,,,
+"""
+
+
+class TestCsvIngestion(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_dir = os.getcwd()
+        self.previous_csv_dir = convert_to_excel.CSV_DIR
+        self.work_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.work_dir.name)
+        os.makedirs('input_data_tt')
+        for name, text in [('in_timetable', TIMETABLE), ('in_course_roll_mapping', COURSE_ROLL),
+                           ('in_roll_name_mapping', ROLL_NAME), ('in_room_capacity', ROOMS)]:
+            with open(f'input_data_tt/{name}-Table 1.csv', 'w') as f:
+                f.write(text)
+        convert_to_excel.CSV_DIR = 'input_data_tt'
+
+    def tearDown(self):
+        convert_to_excel.CSV_DIR = self.previous_csv_dir
+        os.chdir(self.previous_dir)
+        self.work_dir.cleanup()
+
+    def _rolls_by_course(self, courses, roll_table):
+        return {(course_id, date, slot): roll_table.decode(ids)
+                for course_id, date, slot, ids in zip(courses['course_id'], courses['date'],
+                                                      courses['slot'], courses['student_ids'])}
+
+    def test_csv_inputs_match_excel_round_trip(self):
+        roll_names, classrooms, courses, roll_table = convert_to_excel.load_inputs_from_csv()
+
+        convert_to_excel.ensure_directories()
+        convert_to_excel.convert_roll_name_mapping()
+        convert_to_excel.convert_classroom_data()
+        convert_to_excel.create_courses_excel()
+        excel_courses, excel_table = encode_course_rolls(pd.read_excel('data/input/in_courses.xlsx'))
+
+        self.assertEqual(self._rolls_by_course(courses, roll_table),
+                         self._rolls_by_course(excel_courses, excel_table))
+        self.assertEqual(courses['enrollment'].tolist(), excel_courses['enrollment'].tolist())
+        self.assertEqual(self._rolls_by_course(courses, roll_table)[('CB308', '5/1/16', 'Evening')],
+                         ['1401CB04', '1401CB02'])
+        pd.testing.assert_frame_equal(
+            classrooms.reset_index(drop=True),
+            pd.read_excel('data/input/in_classrooms.xlsx').fillna({'sub_blocks': ''}),
+            check_dtype=False,
+        )
+        self.assertEqual(classrooms['sub_blocks'].tolist(), ['6;6;5', '', ''])
+        pd.testing.assert_frame_equal(roll_names.reset_index(drop=True),
+                                      pd.read_excel('data/input/in_roll_name_mapping.xlsx'))
+
+    def test_csv_inputs_write_nothing(self):
+        convert_to_excel.load_inputs_from_csv()
+        self.assertEqual(os.listdir('.'), ['input_data_tt'])
+
+    def test_rolls_read_in_chunks_match_one_read(self):
+        whole = convert_to_excel.RollTable()
+        chunked = convert_to_excel.RollTable()
+        expected = convert_to_excel.get_rolls_for_courses(whole)
+        result = convert_to_excel.get_rolls_for_courses(chunked, chunksize=2)
+        self.assertEqual(list(result), list(expected))
+        for course, ids in expected.items():
+            self.assertEqual(chunked.decode(result[course]), whole.decode(ids))
+        self.assertEqual(whole.decode(expected['CS249']), ['1401CB01', '1401CB02', '1401CB03'])
+
+if __name__ == '__main__':
+    unittest.main()
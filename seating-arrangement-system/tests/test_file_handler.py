@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from unittest import mock
+from src.utils import file_handler
+from src.utils.file_handler import read_excel
+
+class TestInputCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, 'in_classrooms.xlsx')
+        self.cache_dir = os.path.join(self.tmp.name, 'cache')
+        pd.DataFrame({'room_id': ['6101', 'B-001'], 'capacity': [30, 70]}).to_excel(self.source, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cache_hit_skips_excel_parse(self):
+        first = read_excel(self.source, self.cache_dir)
+        with mock.patch.object(file_handler.pd, 'read_excel') as parse:
+            second = read_excel(self.source, self.cache_dir)
+            parse.assert_not_called()
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_changed_file_is_reparsed(self):
+        read_excel(self.source, self.cache_dir)
+        pd.DataFrame({'room_id': ['B-002'], 'capacity': [72]}).to_excel(self.source, index=False)
+        result = read_excel(self.source, self.cache_dir)
+        self.assertEqual(result['room_id'].tolist(), ['B-002'])
+
+    def _data_files(self):
+        return sorted(name for name in os.listdir(self.cache_dir) if not name.endswith('.json'))
+
+    def test_changed_file_drops_stale_entry(self):
+        read_excel(self.source, self.cache_dir)
+        # A second file with the same contents shares the cached data
+        copy = os.path.join(self.tmp.name, 'copy.xlsx')
+        shutil.copy(self.source, copy)
+        read_excel(copy, self.cache_dir)
+        old = self._data_files()
+        self.assertEqual(len(old), 1)
+
+        pd.DataFrame({'room_id': ['B-002'], 'capacity': [72]}).to_excel(self.source, index=False)
+        read_excel(self.source, self.cache_dir)
+        self.assertEqual(len(self._data_files()), 2)
+        self.assertIn(old[0], self._data_files())
+
+        pd.DataFrame({'room_id': ['B-003'], 'capacity': [40]}).to_excel(copy, index=False)
+        read_excel(copy, self.cache_dir)
+        self.assertEqual(len(self._data_files()), 2)
+        self.assertNotIn(old[0], self._data_files())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from unittest import mock
+from src.utils import incremental
+from src.utils.incremental import allocate_incremental
+from src.utils.roll_table import encode_course_rolls
+
+class TestIncrementalAllocation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_dir = self.tmp.name
+        self.state_file = os.path.join(self.tmp.name, '.state', 'state.pkl')
+        courses = pd.DataFrame({
+            'course_id': ['CS249', 'CH426', 'MM304'],
+            'date': ['4/30/16', '4/30/16', '5/1/16'],
+            'slot': ['Morning', 'Morning', 'Evening'],
+            'roll_numbers': ['R1;R2;R3', 'R4;R5', 'R1;R6'],
+            'enrollment': [3, 2, 2],
+        })
+        self.courses, self.roll_table = encode_course_rolls(courses)
+        self.classrooms = pd.DataFrame({'room_id': ['6101', '6102'], 'capacity': [5, 3]})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_incremental(self, courses, classrooms, export_mode='files'):
+        return allocate_incremental(courses, classrooms, 0, 'dense', self.roll_table,
+                                    self.state_file, export_mode=export_mode,
+                                    output_dir=self.output_dir)
+
+    def test_unchanged_inputs_reuse_previous_run(self):
+        first = self.run_incremental(self.courses, self.classrooms)
+        with mock.patch.object(incremental, 'allocate_slots', wraps=incremental.allocate_slots) as solve, \
+                mock.patch.object(incremental, 'write_plan_file') as write:
+            second = self.run_incremental(self.courses, self.classrooms)
+            self.assertTrue(solve.call_args[0][0].empty)
+            write.assert_not_called()
+        self.assertEqual(first[['course_id', 'room_id']].values.tolist(),
+                         second[['course_id', 'room_id']].values.tolist())
+
+    def test_only_changed_slot_is_resolved(self):
+        self.run_incremental(self.courses, self.classrooms)
+        moved = self.courses.copy()
+        moved.loc[2, 'slot'] = 'Morning'
+        moved.loc[2, 'date'] = '5/2/16'
+        with mock.patch.object(incremental, 'allocate_slots', wraps=incremental.allocate_slots) as solve:
+            result = self.run_incremental(moved, self.classrooms)
+            self.assertEqual(solve.call_args[0][0]['course_id'].tolist(), ['MM304'])
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, '5_1_16', 'Evening', '5_1_16_MM304_6102.xlsx')))
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, '5_2_16', 'Morning', '5_2_16_MM304_6102.xlsx')))
+        self.assertEqual(len(result), 3)
+
+    def test_switching_to_files_mode_writes_files(self):
+        self.run_incremental(self.courses, self.classrooms, export_mode='workbook')
+        plan_file = os.path.join(self.output_dir, '5_1_16', 'Evening', '5_1_16_MM304_6102.xlsx')
+        self.assertFalse(os.path.exists(plan_file))
+        self.run_incremental(self.courses, self.classrooms)
+        self.assertTrue(os.path.exists(plan_file))
+
+    def test_overwritten_file_of_reused_slot_is_rewritten(self):
+        self.run_incremental(self.courses, self.classrooms)
+        plan_file = os.path.join(self.output_dir, '5_1_16', 'Evening', '5_1_16_MM304_6102.xlsx')
+        with open(plan_file, 'wb') as f:
+            f.write(b'written by another run')
+        with mock.patch.object(incremental, 'allocate_slots', wraps=incremental.allocate_slots) as solve, \
+                mock.patch.object(incremental, 'write_plan_file', wraps=incremental.write_plan_file) as write:
+            self.run_incremental(self.courses, self.classrooms)
+            self.assertTrue(solve.call_args[0][0].empty)
+            self.assertEqual([call.args[0]['file_name'] for call in write.call_args_list],
+                             ['5_1_16_MM304_6102.xlsx'])
+        self.assertEqual(pd.read_excel(plan_file)['course_id'].tolist(), ['MM304'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.utils.classroom_allocator import allocate_slots
+from src.utils.instrumentation import Profiler, activate, count, get_profiler, span
+from src.utils.roll_table import encode_course_rolls
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_spans_and_counters(self):
+        profiler = Profiler()
+        with activate(profiler):
+            with span('load', source='csv'):
+                count('rows_iterated', 3)
+            count('rows_iterated')
+        self.assertIsNone(get_profiler())
+        self.assertEqual(profiler.counters['rows_iterated'], 4)
+        self.assertEqual([record['name'] for record in profiler.spans], ['load'])
+        self.assertEqual(profiler.spans[0]['args'], {'source': 'csv'})
+
+    def test_no_active_profiler_is_a_no_op(self):
+        with span('load'):
+            count('rows_iterated')
+        self.assertIsNone(get_profiler())
+
+    def test_write_json_and_chrome_trace(self):
+        profiler = Profiler()
+        with activate(profiler), span('allocate'):
+            count('files_written', 2)
+        with tempfile.TemporaryDirectory() as output_dir:
+            profiler.write(output_dir, 'json')
+            profiler.write(output_dir, 'chrome')
+            with open(f'{output_dir}/profile.json') as f:
+                summary = json.load(f)
+            with open(f'{output_dir}/trace.json') as f:
+                trace = json.load(f)
+        self.assertIn('allocate', summary['stages'])
+        self.assertEqual(summary['counters'], {'files_written': 2})
+        phases = [event['ph'] for event in trace['traceEvents']]
+        self.assertEqual(phases, ['X', 'C'])
+
+    def test_slot_spans_from_worker_threads(self):
+        courses = pd.DataFrame({
+            'course_id': ['CS249', 'CH426'],
+            'enrollment': [2, 1],
+            'date': ['5/1/16', '5/2/16'],
+            'slot': ['Morning', 'Evening'],
+            'roll_numbers': ['A1;A2', 'B1'],
+        })
+        classrooms = pd.DataFrame({'room_id': ['101'], 'capacity': [10]})
+        courses, roll_table = encode_course_rolls(courses)
+        profiler = Profiler()
+        with activate(profiler):
+            allocate_slots(courses, classrooms, 0, 'dense', roll_table, workers=2)
+        slots = {(record['args']['date'], record['args']['slot'])
+                 for record in profiler.spans if record['name'] == 'allocate_slot'}
+        self.assertEqual(slots, {('5/1/16', 'Morning'), ('5/2/16', 'Evening')})
+        self.assertEqual(profiler.counters['rows_iterated'], 2)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            Profiler('perf')
+
+if __name__ == '__main__':
+    unittest.main()
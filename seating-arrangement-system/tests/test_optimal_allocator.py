@@ -0,0 +1,57 @@
+import sys
+import unittest
+import pandas as pd
+from src.utils.classroom_allocator import allocate_slots, get_allocation_strategy
+from src.utils.roll_table import encode_course_rolls
+
+class TestOptimalAllocator(unittest.TestCase):
+
+    def setUp(self):
+        courses = pd.DataFrame({
+            'course_id': ['CS249', 'CH426'],
+            'date': ['4/30/16', '4/30/16'],
+            'slot': ['Morning', 'Morning'],
+            'roll_numbers': ['R1;R2;R3;R4;R5;R6', 'R7;R8;R9;R10'],
+            'enrollment': [6, 4],
+        })
+        self.courses, self.roll_table = encode_course_rolls(courses)
+        self.classrooms = pd.DataFrame({'room_id': ['6101', '6102', '6103'], 'capacity': [10, 6, 4]})
+
+    def test_optimal_uses_fewer_rooms_than_greedy(self):
+        greedy, _, _ = allocate_slots(self.courses, self.classrooms, 0, 'dense', self.roll_table)
+        optimal, seats_left, unallocated = allocate_slots(
+            self.courses, self.classrooms, 0, 'dense', self.roll_table, strategy='optimal')
+        self.assertEqual(greedy['room_id'].nunique(), 2)
+        self.assertEqual(optimal['room_id'].tolist(), ['6101', '6101'])
+        self.assertEqual(seats_left[('4/30/16', 'Morning')], {'6101': 0, '6102': 6, '6103': 4})
+        self.assertEqual(unallocated, [])
+
+    def test_zero_budget_falls_back_to_greedy(self):
+        greedy, _, _ = allocate_slots(self.courses, self.classrooms, 0, 'dense', self.roll_table)
+        fallback, _, _ = allocate_slots(self.courses, self.classrooms, 0, 'dense', self.roll_table,
+                                        strategy='optimal', time_budget=0)
+        self.assertEqual(fallback['room_id'].tolist(), greedy['room_id'].tolist())
+
+    def test_slot_deeper_than_recursion_limit(self):
+        n_courses = sys.getrecursionlimit() + 100
+        courses = pd.DataFrame({
+            'course_id': [f'C{i}' for i in range(n_courses)],
+            'date': ['4/30/16'] * n_courses,
+            'slot': ['Morning'] * n_courses,
+            'roll_numbers': [f'R{i}' for i in range(n_courses)],
+            'enrollment': [1] * n_courses,
+        })
+        courses, roll_table = encode_course_rolls(courses)
+        classrooms = pd.DataFrame({'room_id': ['6101', '6102'], 'capacity': [n_courses, 10]})
+        optimal, _, unallocated = allocate_slots(courses, classrooms, 0, 'dense', roll_table,
+                                                 strategy='optimal', time_budget=1.0)
+        self.assertEqual(len(optimal), n_courses)
+        self.assertEqual(set(optimal['room_id']), {'6101'})
+        self.assertEqual(unallocated, [])
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            get_allocation_strategy('random')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.utils.classroom_allocator import allocate_slots
+from src.utils.partitioned import allocate_partitioned, load_manifest, read_partition, write_partitions
+from src.utils.roll_table import encode_course_rolls, materialize_roll_numbers
+
+class TestPartitioned(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.partition_dir = os.path.join(self.tmp.name, 'partitions')
+        self.output_dir = os.path.join(self.tmp.name, 'output')
+        self.timetable = pd.DataFrame({
+            'course_id': ['CS249', 'CH426', 'MM304', 'CB308'],
+            'date': ['5/1/16', '5/1/16', '4/30/16', '5/1/16'],
+            'day': ['Sunday', 'Sunday', 'Saturday', 'Sunday'],
+            'slot': ['Morning', 'Morning', 'Evening', 'Evening'],
+        })
+        self.rolls = {'CS249': ['R1', 'R2', 'R3', 'R4'], 'CH426': ['R4', 'R5'],
+                      'MM304': ['R1', 'R6'], 'CB308': ['R7', 'R8', 'R9']}
+        self.mapping = os.path.join(self.tmp.name, 'course_roll.csv')
+        pd.DataFrame([(roll, course) for course, rolls in self.rolls.items() for roll in rolls],
+                     columns=['rollno', 'course_code']).to_csv(self.mapping, index=False)
+        self.classrooms = pd.DataFrame({'room_id': ['6101', '6102'], 'capacity': [4, 3]})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_partitions_follow_date_slot_order(self):
+        write_partitions(self.timetable, self.mapping, self.partition_dir, chunksize=3)
+        manifest = load_manifest(self.partition_dir)
+        self.assertEqual([(p['date'], p['slot']) for p in manifest['partitions']],
+                         [('4/30/16', 'Evening'), ('5/1/16', 'Evening'), ('5/1/16', 'Morning')])
+        courses, roll_table = read_partition(self.partition_dir, manifest['partitions'][2])
+        self.assertEqual(courses['course_id'].tolist(), ['CS249', 'CH426'])
+        self.assertEqual(roll_table.decode(courses['student_ids'][0]), ['R1', 'R2', 'R3', 'R4'])
+        self.assertEqual(courses['enrollment'].tolist(), [4, 2])
+
+    def test_matches_in_memory_allocation(self):
+        write_partitions(self.timetable, self.mapping, self.partition_dir, chunksize=3)
+        totals = allocate_partitioned(self.partition_dir, self.classrooms, 0, 'dense',
+                                      self.output_dir, 'workbook')
+        self.assertEqual(totals['conflicts'], 1)
+        self.assertEqual(totals['largest_partition_enrollment'], 6)
+
+        courses = self.timetable.copy()
+        courses['roll_numbers'] = [';'.join(self.rolls[c]) for c in courses['course_id']]
+        courses, roll_table = encode_course_rolls(courses)
+        courses['enrollment'] = courses['student_ids'].map(len)
+        expected, _, _ = allocate_slots(courses, self.classrooms, 0, 'dense', roll_table)
+        expected = materialize_roll_numbers(expected, roll_table)
+
+        result = pd.read_excel(os.path.join(self.output_dir, 'op_overall_seating_arrangement.xlsx'))
+        self.assertEqual(result[['course_id', 'room_id', 'roll_numbers']].astype(str).values.tolist(),
+                         expected[['course_id', 'room_id', 'roll_numbers']].astype(str).values.tolist())
+        conflicts = pd.read_excel(os.path.join(self.output_dir, 'conflicts', 'conflicts_detailed.xlsx'))
+        self.assertEqual(conflicts['roll_number'].tolist(), ['R4'])
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'seating_plans.xlsx')))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+import zipfile
+import pandas as pd
+from openpyxl import load_workbook
+from src.utils.plan_exporter import build_seating_plans, export_plans_workbook, export_plans_zip
+
+class TestPlanExporter(unittest.TestCase):
+
+    def setUp(self):
+        allocation = pd.DataFrame({
+            'date': ['4/30/16', '4/30/16', '5/1/16'],
+            'slot': ['Morning', 'Morning', 'Evening'],
+            'course_id': ['CS249', 'CS249', 'CH426'],
+            'room_id': ['6101', '6102', 'B-001'],
+            'capacity': [30, 72, 70],
+            'enrollment': [30, 10, 5],
+            'roll_numbers': ['R1;R2', 'R3', 'R4'],
+        })
+        self.plans, self.summaries = build_seating_plans(allocation)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_build_seating_plans(self):
+        self.assertEqual(len(self.plans), 3)
+        self.assertEqual(self.plans[0]['folder'], '4_30_16/Morning')
+        self.assertEqual(self.plans[0]['file_name'], '4_30_16_CS249_6101.xlsx')
+        self.assertEqual(self.plans[1]['data']['multi_room'], 'Room 2 of 2')
+        self.assertNotIn('multi_room', self.plans[2]['data'])
+        self.assertEqual(len(self.summaries), 1)
+        self.assertEqual(self.summaries[0]['data']['rooms'], '6101, 6102')
+
+    def test_export_workbook(self):
+        path = os.path.join(self.tmp.name, 'plans.xlsx')
+        export_plans_workbook(self.plans, self.summaries, path)
+        workbook = load_workbook(path)
+        self.assertEqual(workbook.sheetnames, ['4_30_16 Morning', '5_1_16 Evening', 'Multi-room courses'])
+        self.assertEqual(workbook['4_30_16 Morning'].max_row, 3)
+
+    def test_export_zip(self):
+        path = os.path.join(self.tmp.name, 'plans.zip')
+        export_plans_zip(self.plans, self.summaries, path)
+        with zipfile.ZipFile(path) as archive:
+            self.assertIn('5_1_16/Evening/5_1_16_CH426_B-001.xlsx', archive.namelist())
+            self.assertIn('4_30_16/Morning/4_30_16_CS249_summary.xlsx', archive.namelist())
+
+if __name__ == '__main__':
+    unittest.main()
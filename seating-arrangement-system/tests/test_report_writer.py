@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+from src.utils.report_writer import write_html_report
+
+class TestReportWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_file = os.path.join(self.tmp.name, 'summary.html')
+        self.metadata = {'timestamp': '20250101_120000', 'buffer': 5, 'density': 'dense',
+                         'num_courses': 3, 'num_classrooms': 2, 'num_allocations': 7,
+                         'num_conflicts': 7, 'execution_time_seconds': 1.5}
+        self.schedule = [{'date': '5/1/16', 'slot': 'Morning', 'courses': 3, 'rooms': 2, 'students': 9}]
+        self.conflicts = [{'roll_number': f'R{i}', 'date': '5/1/16', 'slot': 'Morning',
+                           'course1': 'CS249', 'course2': '<b>CH426</b>'} for i in range(7)]
+        self.allocations = [{'date': '5/1/16', 'slot': 'Morning', 'course_id': 'CS249',
+                             'room_id': f'61{i:02d}', 'enrollment': i} for i in range(7)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_page(self, name):
+        with open(os.path.join(self.tmp.name, 'summary_data', name)) as f:
+            text = f.read()
+        return json.loads(text[text.index('[['):text.rindex(')')])
+
+    def test_all_rows_are_paged(self):
+        tables = write_html_report(self.output_file, self.metadata, self.schedule,
+                                   self.conflicts, iter(self.allocations), page_size=3)
+        self.assertEqual(tables, {'conflicts': 7, 'allocations': 7})
+        pages = [self.read_page(f'allocations_{page:05d}.js') for page in range(3)]
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(pages[2][0], ['5/1/16', 'Morning', 'CS249', '6106', 6])
+        with open(os.path.join(self.tmp.name, 'summary_data', 'index.json')) as f:
+            self.assertEqual(json.load(f)['rows'], tables)
+
+    def test_html_shows_first_page_escaped(self):
+        write_html_report(self.output_file, self.metadata, self.schedule,
+                          self.conflicts, self.allocations, page_size=3)
+        with open(self.output_file) as f:
+            page = f.read()
+        self.assertIn('<td>R2</td>', page)
+        self.assertNotIn('<td>R3</td>', page)
+        self.assertIn('&lt;b&gt;CH426&lt;/b&gt;', page)
+        self.assertIn('Page 1 of 3', page)
+
+    def test_no_conflicts_section_without_conflicts(self):
+        self.metadata['num_conflicts'] = 0
+        write_html_report(self.output_file, self.metadata, self.schedule, [], self.allocations)
+        with open(self.output_file) as f:
+            page = f.read()
+        self.assertNotIn('Conflicts Detected', page)
+        self.assertIn('Room Allocations', page)
+
+if __name__ == '__main__':
+    unittest.main()
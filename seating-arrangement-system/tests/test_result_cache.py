@@ -0,0 +1,110 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+import pandas as pd
+from src.utils.classroom_allocator import allocate_slots, calculate_seats_left, export_allocation
+from src.utils.result_cache import ResultCache, export_is_current, record_export, result_key
+from src.utils.roll_table import encode_course_rolls
+
+# seating_arrangement imports its helpers as a top-level script (from utils...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import seating_arrangement  # noqa: E402
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        courses = pd.DataFrame({
+            'course_id': ['CS249', 'CH426', 'MM304'],
+            'date': ['5/1/16', '5/1/16', '5/2/16'],
+            'slot': ['Morning', 'Morning', 'Evening'],
+            'roll_numbers': ['R1;R2;R3', 'R4;R5', 'R1;R6'],
+        })
+        self.courses, self.roll_table = encode_course_rolls(courses)
+        self.courses['enrollment'] = self.courses['student_ids'].map(len)
+        self.classrooms = pd.DataFrame({'room_id': [6101, 6102], 'capacity': [3, 2]})
+        self.params = {'buffer': 0, 'density': 'dense', 'strategy': 'greedy'}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_follows_inputs_and_parameters(self):
+        key = result_key(self.courses, self.classrooms, self.roll_table, self.params)
+        self.assertEqual(key, result_key(self.courses.copy(), self.classrooms.astype({'room_id': str}),
+                                         self.roll_table, dict(self.params)))
+        self.assertNotEqual(key, result_key(self.courses, self.classrooms, self.roll_table,
+                                            {**self.params, 'density': 'sparse'}))
+        larger = self.classrooms.assign(capacity=[4, 2])
+        self.assertNotEqual(key, result_key(self.courses, larger, self.roll_table, self.params))
+
+    def test_round_trip_and_lru_eviction(self):
+        cache = ResultCache(os.path.join(self.tmp.name, 'cache'), max_bytes=10 ** 6)
+        allocation, _, _ = allocate_slots(self.courses, self.classrooms, 0, 'dense', self.roll_table)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', {'allocation': allocation, 'conflicts': []})
+        result = cache.get('a')
+        self.assertEqual(result['allocation']['room_id'].tolist(), allocation['room_id'].tolist())
+        self.assertEqual(result['allocation']['student_ids'][0].tolist(), allocation['student_ids'][0].tolist())
+
+        size = os.path.getsize(os.path.join(cache.cache_dir, 'a.pkl'))
+        cache.max_bytes = size * 2
+        cache.put('b', {'allocation': allocation, 'conflicts': []})
+        time.sleep(0.01)
+        cache.get('a')
+        cache.put('c', {'allocation': allocation, 'conflicts': []})
+        # 'b' was used least recently
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+
+    def test_export_stamp(self):
+        output_dir = os.path.join(self.tmp.name, 'output')
+        os.makedirs(output_dir)
+        stamp = os.path.join(output_dir, '.state', 'result_export.json')
+        allocation, seats_left, _ = allocate_slots(self.courses, self.classrooms, 0, 'dense', self.roll_table)
+        paths = export_allocation(allocation, calculate_seats_left(seats_left), self.roll_table,
+                                  'files', 1, output_dir)
+        self.assertIn('5_1_16/Morning/5_1_16_CS249_6101.xlsx', paths)
+        self.assertIn('op_seats_left.xlsx', paths)
+
+        self.assertFalse(export_is_current(stamp, 'key', 'files', output_dir))
+        record_export(stamp, 'key', 'files', output_dir, paths)
+        self.assertTrue(export_is_current(stamp, 'key', 'files', output_dir))
+        self.assertFalse(export_is_current(stamp, 'key', 'zip', output_dir))
+        self.assertFalse(export_is_current(stamp, 'other', 'files', output_dir))
+        os.remove(os.path.join(output_dir, paths[0]))
+        self.assertFalse(export_is_current(stamp, 'key', 'files', output_dir))
+
+    def test_cached_run_rewrites_conflict_reports(self):
+        previous_dir = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, previous_dir)
+        arrangement = seating_arrangement.SeatingArrangement()
+        cache = ResultCache('cache', max_bytes=10 ** 6)
+        conflicts = [{'date': '5/1/16', 'slot': 'Morning', 'roll_number': 'R1',
+                      'course1': 'CS249', 'course2': 'CH426'}]
+        args = (self.courses, self.classrooms, 0, 'dense', self.roll_table, 'files', 1, 'greedy', 1,
+                conflicts, None)
+        stamp = seating_arrangement.RESULT_EXPORT_STAMP
+
+        # On a miss check_conflicts has already written the reports
+        seating_arrangement.save_conflict_data(conflicts)
+        arrangement._allocate_cached(cache, 'key', None, *args)
+        self.assertTrue(export_is_current(stamp, 'key', 'files', 'data/output'))
+
+        # A later run with other inputs replaces them
+        shutil.rmtree('data/output/conflicts')
+        self.assertFalse(export_is_current(stamp, 'key', 'files', 'data/output'))
+
+        arrangement._allocate_cached(cache, 'key', cache.get('key'), *args)
+        self.assertEqual(sorted(os.listdir('data/output/conflicts')),
+                         sorted(seating_arrangement.CONFLICT_FILES))
+        detailed = pd.read_excel('data/output/conflicts/conflicts_detailed.xlsx')
+        self.assertEqual(detailed['roll_number'].tolist(), ['R1'])
+        self.assertTrue(export_is_current(stamp, 'key', 'files', 'data/output'))
+
+if __name__ == '__main__':
+    unittest.main()
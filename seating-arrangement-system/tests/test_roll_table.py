@@ -0,0 +1,30 @@
+import unittest
+import pandas as pd
+from src.utils.roll_table import RollTable, encode_course_rolls, materialize_roll_numbers
+
+class TestRollTable(unittest.TestCase):
+
+    def test_intern_and_round_trip(self):
+        table = RollTable()
+        ids = table.encode([" 1401CB01", "1401CB02", "", "1401CB01"])
+        self.assertEqual(ids.dtype.name, "int32")
+        self.assertEqual(ids.tolist(), [0, 1, 0])
+        self.assertEqual(table.join(ids), "1401CB01;1401CB02;1401CB01")
+        self.assertEqual(table.id_of("1401CB02"), 1)
+        self.assertIsNone(table.id_of("1401CB99"))
+
+    def test_encode_course_rolls(self):
+        courses = pd.DataFrame({
+            'course_id': ['CS249', 'CH426'],
+            'roll_numbers': ['1401CB01;1401CB02', float('nan')],
+        })
+        encoded, table = encode_course_rolls(courses)
+        self.assertNotIn('roll_numbers', encoded.columns)
+        self.assertEqual(encoded['student_ids'][0].tolist(), [0, 1])
+        self.assertEqual(len(encoded['student_ids'][1]), 0)
+
+        restored = materialize_roll_numbers(encoded, table)
+        self.assertEqual(restored['roll_numbers'].tolist(), ['1401CB01;1401CB02', ''])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.utils.roll_table import encode_course_rolls
+from src.utils.run_store import compare_runs, connect, find_student, save_run, seats_left_table
+
+class TestRunStore(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.work_dir.name, 'runs.sqlite')
+        allocation = pd.DataFrame({
+            'date': ['5/3/16', '5/3/16'],
+            'slot': ['Morning', 'Morning'],
+            'course_id': ['CS249', 'CS249'],
+            'room_id': ['6101', 'B-001'],
+            'capacity': [28, 68],
+            'enrollment': [2, 1],
+            'roll_numbers': ['1401CB01;1401CB02', '1401CB03'],
+        })
+        self.allocation, self.roll_table = encode_course_rolls(allocation)
+        self.classrooms = pd.DataFrame({'room_id': ['6101', 'B-001'], 'capacity': [30, 70]})
+        self.conflicts = [{'date': '5/3/16', 'slot': 'Morning', 'roll_number': '1401CB02',
+                           'course1': 'CH426', 'course2': 'CS249'}]
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def _save(self, run_id, allocation):
+        seats_left = seats_left_table(allocation, self.classrooms, 2, 'dense', [('5/3/16', 'Morning')])
+        save_run(self.db_path, run_id, {'buffer': 2, 'density': 'dense'}, allocation,
+                 self.roll_table, self.conflicts, seats_left)
+
+    def test_save_and_find_student(self):
+        self._save('run1', self.allocation)
+        self.assertEqual(find_student(self.db_path, '1401CB03', '5/3/16'), [
+            {'date': '5/3/16', 'slot': 'Morning', 'course_id': 'CS249', 'room_id': 'B-001', 'seat': None}
+        ])
+        self.assertEqual(find_student(self.db_path, '1401CB03', '5/4/16'), [])
+
+        connection = connect(self.db_path)
+        seats_left = dict(connection.execute('SELECT room_id, seats_left FROM seats_left').fetchall())
+        self.assertEqual(seats_left, {'6101': 26, 'B-001': 67})
+        self.assertEqual(connection.execute('SELECT COUNT(*) FROM conflicts').fetchone()[0], 1)
+        connection.close()
+
+    def test_saving_a_run_again_replaces_it(self):
+        self._save('run1', self.allocation)
+        self._save('run1', self.allocation)
+        connection = connect(self.db_path)
+        self.assertEqual(connection.execute('SELECT COUNT(*) FROM seats').fetchone()[0], 3)
+        connection.close()
+
+    def test_compare_runs(self):
+        self._save('run1', self.allocation)
+        moved = self.allocation.copy()
+        moved['room_id'] = ['B-001', '6101']
+        self._save('run2', moved)
+        changes = compare_runs(self.db_path, 'run1', 'run2')
+        self.assertEqual(len(changes), 3)
+        first = changes[changes['roll_number'] == '1401CB01'].iloc[0]
+        self.assertEqual((first['room_a'], first['room_b']), ('6101', 'B-001'))
+
+if __name__ == '__main__':
+    unittest.main()
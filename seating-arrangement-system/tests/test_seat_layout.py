@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.utils.roll_table import encode_course_rolls
+from src.utils.seat_layout import (
+    RoomGeometry,
+    assign_room_seats,
+    build_seat_maps,
+    interleave,
+    parse_sub_blocks,
+)
+
+class TestSeatLayout(unittest.TestCase):
+
+    def _grid(self, geometry, student_groups, density):
+        grid = np.full(geometry.capacity, '.')
+        seats, courses, _ = assign_room_seats(student_groups, geometry, density)
+        grid[seats] = np.array(list('ABCDEF'))[courses]
+        return grid.reshape(geometry.rows, geometry.columns)
+
+    def test_interleave_spreads_groups(self):
+        self.assertEqual(interleave([2, 2]).tolist(), [0, 1, 0, 1])
+        self.assertEqual(sorted(interleave([3, 1, 0]).tolist()), [0, 0, 0, 1])
+
+    def test_two_courses_never_sit_side_by_side(self):
+        geometry = RoomGeometry(30, 6)
+        grid = self._grid(geometry, [np.arange(15), np.arange(15, 30)], 'dense')
+        self.assertTrue((grid[:, 1:] != grid[:, :-1]).all())
+        self.assertTrue((grid[1:] != grid[:-1]).all())
+
+    def test_sparse_uses_checkerboard_and_sub_blocks(self):
+        geometry = RoomGeometry(30, 6, parse_sub_blocks('2;6;5'))
+        grid = self._grid(geometry, [np.arange(6), np.arange(6, 12)], 'sparse')
+        rows, columns = np.nonzero(grid != '.')
+        self.assertTrue(((rows + columns) % 2 == 0).all())
+        # The first sub-block (columns 1-2) only allows 2 seats
+        self.assertEqual((grid[:, :2] != '.').sum(), 2)
+
+    def test_every_student_gets_one_seat(self):
+        geometry = RoomGeometry(72, 6)
+        groups = [np.arange(40), np.arange(40, 60), np.arange(60, 66)]
+        seats, courses, students = assign_room_seats(groups, geometry, 'dense')
+        self.assertEqual(len(set(seats.tolist())), 66)
+        self.assertEqual(sorted(students.tolist()), list(range(66)))
+        for position, group in enumerate(groups):
+            self.assertEqual(students[courses == position].tolist(), group.tolist())
+
+    def test_room_too_small(self):
+        with self.assertRaises(ValueError):
+            assign_room_seats([np.arange(31)], RoomGeometry(30, 6), 'dense')
+
+    def test_build_seat_maps(self):
+        allocation = pd.DataFrame({
+            'date': ['5/1/16', '5/1/16'],
+            'slot': ['Morning', 'Morning'],
+            'course_id': ['CS249', 'CH426'],
+            'room_id': ['101', '101'],
+            'roll_numbers': ['A1;A2;A3', 'B1;B2'],
+        })
+        allocation, roll_table = encode_course_rolls(allocation)
+        classrooms = pd.DataFrame({'room_id': ['101'], 'capacity': [12], 'sub_blocks': ['']})
+        seat_map = build_seat_maps(allocation, classrooms, 'dense', roll_table, columns=4)
+        self.assertEqual(len(seat_map), 5)
+        self.assertEqual(seat_map['seat'].nunique(), 5)
+        positions = list(zip(seat_map['row'], seat_map['column']))
+        self.assertEqual(positions, sorted(positions))
+        self.assertEqual(sorted(seat_map['roll_number']), ['A1', 'A2', 'A3', 'B1', 'B2'])
+        rolls = dict(zip(seat_map['roll_number'], seat_map['course_id']))
+        self.assertEqual(rolls['A1'], 'CS249')
+        self.assertEqual(rolls['B2'], 'CH426')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import unittest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+class TestStartup(unittest.TestCase):
+
+    def _run(self, code):
+        result = subprocess.run([sys.executable, '-c', code], cwd=SRC_DIR,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+
+    def test_parsing_arguments_does_not_import_pandas(self):
+        loaded = self._run(
+            "import sys, main; main.parse_args(['--buffer', '2', '--density', 'dense']); "
+            "print([m for m in ('pandas', 'numpy', 'openpyxl', 'seating_arrangement') if m in sys.modules])"
+        )
+        self.assertEqual(loaded, '[]')
+
+    def test_find_without_a_store_does_not_import_pandas(self):
+        output = self._run(
+            "import sys, main; main.main(['--find', '1401CB01', '--store', 'missing.sqlite']); "
+            "print('pandas' in sys.modules)"
+        )
+        self.assertIn('No run store found', output)
+        self.assertTrue(output.endswith('False'))
+
+    def test_pipeline_module_defers_mode_specific_imports(self):
+        loaded = self._run(
+            "import sys, seating_arrangement; "
+            "print([m for m in ('utils.partitioned', 'utils.sweep', 'utils.run_store', "
+            "'utils.student_lookup', 'utils.utilization', "
+            "'utils.conflict_resolver') if m in sys.modules])"
+        )
+        self.assertEqual(loaded, '[]')
+
+if __name__ == '__main__':
+    unittest.main()
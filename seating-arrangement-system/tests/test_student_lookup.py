@@ -0,0 +1,61 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.utils.roll_table import encode_course_rolls
+from src.utils.student_lookup import StudentSeatIndex, create_app, names_from_mapping
+
+class TestStudentLookup(unittest.TestCase):
+
+    def setUp(self):
+        allocation = pd.DataFrame({
+            'date': ['5/3/16', '5/3/16', '5/4/16'],
+            'slot': ['Morning', 'Morning', 'Evening'],
+            'course_id': ['CS249', 'CS249', 'MM304'],
+            'room_id': ['6101', 'B-001', '6102'],
+            'roll_numbers': ['1401CB01;1401CB02', '1401CB03', '1401CB01'],
+        })
+        self.allocation, self.roll_table = encode_course_rolls(allocation)
+        names = pd.DataFrame({'Roll Number': ['1401CB01'], 'Name': ['Asha Rao']})
+        self.index = StudentSeatIndex.from_allocations(
+            self.allocation, self.roll_table, names=names_from_mapping(names)
+        )
+
+    def test_lookup(self):
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.lookup(' 1401CB01'), [
+            {'date': '5/3/16', 'slot': 'Morning', 'course_id': 'CS249', 'room_id': '6101', 'seat': None},
+            {'date': '5/4/16', 'slot': 'Evening', 'course_id': 'MM304', 'room_id': '6102', 'seat': None},
+        ])
+        self.assertEqual(self.index.lookup('1401CB99'), [])
+        self.assertEqual(self.index.name_of('1401CB01'), 'Asha Rao')
+        self.assertEqual(self.index.name_of('1401CB03'), 'Unknown Name')
+
+    def test_seat_labels_from_seat_map(self):
+        seat_map = pd.DataFrame({
+            'date': ['5/3/16'], 'slot': ['Morning'], 'room_id': ['B-001'], 'seat': ['R2-C3'],
+            'course_id': ['CS249'], 'roll_number': ['1401CB03'],
+        })
+        index = StudentSeatIndex.from_allocations(self.allocation, self.roll_table, seat_map)
+        self.assertEqual(index.lookup('1401CB03')[0]['seat'], 'R2-C3')
+
+    def test_export_admit_cards(self):
+        cards = self.index.admit_cards()
+        self.assertEqual(cards['roll_number'].tolist(), ['1401CB01', '1401CB01', '1401CB02', '1401CB03'])
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_file = os.path.join(output_dir, 'admit_cards.xlsx')
+            self.index.export_admit_cards(output_file)
+            self.assertEqual(len(pd.read_excel(output_file)), 4)
+
+    @unittest.skipUnless(importlib.util.find_spec('flask'), 'Flask is not installed')
+    def test_http_endpoint(self):
+        client = create_app(self.index).test_client()
+        response = client.get('/students/1401CB01')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['name'], 'Asha Rao')
+        self.assertEqual(len(response.get_json()['exams']), 2)
+        self.assertEqual(client.get('/students/1401CB99').status_code, 404)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import pandas as pd
+from src.utils.roll_table import encode_course_rolls
+from src.utils.sweep import SWEEP_COLUMNS, run_sweep
+
+class TestSweep(unittest.TestCase):
+
+    def setUp(self):
+        courses = pd.DataFrame({
+            'course_id': ['CS249', 'CH426'],
+            'enrollment': [40, 20],
+            'date': ['5/1/16', '5/1/16'],
+            'slot': ['Morning', 'Morning'],
+            'roll_numbers': [
+                ';'.join(f'A{number}' for number in range(40)),
+                ';'.join(f'B{number}' for number in range(20)),
+            ],
+        })
+        self.courses, self.roll_table = encode_course_rolls(courses)
+        self.classrooms = pd.DataFrame({'room_id': ['101', '102'], 'capacity': [50, 30]})
+
+    def test_scenario_grid(self):
+        results = run_sweep(self.courses, self.classrooms, self.roll_table, [0, 10], ['sparse', 'dense'])
+        self.assertEqual(list(results.columns), SWEEP_COLUMNS)
+        self.assertEqual(list(zip(results['buffer'], results['density'])),
+                         [(0, 'sparse'), (0, 'dense'), (10, 'sparse'), (10, 'dense')])
+
+        dense = results[(results['buffer'] == 0) & (results['density'] == 'dense')].iloc[0]
+        self.assertEqual(dense['unallocated_courses'], 0)
+        self.assertEqual(dense['room_slots_used'], 2)
+        self.assertEqual(dense['seats_left'], 20)
+
+        # Sparse with a 10 seat buffer leaves 20 + 10 seats, too few for CS249
+        sparse = results[(results['buffer'] == 10) & (results['density'] == 'sparse')].iloc[0]
+        self.assertEqual(sparse['unallocated_courses'], 1)
+        self.assertEqual(sparse['unseated_students'], 40)
+
+    def test_parallel_matches_serial(self):
+        serial = run_sweep(self.courses, self.classrooms, self.roll_table, [0, 5, 10], ['sparse', 'dense'])
+        parallel = run_sweep(self.courses, self.classrooms, self.roll_table, [0, 5, 10], ['sparse', 'dense'],
+                             workers=3)
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_invalid_density(self):
+        with self.assertRaises(ValueError):
+            run_sweep(self.courses, self.classrooms, self.roll_table, [0], ['packed'])
+
+if __name__ == '__main__':
+    unittest.main()
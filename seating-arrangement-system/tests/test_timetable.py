@@ -0,0 +1,38 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.utils.timetable import SCHEDULE_COLUMNS, exam_schedule
+
+class TestTimetable(unittest.TestCase):
+
+    def test_slots_and_course_order(self):
+        timetable = pd.DataFrame({
+            'Date': ['4/30/16', '5/1/16'],
+            'Day': ['Saturday', 'Sunday'],
+            'Morning': ['CS249; CH426,  MM304', 'NO EXAM'],
+            'Evening': [np.nan, 'CB308;'],
+            'Unnamed: 4': [np.nan, np.nan],
+        })
+        schedule = exam_schedule(timetable)
+        self.assertEqual(list(schedule.columns), SCHEDULE_COLUMNS)
+        self.assertEqual(schedule.values.tolist(), [
+            ['4/30/16', 'Saturday', 'Morning', 'CS249'],
+            ['4/30/16', 'Saturday', 'Morning', 'CH426'],
+            ['4/30/16', 'Saturday', 'Morning', 'MM304'],
+            ['5/1/16', 'Sunday', 'Evening', 'CB308'],
+        ])
+
+    def test_any_number_of_slots(self):
+        timetable = pd.DataFrame({
+            'Date ': ['5/2/17', np.nan],
+            'Day': ['Tuesday', 'Wednesday'],
+            'Morning': ['MA101', 'MA102'],
+            'Afternoon': ['PH101', 'PH102'],
+            'Evening': ['EE101', 'EE102'],
+        })
+        schedule = exam_schedule(timetable)
+        self.assertEqual(schedule['slot'].tolist(), ['Morning', 'Afternoon', 'Evening'])
+        self.assertEqual(schedule['course_id'].tolist(), ['MA101', 'PH101', 'EE101'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.utils.utilization import analyze_utilization, save_utilization_report
+
+class TestUtilization(unittest.TestCase):
+
+    def setUp(self):
+        self.courses = pd.DataFrame({
+            'course_id': ['CS249', 'CH426', 'MM304', 'CB308'],
+            'date': ['5/1/16', '5/1/16', '5/1/16', '5/2/16'],
+            'slot': ['Morning', 'Morning', 'Morning', 'Morning'],
+            'enrollment': [30, 8, 25, 5],
+        })
+        self.allocations = pd.DataFrame({
+            'date': ['5/1/16', '5/1/16', '5/1/16', '5/2/16'],
+            'slot': ['Morning', 'Morning', 'Morning', 'Morning'],
+            'course_id': ['CS249', 'CS249', 'CH426', 'CB308'],
+            'room_id': ['6101', '6102', '6102', '6101'],
+            'enrollment': [20, 10, 8, 5],
+        })
+        self.capacity = {'6101': 20, '6102': 20, '7101': 6}
+        self.analysis = analyze_utilization(self.allocations, self.courses, self.capacity, {'7101': 'B2'})
+
+    def test_slot_table(self):
+        slots = self.analysis['slots']
+        first = slots.iloc[0]
+        self.assertEqual((first['rooms_used'], first['partial_rooms']), (2, 1))
+        self.assertEqual((first['seats'], first['seats_used']), (46, 38))
+        self.assertEqual(first['pending_students'], 25)
+        self.assertEqual(first['demand'], 63)
+        # 2 seats in 6102 and 6 in 7101 cannot hold the pending 25-student course
+        self.assertEqual(first['stranded_seats'], 8)
+        second = slots.iloc[1]
+        # Nothing pending: only rooms smaller than the slot's smallest course (5) strand seats
+        self.assertEqual(second['stranded_seats'], 0)
+        self.assertEqual(second['partial_rooms'], 1)
+
+    def test_rooms_buildings_and_dates(self):
+        rooms = self.analysis['rooms'].set_index('room_id')
+        self.assertEqual(rooms.loc['6101', 'seats_used'], 25)
+        self.assertEqual(rooms.loc['6101', 'utilization'], 0.625)
+        self.assertEqual(rooms.loc['7101', 'building'], 'B2')
+        buildings = self.analysis['buildings'].set_index('building')
+        self.assertEqual(buildings.loc['6', 'rooms'], 2)
+        dates = self.analysis['dates'].set_index('date')
+        self.assertEqual(dates.loc['5/1/16', 'shortfall'], 17)
+        self.assertEqual(dates.loc['5/2/16', 'shortfall'], 0)
+
+    def test_report_files(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            save_utilization_report(self.analysis, output_dir)
+            table = pd.read_excel(os.path.join(output_dir, 'utilization.xlsx'))
+            self.assertEqual(len(table), 2)
+            with open(os.path.join(output_dir, 'utilization.json')) as f:
+                summary = json.load(f)
+        self.assertEqual(summary['pending_students'], 25)
+        self.assertEqual(summary['dates_short_of_seats'], 1)
+        self.assertEqual(len(summary['rooms']), 3)
+
+if __name__ == '__main__':
+    unittest.main()